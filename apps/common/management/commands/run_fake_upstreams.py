@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.services.fake_upstream import FakeUpstreamConfig, make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve fake OpenBanking, Clova OCR and Kakao APIs for offline load tests. "
+        "Point OPENBANKING_BASE_URL, CLOVA_OCR_API_URL (…/ocr) and "
+        "KAKAO_AUTH_BASE_URL/KAKAO_API_BASE_URL at it and set OPENBANKING_SANDBOX=0."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8900)
+        parser.add_argument("--latency-ms", type=float, default=50.0)
+        parser.add_argument(
+            "--jitter-ms", type=float, default=20.0, help="Extra random delay, 0..N ms."
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share of 503 answers (0..1)."
+        )
+        parser.add_argument(
+            "--throttle-rate",
+            type=float,
+            default=0.0,
+            help="Share of 429 answers (0..1).",
+        )
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=300,
+            help="Transactions per account listing, across all pages.",
+        )
+        parser.add_argument(
+            "--ocr-fields", type=int, default=40, help="Words per OCR response."
+        )
+        parser.add_argument("--token-ttl", type=int, default=3600)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        config = FakeUpstreamConfig(
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            throttle_rate=options["throttle_rate"],
+            transactions_total=options["transactions"],
+            ocr_fields=options["ocr_fields"],
+            token_ttl=options["token_ttl"],
+            seed=options["seed"],
+        )
+        server = make_server(options["host"], options["port"], config)
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(f"Fake upstreams on http://{host}:{port}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            for route, count in sorted(server.counts.items()):
+                self.stdout.write(f"{route}: {count}")
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0005_payment_membership_transaction_membership'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrRawPayload',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='ocrvalidationlog',
+            name='raw_payload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='validation_logs', to='common.ocrrawpayload'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_raw_payload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transactions', to='common.ocrrawpayload'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_review_queue(apps, schema_editor):
+    OcrApproval = apps.get_model('common', 'OcrApproval')
+    Transaction = apps.get_model('common', 'Transaction')
+
+    OcrApproval.objects.filter(group__isnull=True).update(
+        group_id=models.Subquery(
+            Transaction.objects.filter(pk=models.OuterRef('transaction_id')).values('group_id')[:1]
+        )
+    )
+
+    # OCR'd transactions without an approval row used to count as pending
+    missing = Transaction.objects.filter(
+        ocr_text__isnull=False, ocr_approval__isnull=True
+    ).values_list('id', 'group_id')
+    created = OcrApproval.objects.bulk_create(
+        [
+            OcrApproval(transaction_id=tx_id, group_id=group_id, status='pending')
+            for tx_id, group_id in missing.iterator()
+        ],
+        batch_size=500,
+    )
+    if created:
+        OcrApproval.objects.filter(
+            transaction_id__in=[a.transaction_id for a in created]
+        ).update(
+            updated_at=models.Subquery(
+                Transaction.objects.filter(pk=models.OuterRef('transaction_id')).values('updated_at')[:1]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_invite_code'),
+        ('common', '0006_ocr_raw_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrapproval',
+            name='confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ocrapproval',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ocr_approvals', to='groups.group'),
+        ),
+        migrations.AddIndex(
+            model_name='ocrapproval',
+            index=models.Index(fields=['group', 'status', 'updated_at', 'id'], name='idx_ocr_appr_queue'),
+        ),
+        migrations.AddIndex(
+            model_name='ocrapproval',
+            index=models.Index(fields=['group', 'status', 'confidence', 'id'], name='idx_ocr_appr_queue_conf'),
+        ),
+        migrations.RunPython(backfill_review_queue, migrations.RunPython.noop),
+    ]
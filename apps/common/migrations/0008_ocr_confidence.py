@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0007_ocr_review_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrapproval',
+            name='field_confidences',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
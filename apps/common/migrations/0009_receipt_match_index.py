@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0008_ocr_confidence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['group', 'amount', 'date'], name='idx_tx_group_amount_date'),
+        ),
+    ]
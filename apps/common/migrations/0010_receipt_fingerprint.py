@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_invite_code'),
+        ('common', '0009_receipt_match_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dhash', models.CharField(max_length=16)),
+                ('chunk0', models.PositiveIntegerField()),
+                ('chunk1', models.PositiveIntegerField()),
+                ('chunk2', models.PositiveIntegerField()),
+                ('chunk3', models.PositiveIntegerField()),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='receipt_fingerprints', to='groups.group')),
+                ('transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_fingerprint', to='common.transaction')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'chunk0'], name='idx_receipt_fp_c0'), models.Index(fields=['group', 'chunk1'], name='idx_receipt_fp_c1'), models.Index(fields=['group', 'chunk2'], name='idx_receipt_fp_c2'), models.Index(fields=['group', 'chunk3'], name='idx_receipt_fp_c3')],
+            },
+        ),
+    ]
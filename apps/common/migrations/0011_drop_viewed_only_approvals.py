@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def drop_viewed_only_approvals(apps, schema_editor):
+    # GET ocr/approvals/<pk> used to create a pending approval for any
+    # transaction it was called on; only OCR'd transactions belong in the queue
+    OcrApproval = apps.get_model('common', 'OcrApproval')
+    OcrApproval.objects.filter(
+        status='pending',
+        reviewer__isnull=True,
+        decided_at__isnull=True,
+        transaction__ocr_text__isnull=True,
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_receipt_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_viewed_only_approvals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_drop_viewed_only_approvals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_error',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='ocr_status',
+            field=models.CharField(blank=True, choices=[('', 'none'), ('pending', 'pending'), ('done', 'done'), ('failed', 'failed')], default='', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['ocr_status', 'ocr_requested_at'], name='idx_tx_ocr_status'),
+        ),
+    ]
@@ -15,6 +15,8 @@ Payment = _package.Payment
 Transaction = _package.Transaction
 OcrValidationLog = _package.OcrValidationLog
 OcrApproval = _package.OcrApproval
+OcrRawPayload = _package.OcrRawPayload
+ReceiptFingerprint = _package.ReceiptFingerprint
 
 __all__ = [
     "TimeStampedModel",
@@ -22,4 +24,6 @@ __all__ = [
     "Transaction",
     "OcrValidationLog",
     "OcrApproval",
+    "OcrRawPayload",
+    "ReceiptFingerprint",
 ]
@@ -2,7 +2,9 @@
 from .base import TimeStampedModel
 from .dues import Payment  # noqa: E402
 from .ledger import OcrApproval  # noqa: E402
+from .ledger import OcrRawPayload  # noqa: E402
 from .ledger import OcrValidationLog  # noqa: E402
+from .ledger import ReceiptFingerprint  # noqa: E402
 from .ledger import Transaction  # noqa: E402
 
 __all__ = [
@@ -11,4 +13,6 @@ __all__ = [
     "Transaction",
     "OcrValidationLog",
     "OcrApproval",
+    "OcrRawPayload",
+    "ReceiptFingerprint",
 ]
@@ -1,4 +1,7 @@
 # moved from apps/common/models.py
+import json
+import zlib
+
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
@@ -8,6 +11,20 @@ from apps.groups.models import Group, GroupMembership
 from . import TimeStampedModel
 
 
+class OcrRawPayload(TimeStampedModel):
+    """Content-addressed, zlib-compressed raw OCR response."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"OcrRawPayload({self.digest[:12]}, {self.size}B)"
+
+    def load(self):
+        return json.loads(zlib.decompress(bytes(self.data)).decode("utf-8"))
+
+
 class Transaction(TimeStampedModel):
     """Household ledger transaction."""
 
@@ -15,6 +32,12 @@ class Transaction(TimeStampedModel):
         INCOME = "income", "income"
         EXPENSE = "expense", "expense"
 
+    class OcrStatus(models.TextChoices):
+        NONE = "", "none"
+        PENDING = "pending", "pending"
+        DONE = "done", "done"
+        FAILED = "failed", "failed"
+
     group = models.ForeignKey(
         Group,
         on_delete=models.CASCADE,
@@ -46,6 +69,23 @@ class Transaction(TimeStampedModel):
     category = models.CharField(max_length=50, blank=True, null=True)
     receipt_image = models.ImageField(upload_to="receipts/", blank=True, null=True)
     ocr_text = models.TextField(blank=True, null=True)
+    ocr_raw_payload = models.ForeignKey(
+        OcrRawPayload,
+        on_delete=models.PROTECT,
+        related_name="transactions",
+        null=True,
+        blank=True,
+    )
+    ocr_confidence = models.FloatField(blank=True, null=True)
+    # state of the background OCR job for the current receipt (see
+    # apps/ocr/services/pipeline.py); pending/failed jobs are re-run by the
+    # run_pending_receipt_ocr command
+    ocr_status = models.CharField(
+        max_length=10, choices=OcrStatus.choices, blank=True, default=OcrStatus.NONE
+    )
+    ocr_attempts = models.PositiveSmallIntegerField(default=0)
+    ocr_requested_at = models.DateTimeField(blank=True, null=True)
+    ocr_error = models.CharField(max_length=255, blank=True, default="")
 
     def __str__(self) -> str:
         return f"[{self.type}] {self.date} {self.amount} {self.description}"
@@ -56,11 +96,55 @@ class Transaction(TimeStampedModel):
             models.Index(
                 fields=["group", "type", "date"], name="idx_tx_group_type_date"
             ),
+            # receipt matching: exact amount, date window
+            models.Index(
+                fields=["group", "amount", "date"], name="idx_tx_group_amount_date"
+            ),
+            models.Index(
+                fields=["ocr_status", "ocr_requested_at"], name="idx_tx_ocr_status"
+            ),
         ]
         ordering = ["-date", "-id"]
 
     # TODO: sprint7에서 다중 예산 배분(M2M) 확장 검토
-    # TODO: sprint6에서 OCR 신뢰도 스코어 필드 추가 고려
+
+
+class ReceiptFingerprint(TimeStampedModel):
+    """
+    64-bit dHash of a transaction's receipt image.
+
+    The hash is also stored as four 16-bit chunks, each indexed per group:
+    two hashes within Hamming distance d share at least one chunk within
+    distance d // 4, so near-duplicate lookups are a handful of index probes
+    (multi-index hashing) instead of a scan.
+    """
+
+    transaction = models.OneToOneField(
+        Transaction, on_delete=models.CASCADE, related_name="receipt_fingerprint"
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name="receipt_fingerprints",
+        null=True,
+        blank=True,
+    )
+    dhash = models.CharField(max_length=16)
+    chunk0 = models.PositiveIntegerField()
+    chunk1 = models.PositiveIntegerField()
+    chunk2 = models.PositiveIntegerField()
+    chunk3 = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["group", "chunk0"], name="idx_receipt_fp_c0"),
+            models.Index(fields=["group", "chunk1"], name="idx_receipt_fp_c1"),
+            models.Index(fields=["group", "chunk2"], name="idx_receipt_fp_c2"),
+            models.Index(fields=["group", "chunk3"], name="idx_receipt_fp_c3"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ReceiptFingerprint(tx={self.transaction_id}, {self.dhash})"
 
 
 # migration 필요
@@ -74,6 +158,13 @@ class OcrValidationLog(TimeStampedModel):
         related_name="ocr_validation_logs",
     )
     extracted_json = models.JSONField()
+    raw_payload = models.ForeignKey(
+        OcrRawPayload,
+        on_delete=models.PROTECT,
+        related_name="validation_logs",
+        null=True,
+        blank=True,
+    )
     is_valid = models.BooleanField(default=False)
     notes = models.TextField(blank=True)
 
@@ -91,6 +182,14 @@ class OcrApproval(TimeStampedModel):
     transaction = models.OneToOneField(
         Transaction, on_delete=models.CASCADE, related_name="ocr_approval"
     )
+    # denormalized from transaction.group so the review queue is one index scan
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name="ocr_approvals",
+        null=True,
+        blank=True,
+    )
     reviewer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -103,9 +202,21 @@ class OcrApproval(TimeStampedModel):
     )
     decided_at = models.DateTimeField(blank=True, null=True)
     notes = models.TextField(blank=True)
+    confidence = models.FloatField(blank=True, null=True)
+    field_confidences = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(
+                fields=["group", "status", "updated_at", "id"],
+                name="idx_ocr_appr_queue",
+            ),
+            models.Index(
+                fields=["group", "status", "confidence", "id"],
+                name="idx_ocr_appr_queue_conf",
+            ),
+        ]
 
     def mark(self, *, reviewer, status: str, notes: str = ""):
         self.reviewer = reviewer
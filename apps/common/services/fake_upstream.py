@@ -0,0 +1,266 @@
+"""
+Local stand-in for the OpenBanking, Clova OCR and Kakao APIs.
+
+Meant for load tests and benchmarks of the real outbound code paths: point
+OPENBANKING_BASE_URL, CLOVA_OCR_API_URL and KAKAO_*_BASE_URL at it and turn
+OPENBANKING_SANDBOX off. Latency, error and 429 rates and payload sizes are
+configurable per server. Routes:
+
+    POST /oauth/2.0/token                  OpenBanking token
+    GET  /v2.0/account/balance             OpenBanking balance
+    GET  /v2.0/account/transaction_list    OpenBanking transactions (paged)
+    POST /ocr                              Clova OCR (general V2 shape)
+    POST /oauth/token                      Kakao token exchange
+    GET  /v2/user/me                       Kakao profile
+"""
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+MERCHANTS = ("GS25", "CU", "스타벅스", "이마트", "배달의민족", "카카오택시", "올리브영")
+
+
+@dataclass
+class FakeUpstreamConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    transactions_total: int = 300
+    ocr_fields: int = 40
+    token_ttl: int = 3600
+    seed: Optional[int] = None
+
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: FakeUpstreamConfig):
+        super().__init__(address, FakeUpstreamHandler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.random_lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.counts_lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self.random_lock:
+            return self.random.random()
+
+    def count(self, route: str) -> None:
+        with self.counts_lock:
+            self.counts[route] = self.counts.get(route, 0) + 1
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    server: FakeUpstreamServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler API
+        logger.debug("fake upstream: " + format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        body = self._read_body()
+        route = ROUTES.get((method, parts.path))
+        if route is None:
+            self._send(404, {"error": "not found", "path": parts.path})
+            return
+        self.server.count(parts.path)
+
+        config = self.server.config
+        delay = config.latency_ms + config.jitter_ms * self.server.roll()
+        time.sleep(max(delay, 0.0) / 1000)
+        if self.server.roll() < config.throttle_rate:
+            self._send(429, {"error": "rate limited"}, {"Retry-After": "1"})
+            return
+        if self.server.roll() < config.error_rate:
+            self._send(503, {"error": "upstream unavailable"})
+            return
+        status, payload = route(self, query, body)
+        self._send(status, payload)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(
+        self,
+        status: int,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # OpenBanking
+
+    def openbanking_token(self, query, body):
+        return 200, {
+            "access_token": f"fake-{uuid.uuid4().hex}",
+            "token_type": "Bearer",
+            "expires_in": self.server.config.token_ttl,
+            "scope": "oob",
+        }
+
+    def openbanking_balance(self, query, body):
+        fintech = query.get("fintech_use_num", "")
+        balance = 100_000 + (sum(map(ord, fintech)) * 7919) % 9_000_000
+        return 200, {
+            "rsp_code": "A0000",
+            "fintech_use_num": fintech,
+            "balance_amt": str(balance),
+            "available_amt": str(balance),
+            "currency_code": "KRW",
+        }
+
+    def openbanking_transactions(self, query, body):
+        config = self.server.config
+        page = max(int(query.get("page") or 1), 1)
+        size = max(int(query.get("size") or 100), 1)
+        to_day = _parse_day(query.get("to_date")) or date.today()
+        from_day = _parse_day(query.get("from_date"))
+        # five rows a day counting back from to_date, never before from_date
+        total = config.transactions_total
+        if from_day is not None:
+            total = min(total, max((to_day - from_day).days + 1, 0) * 5)
+        start = (page - 1) * size
+        stop = min(start + size, total)
+        fintech = query.get("fintech_use_num", "")
+        items = []
+        for index in range(start, stop):
+            when = datetime.combine(
+                to_day - timedelta(days=index // 5), datetime.min.time()
+            ) + timedelta(minutes=(index * 37) % 1440)
+            amount = 1_000 + (index * 7919) % 90_000
+            items.append(
+                {
+                    "bank_tran_id": f"F{fintech[-4:]}{index:08d}",
+                    "tran_date": when.strftime("%Y%m%d"),
+                    "tran_time": when.strftime("%H%M%S"),
+                    "inout_type": "입금" if index % 7 == 0 else "출금",
+                    "print_content": MERCHANTS[index % len(MERCHANTS)],
+                    "tran_amt": str(amount),
+                    "after_balance_amt": str(1_000_000 - index * 100),
+                }
+            )
+        return 200, {
+            "rsp_code": "A0000",
+            "res_cnt": str(len(items)),
+            "res_list": items,
+            "page_record_cnt": str(len(items)),
+            "next_page_yn": "Y" if stop < total else "N",
+        }
+
+    # Clova OCR
+
+    def clova_ocr(self, query, body):
+        config = self.server.config
+        fields = []
+        for index in range(config.ocr_fields):
+            text = (
+                MERCHANTS[index % len(MERCHANTS)]
+                if index % 4 == 0
+                else f"{1_000 + index * 250:,}"
+            )
+            fields.append(
+                {
+                    "inferText": text,
+                    "inferConfidence": 0.9 + (index % 10) / 100,
+                    "lineBreak": index % 4 == 3,
+                }
+            )
+        return 200, {
+            "version": "V2",
+            "requestId": str(uuid.uuid4()),
+            "timestamp": int(time.time() * 1000),
+            "images": [
+                {
+                    "uid": uuid.uuid4().hex,
+                    "name": "receipt",
+                    "inferResult": "SUCCESS",
+                    "message": "SUCCESS",
+                    "fields": fields,
+                }
+            ],
+        }
+
+    # Kakao
+
+    def kakao_token(self, query, body):
+        return 200, {
+            "access_token": f"fake-kakao-{uuid.uuid4().hex}",
+            "token_type": "bearer",
+            "refresh_token": f"fake-refresh-{uuid.uuid4().hex}",
+            "expires_in": 21599,
+            "scope": "profile_nickname account_email",
+            "refresh_token_expires_in": 5183999,
+        }
+
+    def kakao_user_me(self, query, body):
+        token = (self.headers.get("Authorization") or "").split()[-1:]
+        user_id = sum(map(ord, token[0] if token else "")) % 1_000_000 + 1
+        return 200, {
+            "id": user_id,
+            "connected_at": "2024-01-01T00:00:00Z",
+            "properties": {"nickname": f"fake{user_id}"},
+            "kakao_account": {
+                "profile": {"nickname": f"fake{user_id}"},
+                "email": f"fake{user_id}@example.com",
+                "is_email_valid": True,
+                "is_email_verified": True,
+            },
+        }
+
+
+ROUTES = {
+    ("POST", "/oauth/2.0/token"): FakeUpstreamHandler.openbanking_token,
+    ("GET", "/v2.0/account/balance"): FakeUpstreamHandler.openbanking_balance,
+    (
+        "GET",
+        "/v2.0/account/transaction_list",
+    ): FakeUpstreamHandler.openbanking_transactions,
+    ("POST", "/ocr"): FakeUpstreamHandler.clova_ocr,
+    ("POST", "/oauth/token"): FakeUpstreamHandler.kakao_token,
+    ("GET", "/v2/user/me"): FakeUpstreamHandler.kakao_user_me,
+}
+
+
+def _parse_day(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.replace("-", ""), "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8900,
+    config: Optional[FakeUpstreamConfig] = None,
+) -> FakeUpstreamServer:
+    return FakeUpstreamServer((host, port), config or FakeUpstreamConfig())
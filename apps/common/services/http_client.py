@@ -0,0 +1,197 @@
+"""
+Shared outbound HTTP client.
+
+Each integration ("openbanking", "clova", "kakao") gets one long-lived
+requests.Session with its own keep-alive pool and retry policy, so repeated
+calls skip the TCP/TLS handshake. Latency and error counts are kept per host.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Per-service defaults. Read/status retries only apply to ``retry_methods``;
+# connection failures are retried for every method since nothing was sent.
+SERVICE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "openbanking": {
+        "user_agent": "DOODOOK-OpenBanking-Demo/1.0",
+        "retry_methods": ("GET", "POST"),
+    },
+    # OCR and the OAuth code exchange are not safe to replay
+    "clova": {"retry_methods": ("GET",)},
+    "kakao": {"retry_methods": ("GET",)},
+}
+
+_sessions: Dict[str, Session] = {}
+_sessions_lock = threading.Lock()
+_metrics: Dict[str, Dict[str, Any]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _setting(service: str, name: str, default):
+    """HTTP_<SERVICE>_<NAME> overrides HTTP_CLIENT_<NAME>."""
+    specific = getattr(settings, f"HTTP_{service.upper()}_{name}", None)
+    if specific is not None:
+        return specific
+    return getattr(settings, f"HTTP_CLIENT_{name}", default)
+
+
+def _build_session(service: str) -> Session:
+    defaults = SERVICE_DEFAULTS.get(service, {})
+    retries = int(_setting(service, "RETRIES", 2))
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=float(_setting(service, "BACKOFF", 0.3)),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=defaults.get("retry_methods", ("GET",)),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(_setting(service, "POOL_CONNECTIONS", 4)),
+        pool_maxsize=int(_setting(service, "POOL_MAXSIZE", 10)),
+        max_retries=retry,
+    )
+    session = Session()
+    if defaults.get("user_agent"):
+        session.headers.update({"User-Agent": defaults["user_agent"]})
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(service: str) -> Session:
+    with _sessions_lock:
+        session = _sessions.get(service)
+        if session is None:
+            session = _sessions[service] = _build_session(service)
+        return session
+
+
+def default_timeout(service: str) -> Timeout:
+    return (
+        float(_setting(service, "CONNECT_TIMEOUT", 2)),
+        float(_setting(service, "READ_TIMEOUT", 10)),
+    )
+
+
+def request(
+    service: str,
+    method: str,
+    url: str,
+    *,
+    timeout: Optional[Timeout] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request through the service's pooled session.
+
+    requests exceptions propagate unchanged so callers keep mapping them to
+    their own error types.
+    """
+    session = get_session(service)
+    host = urlsplit(url).netloc
+    started = time.monotonic()
+    try:
+        response = session.request(
+            method, url, timeout=timeout or default_timeout(service), **kwargs
+        )
+    except requests.RequestException as exc:
+        _record(service, host, time.monotonic() - started, None, exc)
+        raise
+    _record(service, host, time.monotonic() - started, response.status_code, None)
+    return response
+
+
+def post(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "POST", url, **kwargs)
+
+
+def get(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "GET", url, **kwargs)
+
+
+def _record(
+    service: str,
+    host: str,
+    elapsed: float,
+    status_code: Optional[int],
+    error: Optional[Exception],
+) -> None:
+    elapsed_ms = elapsed * 1000
+    with _metrics_lock:
+        entry = _metrics.setdefault(
+            host,
+            {
+                "service": service,
+                "requests": 0,
+                "errors": 0,
+                "timeouts": 0,
+                "status_5xx": 0,
+                "status_4xx": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_status": None,
+                "last_error": None,
+            },
+        )
+        entry["requests"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        if error is not None:
+            entry["errors"] += 1
+            if isinstance(error, requests.Timeout):
+                entry["timeouts"] += 1
+            entry["last_error"] = type(error).__name__
+        else:
+            entry["last_status"] = status_code
+            if status_code >= 500:
+                entry["status_5xx"] += 1
+            elif status_code >= 400:
+                entry["status_4xx"] += 1
+    if error is not None:
+        logger.debug("%s %s failed after %.0fms: %s", service, host, elapsed_ms, error)
+
+
+def metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    with _metrics_lock:
+        snapshot = {host: dict(entry) for host, entry in _metrics.items()}
+    for entry in snapshot.values():
+        count = entry["requests"] or 1
+        entry["avg_ms"] = round(entry["total_ms"] / count, 1)
+        entry["total_ms"] = round(entry["total_ms"], 1)
+        entry["max_ms"] = round(entry["max_ms"], 1)
+    return snapshot
+
+
+def reset_sessions() -> None:
+    """Close every pooled session; the next call builds fresh ones."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:  # pragma: no cover - best effort on shutdown/fork
+            logger.debug("Failed to close HTTP session", exc_info=True)
+
+
+def reset_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
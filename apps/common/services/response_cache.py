@@ -0,0 +1,152 @@
+"""
+Versioned response cache for read-mostly group endpoints.
+
+Every scope ("group:<id>" or "user:<id>") has a data version that writes to
+ledger, budget and payment rows bump (see apps/common/signals.py). Cached
+responses remember the version they were built from and are fetched
+together with the current version in one get_many, so a repeat view costs
+one cache round trip and any write invalidates it at once.
+
+Version bumps only reach other workers through a shared cache, so on a
+process-local backend (LocMem, the default) nothing is cached at all.
+
+Stampedes are avoided two ways: shortly before expiry a request may
+recompute early (probabilistic "XFetch"), and after a version bump only the
+request holding the rebuild lock computes while the others briefly wait for
+its result.
+"""
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common.services.shared_cache import is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "respcache"
+LOCK_TIMEOUT = 10
+WAIT_POLL = 0.05
+
+
+def _ttl() -> int:
+    return max(int(getattr(settings, "RESPONSE_CACHE_TTL", 0)), 0)
+
+
+def _version_key(scope: str) -> str:
+    return f"{KEY_PREFIX}:version:{scope}"
+
+
+def group_scope(group_id: int) -> str:
+    return f"group:{group_id}"
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def bump_version(scope: str) -> None:
+    key = _version_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # unknown or evicted: restart from the clock so old entries never match
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_versions(scopes: Iterable[str]) -> None:
+    for scope in set(scopes):
+        bump_version(scope)
+
+
+def response_key(name: str, scope: str, params: Dict[str, Any]) -> str:
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{KEY_PREFIX}:{name}:{scope}:{digest}"
+
+
+def _should_recompute_early(entry: Dict[str, Any], beta: float) -> bool:
+    # XFetch: the closer to expiry and the slower the rebuild, the likelier
+    # one request refreshes ahead of time
+    remaining = entry["expires_at"] - time.time()
+    return -entry["delta"] * beta * math.log(1.0 - random.random()) >= remaining
+
+
+def cached_response(
+    name: str,
+    scope: str,
+    params: Dict[str, Any],
+    compute: Callable[[], Any],
+    *,
+    ttl: Optional[int] = None,
+    should_cache: Callable[[Any], bool] = lambda value: True,
+) -> Any:
+    ttl = _ttl() if ttl is None else ttl
+    if ttl <= 0 or not is_shared_cache():
+        return compute()
+
+    key = response_key(name, scope, params)
+    version_key = _version_key(scope)
+    found = cache.get_many([key, version_key])
+    version = found.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key)
+
+    entry = found.get(key)
+    beta = float(getattr(settings, "RESPONSE_CACHE_BETA", 1.0))
+    if entry is not None and entry["version"] == version:
+        if not _should_recompute_early(entry, beta):
+            return entry["value"]
+        if not cache.add(f"{key}:lock", 1, timeout=LOCK_TIMEOUT):
+            # someone else is already refreshing; the entry is still valid
+            return entry["value"]
+        return _compute_and_store(key, version, compute, ttl, should_cache)
+
+    if cache.add(f"{key}:lock", 1, timeout=LOCK_TIMEOUT):
+        return _compute_and_store(key, version, compute, ttl, should_cache)
+
+    waited = _wait_for(key, version)
+    if waited is not None:
+        return waited["value"]
+    return compute()
+
+
+def _compute_and_store(key, version, compute, ttl, should_cache):
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        if should_cache(value):
+            cache.set(
+                key,
+                {
+                    "value": value,
+                    "version": version,
+                    "delta": delta,
+                    "expires_at": time.time() + ttl,
+                },
+                timeout=ttl,
+            )
+        return value
+    finally:
+        cache.delete(f"{key}:lock")
+
+
+def _wait_for(key: str, version) -> Optional[Dict[str, Any]]:
+    deadline = time.monotonic() + float(
+        getattr(settings, "RESPONSE_CACHE_WAIT", 1.0)
+    )
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_POLL)
+        entry = cache.get(key)
+        if entry is not None and entry["version"] == version:
+            return entry
+    return None
@@ -0,0 +1,16 @@
+"""
+Whether a Django cache is shared by every worker process.
+
+LocMem (the default here) and Dummy caches live in, or vanish with, a single
+process, so invalidating an entry only reaches the worker that saw the write.
+Caches whose correctness depends on invalidation must stay off on them.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias: str = "default") -> bool:
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
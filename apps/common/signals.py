@@ -0,0 +1,48 @@
+"""
+Bump response cache versions when groups, memberships, bank accounts, ledger,
+budget or dues rows change.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.budget.models import Budget
+from apps.common.models import Payment, Transaction
+from apps.common.services.response_cache import bump_versions, group_scope, user_scope
+from apps.groups.models import Group, GroupMembership
+from apps.openbanking.models import OpenBankingAccount
+
+
+def _scopes(instance):
+    if isinstance(instance, Group):
+        return [group_scope(instance.pk)]
+    scopes = []
+    if getattr(instance, "group_id", None):
+        scopes.append(group_scope(instance.group_id))
+    if getattr(instance, "user_id", None):
+        scopes.append(user_scope(instance.user_id))
+    return scopes
+
+
+def _bump_for(sender, instance, **kwargs):
+    scopes = _scopes(instance)
+    if scopes:
+        # after commit, so a reader racing the write cannot cache old data
+        # under the new version
+        transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def connect_signals():
+    for model in (
+        Group,
+        GroupMembership,
+        OpenBankingAccount,
+        Transaction,
+        Budget,
+        Payment,
+    ):
+        post_save.connect(
+            _bump_for, sender=model, dispatch_uid=f"respcache-save-{model.__name__}"
+        )
+        post_delete.connect(
+            _bump_for, sender=model, dispatch_uid=f"respcache-delete-{model.__name__}"
+        )
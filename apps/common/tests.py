@@ -1,3 +1,116 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.common.services import http_client
+from apps.common.services.fake_upstream import FakeUpstreamConfig, FakeUpstreamHandler
+from apps.common.services.response_cache import cached_response, group_scope
+from apps.groups.models import Group, GroupMembership
+from apps.openbanking.models import OpenBankingAccount
+
+
+class DefaultTimeoutTests(SimpleTestCase):
+    @override_settings(HTTP_CLIENT_CONNECT_TIMEOUT=3, HTTP_CLIENT_READ_TIMEOUT=11)
+    def test_client_defaults_apply_without_service_override(self):
+        self.assertEqual(http_client.default_timeout("unconfigured"), (3.0, 11.0))
+
+    @override_settings(HTTP_CLOVA_CONNECT_TIMEOUT=1, HTTP_CLOVA_READ_TIMEOUT=25)
+    def test_service_override_wins(self):
+        self.assertEqual(http_client.default_timeout("clova"), (1.0, 25.0))
+
+    @override_settings(HTTP_KAKAO_CONNECT_TIMEOUT=1.5, HTTP_KAKAO_READ_TIMEOUT=4)
+    def test_requests_use_the_service_timeout(self):
+        session = mock.Mock()
+        session.request.return_value = mock.Mock(status_code=200)
+        with mock.patch.object(http_client, "get_session", return_value=session):
+            http_client.get("kakao", "https://kapi.example.com/v2/user/me")
+
+        self.assertEqual(session.request.call_args.kwargs["timeout"], (1.5, 4.0))
+
+
+class FakeUpstreamTransactionsTests(SimpleTestCase):
+    def _list(self, **query):
+        handler = mock.Mock(server=mock.Mock(config=FakeUpstreamConfig()))
+        status, payload = FakeUpstreamHandler.openbanking_transactions(
+            handler, query, b""
+        )
+        self.assertEqual(status, 200)
+        return payload
+
+    def test_rows_stay_between_from_and_to_date(self):
+        payload = self._list(from_date="20240301", to_date="20240310", size="1000")
+
+        days = {row["tran_date"] for row in payload["res_list"]}
+        self.assertEqual(len(payload["res_list"]), 50)
+        self.assertEqual(min(days), "20240301")
+        self.assertEqual(max(days), "20240310")
+        self.assertEqual(payload["next_page_yn"], "N")
+
+    def test_paging_stops_at_the_range(self):
+        payload = self._list(
+            from_date="20240301", to_date="20240302", page="2", size="8"
+        )
+
+        self.assertEqual(payload["res_cnt"], "2")
+        self.assertEqual(payload["next_page_yn"], "N")
+
+    def test_without_from_date_the_configured_total_is_served(self):
+        payload = self._list(to_date="20240310", size="1000")
+
+        total = FakeUpstreamConfig.transactions_total
+        self.assertEqual(len(payload["res_list"]), total)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.shared = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            },
+            RESPONSE_CACHE_TTL=300,
+        )
+        owner = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.member = get_user_model().objects.create_user(
+            username="member", email="member@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=owner)
+        self.compute = mock.Mock(side_effect=lambda: self.compute.call_count)
+
+    def _get(self):
+        return cached_response(
+            "dashboard", group_scope(self.group.id), {}, self.compute
+        )
+
+    @override_settings(RESPONSE_CACHE_TTL=300)
+    def test_process_local_cache_is_never_used(self):
+        self.assertEqual([self._get(), self._get()], [1, 2])
+
+    def test_shared_cache_serves_repeat_views(self):
+        with self.shared:
+            self.assertEqual([self._get(), self._get()], [1, 1])
+            cache.clear()
+
+    def test_membership_and_bank_account_writes_invalidate(self):
+        with self.shared:
+            self._get()
+            with self.captureOnCommitCallbacks(execute=True):
+                GroupMembership.objects.create(group=self.group, user=self.member)
+            self.assertEqual(self._get(), 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                OpenBankingAccount.objects.create(
+                    group=self.group, alias="main", fintech_use_num="1999000000001"
+                )
+            self.assertEqual(self._get(), 3)
+            cache.clear()
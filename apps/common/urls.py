@@ -8,6 +8,7 @@ from apps.common.views.dues import (
     PaymentViewSet,
 )
 from apps.common.views.ledger import TransactionViewSet
+from apps.common.views.system import HttpClientMetricsView
 from apps.ocr.views import ReceiptOCRView
 
 router = DefaultRouter()
@@ -19,6 +20,7 @@ urlpatterns = [
     path("dues/unpaid", DuesUnpaidView.as_view()),
     path("dues/my-history", MyDuesHistoryView.as_view()),
     path("ocr/receipt", ReceiptOCRView.as_view()),
+    path("system/http-clients", HttpClientMetricsView.as_view()),
 ]
 
 urlpatterns += router.urls
@@ -0,0 +1,15 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.common.services.http_client import metrics_snapshot
+
+
+class HttpClientMetricsView(APIView):
+    """Per-host outbound HTTP latency/error counters of this worker process."""
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics_snapshot(), status=status.HTTP_200_OK)
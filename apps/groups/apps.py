@@ -5,3 +5,8 @@ class GroupsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.groups"
     verbose_name = "Groups"
+
+    def ready(self):
+        from apps.groups.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,178 @@
+"""
+Group dashboard payload.
+
+The bank balance is requested on a worker thread first, then the ledger
+figures are read with three queries (recent lists via a window rank, income
+and expense totals, dues counts). The balance gets whatever is left of
+DASHBOARD_BALANCE_DEADLINE; if it is late, the ledger balance is shown and
+the bank call finishes in the background, warming the balance cache.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, F, Q, Sum
+from django.db.models.expressions import Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from apps.common.models import Payment, Transaction
+from apps.openbanking.cache import cached_balance
+from apps.openbanking.models import OpenBankingAccount
+from apps.openbanking.services import OpenBankingServiceError
+
+logger = logging.getLogger(__name__)
+
+RECENT_LIMIT = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(
+                    int(getattr(settings, "DASHBOARD_BALANCE_WORKERS", 4)), 1
+                ),
+                thread_name_prefix="dashboard-balance",
+            )
+        return _executor
+
+
+def reset_executor() -> None:
+    """Drop the worker pool; a forked child must not reuse the parent's threads."""
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def _fetch_bank_balance(fintech_use_num: str) -> Tuple[Any, Dict[str, Any]]:
+    close_old_connections()
+    try:
+        payload, cache_info = cached_balance(fintech_use_num)
+    finally:
+        close_old_connections()
+    return payload.get("balance"), cache_info
+
+
+def _start_balance_lookup(group) -> Optional[Future]:
+    account = (
+        OpenBankingAccount.objects.filter(group=group, enabled=True)
+        .order_by("-updated_at")
+        .only("fintech_use_num")
+        .first()
+    )
+    if account is None:
+        return None
+    return _get_executor().submit(_fetch_bank_balance, account.fintech_use_num)
+
+
+def _await_balance(future: Optional[Future], deadline: float):
+    if future is None:
+        return None, None
+    try:
+        remaining = max(deadline - time.monotonic(), 0)
+        balance, cache_info = future.result(timeout=remaining)
+        if isinstance(balance, str):
+            balance = int(balance.replace(",", ""))
+        return balance, cache_info
+    except FutureTimeoutError:
+        logger.info("Dashboard bank balance missed the deadline")
+    except (OpenBankingServiceError, ValueError, TypeError) as exc:
+        logger.info("Dashboard bank balance unavailable: %s", exc)
+    except Exception:
+        # anything else from the worker (a database error, a bug) must not
+        # take the dashboard down with it; show the ledger balance instead
+        logger.exception("Dashboard bank balance lookup failed")
+    return None, None
+
+
+def _serialize_transaction(tx) -> Dict[str, Any]:
+    return {
+        "id": tx.id,
+        "date": tx.date,
+        "amount": tx.amount,
+        "type": tx.type,
+        "description": tx.description,
+        "category": tx.category,
+        "user": tx.user.get_username() if tx.user else None,
+    }
+
+
+def _recent_transactions(group) -> Dict[str, list]:
+    ordering = [F("date").desc(), F("id").desc()]
+    rows = (
+        Transaction.objects.select_related("user")
+        .filter(group=group)
+        .annotate(
+            overall_rank=Window(RowNumber(), order_by=ordering),
+            type_rank=Window(RowNumber(), partition_by=[F("type")], order_by=ordering),
+        )
+        .filter(Q(overall_rank__lte=RECENT_LIMIT) | Q(type_rank__lte=RECENT_LIMIT))
+        .order_by("-date", "-id")
+    )
+    recent: Dict[str, list] = {"all": [], "income": [], "expense": []}
+    for tx in rows:
+        item = _serialize_transaction(tx)
+        if tx.overall_rank <= RECENT_LIMIT:
+            recent["all"].append(item)
+        if tx.type_rank <= RECENT_LIMIT and tx.type in recent:
+            recent[tx.type].append(item)
+    return recent
+
+
+def build_dashboard_payload(group) -> Dict[str, Any]:
+    deadline = time.monotonic() + float(
+        getattr(settings, "DASHBOARD_BALANCE_DEADLINE", 0.8)
+    )
+    balance_future = _start_balance_lookup(group)
+
+    recent = _recent_transactions(group)
+    totals = Transaction.objects.filter(group=group).aggregate(
+        income=Sum("amount", filter=Q(type=Transaction.TransactionType.INCOME)),
+        expense=Sum("amount", filter=Q(type=Transaction.TransactionType.EXPENSE)),
+    )
+    income_total = int(totals["income"] or 0)
+    expense_total = int(totals["expense"] or 0)
+
+    current = timezone.localdate()
+    dues = Payment.objects.filter(
+        group=group, year=current.year, month=current.month
+    ).aggregate(total=Count("id"), paid=Count("id", filter=Q(is_paid=True)))
+
+    balance, balance_cache = _await_balance(balance_future, deadline)
+    balance_source = "bank"
+    if balance is None:
+        balance = income_total - expense_total
+        # "ledger_fallback": an account is linked but the bank did not answer
+        balance_source = "ledger" if balance_future is None else "ledger_fallback"
+
+    return {
+        "group": {"id": group.id, "name": group.name},
+        "balance": balance,
+        "balance_source": balance_source,
+        "balance_cache": balance_cache,
+        "recent_transactions": recent,
+        "stats": {
+            "period": {
+                "start": current.replace(day=1),
+                "end": current,
+            },
+            "income_total": income_total,
+            "expense_total": expense_total,
+        },
+        "dues_summary": {
+            "year": current.year,
+            "month": current.month,
+            "paid_count": dues["paid"],
+            "unpaid_count": dues["total"] - dues["paid"],
+        },
+    }
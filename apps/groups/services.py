@@ -1,10 +1,14 @@
 import random
 import string
+import time
 from typing import Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from apps.common.services.shared_cache import is_shared_cache
 from apps.groups.models import Group, GroupMembership
 
 
@@ -35,29 +39,106 @@ def extract_group_id(request) -> int:
         raise ValidationError({"group_id": "Invalid group_id"}) from exc
 
 
+CONTEXT_KEY_PREFIX = "groups:context"
+
+
+def _context_ttl() -> int:
+    return max(int(getattr(settings, "GROUP_CONTEXT_CACHE_TTL", 0)), 0)
+
+
+def _context_key(group_id: int, user_id: int) -> str:
+    return f"{CONTEXT_KEY_PREFIX}:{group_id}:{user_id}"
+
+
+def _group_version_key(group_id: int) -> str:
+    return f"{CONTEXT_KEY_PREFIX}:version:{group_id}"
+
+
+def forget_membership(group_id: int, user_id: int) -> None:
+    cache.delete(_context_key(group_id, user_id))
+
+
+def bump_group_version(group_id: int) -> None:
+    """Invalidate every cached (user, group) context of ``group_id``."""
+    cache.set(_group_version_key(group_id), time.time_ns(), timeout=None)
+
+
+def _load_context(group_id: int, user) -> tuple[Group, Optional[GroupMembership]]:
+    # members (the common case) cost one query; only non-members need a
+    # second one for the group itself
+    membership = (
+        GroupMembership.objects.select_related("group")
+        .filter(group_id=group_id, user=user, status=GroupMembership.Status.ACTIVE)
+        .first()
+    )
+    if membership is not None:
+        return membership.group, membership
+    return get_object_or_404(Group, pk=group_id), None
+
+
+def get_group_context(group_id: int, user) -> tuple[Group, Optional[GroupMembership]]:
+    """
+    The group and ``user``'s active membership (or None), served from a
+    short-lived shared cache. Entries are dropped when the membership is
+    saved or deleted and outdated when the group itself changes.
+
+    Invalidation only reaches other workers through a shared cache, so on a
+    process-local backend every call goes to the database: a removed or
+    demoted member must lose access at once, not after the TTL.
+    """
+    ttl = _context_ttl()
+    if ttl <= 0 or not is_shared_cache():
+        return _load_context(group_id, user)
+    key = _context_key(group_id, user.pk)
+    version_key = _group_version_key(group_id)
+    found = cache.get_many([key, version_key])
+    version = found.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key)
+    entry = found.get(key)
+    if entry is not None and entry["version"] == version:
+        return entry["group"], entry["membership"]
+    group, membership = _load_context(group_id, user)
+    cache.set(
+        key, {"group": group, "membership": membership, "version": version}, ttl
+    )
+    return group, membership
+
+
+def _remember(request, group: Group, membership: Optional[GroupMembership]) -> None:
+    # keep the memo on the Django request so the DRF wrapper, permissions and
+    # views all share it
+    http_request = getattr(request, "_request", request)
+    memo = getattr(http_request, "_group_context", None)
+    if memo is None:
+        memo = http_request._group_context = {}
+    memo[group.pk] = (group, membership)
+    setattr(request, "group", group)
+    setattr(request, "group_membership", membership)
+
+
 def resolve_group_and_membership(request) -> tuple[Group, GroupMembership]:
     group_id = extract_group_id(request)
-    group = get_object_or_404(Group, pk=group_id)
-    if not request.user or not request.user.is_authenticated:
-        raise PermissionDenied("Authentication required for group access")
-    membership = GroupMembership.objects.filter(
-        group=group,
-        user=request.user,
-        status=GroupMembership.Status.ACTIVE,
-    ).first()
+    http_request = getattr(request, "_request", request)
+    memo = getattr(http_request, "_group_context", None) or {}
+    if group_id in memo:
+        group, membership = memo[group_id]
+    else:
+        if not request.user or not request.user.is_authenticated:
+            get_object_or_404(Group, pk=group_id)
+            raise PermissionDenied("Authentication required for group access")
+        group, membership = get_group_context(group_id, request.user)
     if membership is None and not getattr(request.user, "is_staff", False):
         raise PermissionDenied("Group membership required")
-    setattr(request, "group", group)
-    setattr(request, "group_membership", membership)
+    _remember(request, group, membership)
     return group, membership
 
 
 def get_active_membership(group: Group, user) -> Optional[GroupMembership]:
-    return GroupMembership.objects.filter(
-        group=group,
-        user=user,
-        status=GroupMembership.Status.ACTIVE,
-    ).first()
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return get_group_context(group.pk, user)[1]
 
 
 def resolve_group_with_default(request) -> tuple[Group, Optional[GroupMembership]]:
@@ -82,8 +163,7 @@ def resolve_group_with_default(request) -> tuple[Group, Optional[GroupMembership
         raise ValidationError({"group_id": "활성화된 그룹이 없습니다."})
 
     group = membership.group
-    setattr(request, "group", group)
-    setattr(request, "group_membership", membership)
+    _remember(request, group, membership)
     return group, membership
 
 
@@ -0,0 +1,34 @@
+"""Keep the cached group/membership context in step with membership and group writes."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.groups.models import Group, GroupMembership
+from apps.groups.services import bump_group_version, forget_membership
+
+
+def _forget_membership(sender, instance, **kwargs):
+    group_id, user_id = instance.group_id, instance.user_id
+    forget_membership(group_id, user_id)
+    # again after commit, in case a concurrent request re-cached the old row
+    transaction.on_commit(lambda: forget_membership(group_id, user_id))
+
+
+def _bump_group(sender, instance, **kwargs):
+    group_id = instance.pk
+    bump_group_version(group_id)
+    transaction.on_commit(lambda: bump_group_version(group_id))
+
+
+def connect_signals():
+    post_save.connect(
+        _forget_membership,
+        sender=GroupMembership,
+        dispatch_uid="groupctx-save-membership",
+    )
+    post_delete.connect(
+        _forget_membership,
+        sender=GroupMembership,
+        dispatch_uid="groupctx-delete-membership",
+    )
+    post_save.connect(_bump_group, sender=Group, dispatch_uid="groupctx-save-group")
+    post_delete.connect(_bump_group, sender=Group, dispatch_uid="groupctx-delete-group")
@@ -0,0 +1,194 @@
+import datetime
+import shutil
+import tempfile
+from concurrent.futures import Future
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from apps.common.models import Transaction
+from apps.groups import dashboard
+from apps.groups.models import Group, GroupMembership
+from apps.groups.services import get_group_context
+from apps.openbanking.models import OpenBankingAccount
+
+
+@override_settings(GROUP_CONTEXT_CACHE_TTL=30)
+class GroupContextCacheTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.user = get_user_model().objects.create_user(
+            username="member", email="member@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=owner)
+        self.membership = GroupMembership.objects.create(
+            group=self.group,
+            user=self.user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+
+    def _shared_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        settings_override = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(cache.clear)
+
+    def _context(self):
+        return get_group_context(self.group.id, self.user)
+
+    def test_process_local_cache_always_reads_the_database(self):
+        self._context()
+        # a write seen by another worker only: no signal reaches this process
+        GroupMembership.objects.filter(pk=self.membership.pk).update(
+            status=GroupMembership.Status.SUSPENDED
+        )
+
+        self.assertIsNone(self._context()[1])
+
+    def test_shared_cache_serves_repeat_lookups(self):
+        self._shared_cache()
+        self._context()
+
+        with self.assertNumQueries(0):
+            group, membership = self._context()
+        self.assertEqual(membership.pk, self.membership.pk)
+
+    def test_membership_save_and_delete_invalidate(self):
+        self._shared_cache()
+        self._context()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.role = GroupMembership.Roles.MEMBER
+            self.membership.save()
+        self.assertEqual(self._context()[1].role, GroupMembership.Roles.MEMBER)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.delete()
+        self.assertIsNone(self._context()[1])
+
+    def test_group_save_invalidates(self):
+        self._shared_cache()
+        self._context()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.name = "renamed"
+            self.group.save()
+
+        self.assertEqual(self._context()[0].name, "renamed")
+
+
+class DashboardPayloadTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.user)
+
+    def _add(self, day, amount, type="expense"):
+        return Transaction.objects.create(
+            group=self.group,
+            user=self.user,
+            amount=amount,
+            description="x",
+            date=datetime.date(2024, 3, 1) + datetime.timedelta(days=day),
+            type=type,
+        )
+
+    def _link_account(self):
+        OpenBankingAccount.objects.create(
+            group=self.group, alias="main", fintech_use_num="F1"
+        )
+
+    def test_recent_lists_rank_overall_and_per_type(self):
+        incomes = [self._add(day, 100, "income") for day in range(3)]
+        expenses = [self._add(day, 10) for day in range(3, 13)]
+        other = Group.objects.create(name="other", owner=self.user)
+        Transaction.objects.create(
+            group=other,
+            user=self.user,
+            amount=1,
+            description="x",
+            date=datetime.date(2030, 1, 1),
+            type="expense",
+        )
+
+        payload = dashboard.build_dashboard_payload(self.group)
+
+        recent = payload["recent_transactions"]
+        newest = [tx.id for tx in reversed(incomes + expenses)]
+        self.assertEqual([item["id"] for item in recent["all"]], newest[:8])
+        self.assertEqual(
+            [item["id"] for item in recent["income"]],
+            [tx.id for tx in reversed(incomes)],
+        )
+        self.assertEqual(
+            [item["id"] for item in recent["expense"]],
+            [tx.id for tx in reversed(expenses)][:8],
+        )
+        self.assertEqual(payload["balance"], 300 - 100)
+        self.assertEqual(payload["balance_source"], "ledger")
+
+    def test_ties_on_date_rank_by_newest_id(self):
+        first = self._add(0, 10)
+        second = self._add(0, 20)
+
+        recent = dashboard.build_dashboard_payload(self.group)["recent_transactions"]
+
+        self.assertEqual([item["id"] for item in recent["all"]], [second.id, first.id])
+
+    @override_settings(DASHBOARD_BALANCE_DEADLINE=0)
+    def test_late_bank_balance_falls_back_to_the_ledger(self):
+        self._link_account()
+        self._add(0, 500, "income")
+        pending = Future()
+
+        with mock.patch.object(
+            dashboard, "_start_balance_lookup", return_value=pending
+        ):
+            payload = dashboard.build_dashboard_payload(self.group)
+
+        self.assertEqual(payload["balance"], 500)
+        self.assertEqual(payload["balance_source"], "ledger_fallback")
+        self.assertIsNone(payload["balance_cache"])
+
+    def test_bank_balance_is_used_when_it_answers_in_time(self):
+        self._link_account()
+        answered = Future()
+        answered.set_result(("12,345", {"status": "HIT"}))
+
+        with mock.patch.object(
+            dashboard, "_start_balance_lookup", return_value=answered
+        ):
+            payload = dashboard.build_dashboard_payload(self.group)
+
+        self.assertEqual(payload["balance"], 12345)
+        self.assertEqual(payload["balance_source"], "bank")
+
+    def test_unexpected_worker_error_falls_back_to_the_ledger(self):
+        self._link_account()
+        self._add(0, 700, "income")
+        failed = Future()
+        failed.set_exception(DatabaseError("connection lost"))
+
+        with mock.patch.object(
+            dashboard, "_start_balance_lookup", return_value=failed
+        ), self.assertLogs("apps.groups.dashboard", level="ERROR"):
+            payload = dashboard.build_dashboard_payload(self.group)
+
+        self.assertEqual(payload["balance"], 700)
+        self.assertEqual(payload["balance_source"], "ledger_fallback")
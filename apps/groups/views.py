@@ -1,5 +1,4 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Sum
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
@@ -8,9 +7,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.common.models import Payment, Transaction
-from apps.openbanking.models import OpenBankingAccount
-from apps.openbanking.services import fetch_balance
+from apps.common.services.response_cache import cached_response, group_scope
+from apps.groups.dashboard import build_dashboard_payload
 from apps.groups.models import Group, GroupMembership
 from apps.groups.serializers import (
     GroupCreateSerializer,
@@ -293,100 +291,6 @@ class GroupLeaveView(APIView):
         return Response(payload, status=status.HTTP_200_OK)
 
 
-def _serialize_transactions(queryset):
-    return [
-        {
-            "id": tx.id,
-            "date": tx.date,
-            "amount": tx.amount,
-            "type": tx.type,
-            "description": tx.description,
-            "category": tx.category,
-            "user": tx.user.get_username() if tx.user else None,
-        }
-        for tx in queryset
-    ]
-
-
-def _build_dashboard_payload(group):
-    tx_qs = (
-        Transaction.objects.select_related("user", "budget")
-        .filter(group=group)
-        .order_by("-date", "-id")
-    )
-    recent = {
-        "all": _serialize_transactions(tx_qs[:8]),
-        "income": _serialize_transactions(
-            tx_qs.filter(type=Transaction.TransactionType.INCOME)[:8]
-        ),
-        "expense": _serialize_transactions(
-            tx_qs.filter(type=Transaction.TransactionType.EXPENSE)[:8]
-        ),
-    }
-
-    income_total = (
-        Transaction.objects.filter(
-            group=group, type=Transaction.TransactionType.INCOME
-        ).aggregate(total=Sum("amount"))["total"]
-        or 0
-    )
-    expense_total = (
-        Transaction.objects.filter(
-            group=group, type=Transaction.TransactionType.EXPENSE
-        ).aggregate(total=Sum("amount"))["total"]
-        or 0
-    )
-
-    balance = None
-    account = (
-        OpenBankingAccount.objects.filter(group=group, enabled=True)
-        .order_by("-updated_at")
-        .first()
-    )
-    if account:
-        try:
-            balance_payload = fetch_balance(account.fintech_use_num)
-            balance = balance_payload.get("balance")
-            if isinstance(balance, str):
-                balance = int(balance.replace(",", ""))
-        except Exception:
-            balance = None
-    if balance is None:
-        balance = int(income_total) - int(expense_total)
-
-    current = timezone.localdate()
-    paid_count = Payment.objects.filter(
-        group=group, year=current.year, month=current.month, is_paid=True
-    ).count()
-    unpaid_count = (
-        Payment.objects.filter(
-            group=group, year=current.year, month=current.month
-        )
-        .exclude(is_paid=True)
-        .count()
-    )
-
-    return {
-        "group": {"id": group.id, "name": group.name},
-        "balance": balance,
-        "recent_transactions": recent,
-        "stats": {
-            "period": {
-                "start": current.replace(day=1),
-                "end": current,
-            },
-            "income_total": int(income_total),
-            "expense_total": int(expense_total),
-        },
-        "dues_summary": {
-            "year": current.year,
-            "month": current.month,
-            "paid_count": paid_count,
-            "unpaid_count": unpaid_count,
-        },
-    }
-
-
 class DashboardAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -394,5 +298,13 @@ class DashboardAPIView(APIView):
         group, membership = resolve_group_with_default(request)
         if membership is None and not (request.user.is_staff or request.user.is_superuser):
             raise PermissionDenied("그룹 구성원만 조회할 수 있습니다.")
-        data = _build_dashboard_payload(group)
+        data = cached_response(
+            "dashboard",
+            group_scope(group.id),
+            # dues and period figures are per month
+            {"today": timezone.localdate().isoformat()},
+            lambda: build_dashboard_payload(group),
+            # retry the bank next time instead of pinning the fallback
+            should_cache=lambda data: data["balance_source"] != "ledger_fallback",
+        )
         return Response(data)
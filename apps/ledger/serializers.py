@@ -18,6 +18,7 @@ try:
 except LookupError:  # pragma: no cover
     Category = None
 
+from apps.ocr.serializers import validate_receipt_file
 from apps.users.serializers import UserSerializer
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -36,7 +37,7 @@ class TransactionSerializer(serializers.ModelSerializer):
         allow_null=True,
     )
     budget = serializers.SerializerMethodField()
-    receipt_image = serializers.ImageField(required=False, allow_null=True)
+    receipt_image = serializers.FileField(required=False, allow_null=True)
 
     class Meta:
         model = Transaction
@@ -53,10 +54,18 @@ class TransactionSerializer(serializers.ModelSerializer):
             "type",
             "category",
             "receipt_image",
+            "ocr_status",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "id",
+            "user",
+            "budget",
+            "ocr_status",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "user", "budget", "created_at", "updated_at"]
 
     def validate_amount(self, value: int) -> int:
         if value is None or value <= 0:
@@ -83,7 +92,7 @@ class TransactionSerializer(serializers.ModelSerializer):
         ext = os.path.splitext(name)[1].lower().lstrip(".")
         if ext and allowed_exts and ext not in allowed_exts:
             raise serializers.ValidationError("Unsupported receipt file type")
-        return value
+        return validate_receipt_file(value)
 
     def validate(self, attrs):
         attrs = super().validate(attrs)
@@ -118,6 +127,14 @@ class TransactionSerializer(serializers.ModelSerializer):
                         )
         return attrs
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # set by the view right after a receipt upload; not stored
+        duplicates = getattr(instance, "receipt_duplicates", None)
+        if duplicates is not None:
+            data["receipt_duplicates"] = duplicates
+        return data
+
     def get_budget(self, obj):
         if obj.budget_id:
             budget = getattr(obj, "budget", None)
@@ -0,0 +1,215 @@
+import io
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.common.models import ReceiptFingerprint, Transaction
+from apps.groups.models import Group, GroupMembership
+from apps.ocr.services import fingerprints
+
+
+def _png(color) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    image = Image.new("RGB", (64, 48), color)
+    image.paste((0, 0, 0), (0, 0, 32, 24))
+    image.save(buffer, format="PNG")
+    return SimpleUploadedFile("receipt.png", buffer.getvalue(), "image/png")
+
+
+class ReceiptFingerprintOnUploadTests(TransactionTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, OCR_AUTO_ON_UPLOAD=False
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.user)
+        GroupMembership.objects.create(
+            group=self.group,
+            user=self.user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, upload):
+        return self.client.post(
+            "/api/transactions/",
+            {
+                "group_id": self.group.id,
+                "amount": 1000,
+                "description": "coffee",
+                "date": "2024-01-01",
+                "type": "expense",
+                "receipt_image": upload,
+            },
+            format="multipart",
+        )
+
+    def test_image_is_hashed_outside_the_db_transaction(self):
+        in_atomic = []
+        original = fingerprints.dhash
+
+        def spy(fileobj):
+            in_atomic.append(connection.in_atomic_block)
+            return original(fileobj)
+
+        with mock.patch.object(fingerprints, "dhash", side_effect=spy):
+            response = self._create(_png((255, 255, 255)))
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(in_atomic, [False])
+        self.assertEqual(ReceiptFingerprint.objects.count(), 1)
+
+    def test_same_photo_is_reported_as_duplicate(self):
+        first = self._create(_png((255, 255, 255)))
+        second = self.client.post(
+            "/api/transactions/",
+            {
+                "group_id": self.group.id,
+                "amount": 2000,
+                "description": "lunch",
+                "date": "2024-01-02",
+                "type": "expense",
+                "receipt_image": _png((255, 255, 255)),
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(second.status_code, 201, second.data)
+        duplicates = second.data["receipt_duplicates"]
+        self.assertEqual(
+            [item["transaction_id"] for item in duplicates], [first.data["id"]]
+        )
+
+
+class AccumulatedStatsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.user)
+        GroupMembership.objects.create(
+            group=self.group,
+            user=self.user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _add(self, day, amount, type="expense"):
+        Transaction.objects.create(
+            group=self.group,
+            user=self.user,
+            amount=amount,
+            description="x",
+            date=day,
+            type=type,
+        )
+
+    def _get(self, **params):
+        return self.client.get(
+            "/api/stats/accumulated", {"group_id": self.group.id, **params}
+        )
+
+    def test_gaps_repeat_the_running_totals(self):
+        self._add(date(2024, 1, 5), 1000)
+        self._add(date(2024, 1, 20), 500, type="income")
+        self._add(date(2024, 3, 2), 200)
+
+        response = self._get(granularity="month")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["period"], row["cumulative"]) for row in response.data["expense"]],
+            [
+                (date(2024, 1, 1), 1000),
+                (date(2024, 2, 1), 1000),
+                (date(2024, 3, 1), 1200),
+            ],
+        )
+        self.assertEqual(
+            [row["cumulative"] for row in response.data["income"]], [500, 500, 500]
+        )
+
+    def test_date_from_starts_from_the_totals_before_the_range(self):
+        self._add(date(2023, 12, 30), 1000)
+        self._add(date(2024, 1, 3), 300, type="income")
+        self._add(date(2024, 2, 10), 200)
+        self._add(date(2024, 3, 1), 50)
+        other = Group.objects.create(name="other", owner=self.user)
+        Transaction.objects.create(
+            group=other,
+            user=self.user,
+            amount=9999,
+            description="x",
+            date=date(2023, 1, 1),
+            type="expense",
+        )
+
+        response = self._get(
+            granularity="month", date_from="2024-01-05", date_to="2024-02-28"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["period"], row["cumulative"]) for row in response.data["expense"]],
+            [(date(2024, 2, 1), 1200)],
+        )
+        self.assertEqual([row["cumulative"] for row in response.data["income"]], [300])
+
+    def test_fill_is_clamped_to_the_data(self):
+        self._add(date(2024, 1, 2), 100)
+        self._add(date(2024, 1, 4), 100)
+
+        response = self._get(
+            granularity="day", date_from="0001-01-01", date_to="9999-12-31"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["period"] for row in response.data["expense"]],
+            [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)],
+        )
+
+    def test_no_rows_gives_empty_series(self):
+        response = self._get(
+            granularity="day", date_from="0001-01-01", date_to="9999-12-31"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["expense"], [])
+
+    def test_last_period_at_date_max_does_not_overflow(self):
+        self._add(date(9999, 12, 30), 100)
+        self._add(date.max, 100)
+
+        for granularity in ("day", "week", "month", "quarter", "year"):
+            with self.subTest(granularity=granularity):
+                response = self._get(granularity=granularity)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data["expense"][-1]["cumulative"], 200)
+
+    @override_settings(STATS_MAX_PERIODS=2)
+    def test_too_many_periods_is_a_bad_request(self):
+        self._add(date(2024, 1, 5), 100)
+        self._add(date(2024, 3, 5), 100)
+
+        self.assertEqual(self._get(granularity="month").status_code, 400)
+        self.assertEqual(self._get(granularity="quarter").status_code, 200)
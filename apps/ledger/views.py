@@ -13,6 +13,8 @@ from apps.ledger.models import LedgerAuditLog
 from apps.ledger.serializers import TransactionSerializer
 from apps.groups.mixins import GroupContextMixin
 from apps.groups.services import get_active_membership, user_is_group_admin
+from apps.ocr.services.fingerprints import hash_receipt, store_receipt_fingerprint
+from apps.ocr.services.pipeline import schedule_receipt_ocr
 
 
 class TransactionViewSet(GroupContextMixin, viewsets.ModelViewSet):
@@ -61,6 +63,13 @@ class TransactionViewSet(GroupContextMixin, viewsets.ModelViewSet):
             ),
         }
 
+    @staticmethod
+    def _hash_uploaded_receipt(serializer):
+        # decode the image before the DB transaction opens, not while it holds locks
+        if "receipt_image" not in serializer.validated_data:
+            return None
+        return hash_receipt(serializer.validated_data["receipt_image"])
+
     def perform_create(self, serializer):
         if not self.request.user.is_authenticated:
             raise ValidationError({"detail": "Authentication required"})
@@ -68,6 +77,7 @@ class TransactionViewSet(GroupContextMixin, viewsets.ModelViewSet):
         membership = get_active_membership(group, self.request.user)
         if membership is None:
             raise ValidationError({"detail": "Group membership required"})
+        receipt_hash = self._hash_uploaded_receipt(serializer)
         with db_transaction.atomic():
             instance = serializer.save(user=self.request.user, group=group, membership=membership)
             LedgerAuditLog.objects.create(
@@ -76,10 +86,17 @@ class TransactionViewSet(GroupContextMixin, viewsets.ModelViewSet):
                 action=LedgerAuditLog.Action.CREATE,
                 diff_json={"new": self._serialize_transaction(instance)},
             )
+            if "receipt_image" in serializer.validated_data:
+                instance.receipt_duplicates = store_receipt_fingerprint(
+                    instance, receipt_hash
+                )
+            if serializer.validated_data.get("receipt_image"):
+                schedule_receipt_ocr(instance)
 
     def perform_update(self, serializer):
         if not self.request.user.is_authenticated:
             raise ValidationError({"detail": "Authentication required"})
+        receipt_hash = self._hash_uploaded_receipt(serializer)
         with db_transaction.atomic():
             old_instance = serializer.instance
             if old_instance.group_id != self.get_group().id:
@@ -98,6 +115,12 @@ class TransactionViewSet(GroupContextMixin, viewsets.ModelViewSet):
                     "new": self._serialize_transaction(instance),
                 },
             )
+            if "receipt_image" in serializer.validated_data:
+                instance.receipt_duplicates = store_receipt_fingerprint(
+                    instance, receipt_hash
+                )
+            if serializer.validated_data.get("receipt_image"):
+                schedule_receipt_ocr(instance)
 
     def perform_destroy(self, instance):
         if instance.group_id != self.get_group().id:
@@ -1,20 +1,49 @@
 from calendar import monthrange
-from datetime import date
+from datetime import date, datetime, timedelta
 
-from django.db.models import Sum
-from django.db.models.functions import TruncDay, TruncMonth
+from django.conf import settings
+from django.db.models import BigIntegerField, DateField, F, Func, Q, Sum, Window
+from django.db.models.functions import (
+    Coalesce,
+    TruncDay,
+    TruncMonth,
+    TruncQuarter,
+    TruncWeek,
+    TruncYear,
+)
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.common.models import Transaction
+from apps.common.services.response_cache import cached_response, group_scope, user_scope
 from apps.groups.mixins import GroupContextMixin
 from apps.groups.models import GroupMembership
 
 
-class CategoryShareStatsView(GroupContextMixin, APIView):
+class _StatsView(GroupContextMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    def _resolve_group_or_default(self):
+        try:
+            return self.get_group()
+        except Exception:
+            memberships = getattr(self.request.user, "group_memberships", None)
+            if memberships is None:
+                return None
+            membership = memberships.filter(status=GroupMembership.Status.ACTIVE).order_by("group__name").first()
+            return getattr(membership, "group", None)
+
+    def _cached(self, name, group, compute):
+        """Serve from the versioned response cache of the group (or user)."""
+        scope = group_scope(group.id) if group else user_scope(self.request.user.id)
+        return cached_response(
+            name, scope, dict(self.request.query_params.items()), compute
+        )
+
+
+class CategoryShareStatsView(_StatsView):
+
     def get(self, request):
         start = request.query_params.get("start")
         end = request.query_params.get("end")
@@ -46,94 +75,211 @@ class CategoryShareStatsView(GroupContextMixin, APIView):
         else:
             filters["user"] = request.user
 
-        queryset = (
-            Transaction.objects.filter(**filters)
-            .values("category")
-            .annotate(total=Sum("amount"))
-            .order_by("category")
-        )
-
-        total_amount = sum(item["total"] or 0 for item in queryset)
-        results = []
-        for item in queryset:
-            category = item["category"] or "Uncategorized"
-            amount = int(item["total"] or 0)
-            percent = (amount / total_amount * 100) if total_amount else 0
-            results.append(
-                {"category": category, "amount": amount, "percent": round(percent, 2)}
+        def compute():
+            queryset = (
+                Transaction.objects.filter(**filters)
+                .values("category")
+                .annotate(total=Sum("amount"))
+                .order_by("category")
             )
 
-        return Response(
-            {"start": start, "end": end, "total": total_amount, "items": results}
-        )
+            total_amount = sum(item["total"] or 0 for item in queryset)
+            results = []
+            for item in queryset:
+                category = item["category"] or "Uncategorized"
+                amount = int(item["total"] or 0)
+                percent = (amount / total_amount * 100) if total_amount else 0
+                results.append(
+                    {
+                        "category": category,
+                        "amount": amount,
+                        "percent": round(percent, 2),
+                    }
+                )
+            return {"start": start, "end": end, "total": total_amount, "items": results}
 
+        return Response(self._cached("stats-category", group, compute))
 
-class AccumulatedStatsView(GroupContextMixin, APIView):
-    permission_classes = [IsAuthenticated]
 
+class _RunningSum(Func):
+    """``SUM(...)`` usable over an aggregate inside a window (Sum refuses that)."""
+
+    function = "SUM"
+    window_compatible = True
+
+
+ACCUMULATE_TRUNCS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+    "quarter": TruncQuarter,
+    "year": TruncYear,
+}
+
+
+def _period_index(period, granularity):
+    """Position of a period start on a continuous scale, for counting periods."""
+    if granularity in ("day", "week"):
+        return period.toordinal() // (7 if granularity == "week" else 1)
+    if granularity == "year":
+        return period.year
+    if granularity == "quarter":
+        return period.year * 4 + (period.month - 1) // 3
+    return period.year * 12 + period.month - 1
+
+
+def _next_period(period, granularity):
+    if granularity == "day":
+        return period + timedelta(days=1)
+    if granularity == "week":
+        return period + timedelta(days=7)
+    if granularity == "year":
+        return period.replace(year=period.year + 1)
+    months = 3 if granularity == "quarter" else 1
+    month_index = period.month - 1 + months
+    return date(period.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+class _TooManyPeriods(Exception):
+    pass
+
+
+class AccumulatedStatsView(_StatsView):
     def get(self, request):
         granularity = request.query_params.get("granularity", "month")
-        if granularity not in {"month", "day"}:
-            return Response({"detail": "granularity must be month or day"}, status=400)
+        if granularity not in ACCUMULATE_TRUNCS:
+            return Response(
+                {"detail": "granularity must be day, week, month, quarter or year"},
+                status=400,
+            )
 
-        trunc = TruncMonth if granularity == "month" else TruncDay
+        try:
+            date_from = self._parse_date(request.query_params.get("date_from"))
+            date_to = self._parse_date(request.query_params.get("date_to"))
+        except ValueError:
+            return Response(
+                {"detail": "Invalid date_from/date_to format. Use YYYY-MM-DD"},
+                status=400,
+            )
+        if date_from and date_to and date_from > date_to:
+            return Response(
+                {"detail": "date_from cannot be later than date_to"}, status=400
+            )
 
-        filters_income = {"type": Transaction.TransactionType.INCOME}
-        filters_expense = {"type": Transaction.TransactionType.EXPENSE}
+        filters = {}
+        if date_from:
+            filters["date__gte"] = date_from
+        if date_to:
+            filters["date__lte"] = date_to
         group = self._resolve_group_or_default()
-
         if group:
-            filters_income["group"] = group
-            filters_expense["group"] = group
+            filters["group"] = group
         else:
-            filters_income["user"] = request.user
-            filters_expense["user"] = request.user
+            filters["user"] = request.user
 
-        incomes = (
-            Transaction.objects.filter(**filters_income)
-            .annotate(period=trunc("date"))
-            .values("period")
-            .annotate(total=Sum("amount"))
-            .order_by("period")
-        )
+        def compute():
+            return self._accumulate(granularity, filters)
+
+        try:
+            return Response(self._cached("stats-accumulated", group, compute))
+        except _TooManyPeriods as exc:
+            return Response(
+                {
+                    "detail": f"Range spans {exc.args[0]} {granularity} periods; "
+                    f"narrow date_from/date_to or use a coarser granularity "
+                    f"(at most {self._max_periods()})"
+                },
+                status=400,
+            )
+
+    @staticmethod
+    def _max_periods():
+        return max(int(getattr(settings, "STATS_MAX_PERIODS", 1000)), 1)
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, "%Y-%m-%d").date()
 
-        expenses = (
-            Transaction.objects.filter(**filters_expense)
-            .annotate(period=trunc("date"))
+    def _accumulate(self, granularity, filters):
+        # one GROUP BY pass with both totals; the running sums are a window
+        # over the grouped rows, so only one row per non-empty period comes back
+        trunc = ACCUMULATE_TRUNCS[granularity]
+        by_period = F("period").asc()
+        sums = {
+            "income": Coalesce(
+                Sum("amount", filter=Q(type=Transaction.TransactionType.INCOME)), 0
+            ),
+            "expense": Coalesce(
+                Sum("amount", filter=Q(type=Transaction.TransactionType.EXPENSE)), 0
+            ),
+        }
+        seed = (0, 0)
+        if "date__gte" in filters:
+            # the series is cumulative since the first transaction, not since
+            # date_from: start the running sums from one pre-range aggregate
+            before = {
+                key: value
+                for key, value in filters.items()
+                if key not in ("date__gte", "date__lte")
+            }
+            before["date__lt"] = filters["date__gte"]
+            prior = Transaction.objects.filter(**before).aggregate(**sums)
+            seed = (int(prior["income"]), int(prior["expense"]))
+        rows = (
+            Transaction.objects.filter(**filters)
+            .annotate(period=trunc("date", output_field=DateField()))
             .values("period")
-            .annotate(total=Sum("amount"))
+            .annotate(**sums)
+            .annotate(
+                income_cumulative=Window(
+                    _RunningSum(F("income"), output_field=BigIntegerField()),
+                    order_by=by_period,
+                ),
+                expense_cumulative=Window(
+                    _RunningSum(F("expense"), output_field=BigIntegerField()),
+                    order_by=by_period,
+                ),
+            )
             .order_by("period")
         )
-
-        income_running, expense_running = 0, 0
-        income_results, expense_results = [], []
-
-        for item in incomes:
-            income_running += int(item["total"] or 0)
-            income_results.append(
-                {"period": item["period"].date(), "cumulative": income_running}
+        totals = {
+            self._as_date(row["period"]): (
+                seed[0] + int(row["income_cumulative"] or 0),
+                seed[1] + int(row["expense_cumulative"] or 0),
             )
+            for row in rows
+        }
 
-        for item in expenses:
-            expense_running += int(item["total"] or 0)
-            expense_results.append(
-                {"period": item["period"].date(), "cumulative": expense_running}
+        income_results, expense_results = [], []
+        if totals:
+            # fill between the first and last period that has rows; the query
+            # is already limited to date_from..date_to
+            first, last = min(totals), max(totals)
+            count = (
+                _period_index(last, granularity) - _period_index(first, granularity) + 1
             )
+            if count > self._max_periods():
+                raise _TooManyPeriods(count)
+            running = (0, 0)
+            period = first
+            while True:
+                # periods without rows repeat the previous running totals
+                running = totals.get(period, running)
+                income_results.append({"period": period, "cumulative": running[0]})
+                expense_results.append({"period": period, "cumulative": running[1]})
+                if period >= last:
+                    # stop before stepping, so the last period may end at date.max
+                    break
+                period = _next_period(period, granularity)
 
-        return Response(
-            {
-                "granularity": granularity,
-                "income": income_results,
-                "expense": expense_results,
-            }
-        )
+        return {
+            "granularity": granularity,
+            "income": income_results,
+            "expense": expense_results,
+        }
 
-    def _resolve_group_or_default(self):
-        try:
-            return self.get_group()
-        except Exception:
-            memberships = getattr(self.request.user, "group_memberships", None)
-            if memberships is None:
-                return None
-            membership = memberships.filter(status=GroupMembership.Status.ACTIVE).order_by("group__name").first()
-            return getattr(membership, "group", None)
+    @staticmethod
+    def _as_date(value):
+        return value.date() if isinstance(value, datetime) else value
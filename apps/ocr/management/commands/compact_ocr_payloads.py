@@ -0,0 +1,101 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+
+from apps.common.models import OcrValidationLog, Transaction
+from apps.ocr.services.payloads import store_raw_payload
+
+
+class Command(BaseCommand):
+    help = (
+        "Move inline Clova raw_response payloads out of Transaction.ocr_text and "
+        "OcrValidationLog.extracted_json into the deduplicated OcrRawPayload table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows would be rewritten without saving.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        dry_run = options["dry_run"]
+
+        tx_count = self._compact_transactions(batch_size, dry_run)
+        log_count = self._compact_logs(batch_size, dry_run)
+
+        verb = "Would compact" if dry_run else "Compacted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {tx_count} transaction(s) and {log_count} validation log(s)"
+            )
+        )
+
+    def _compact_transactions(self, batch_size: int, dry_run: bool) -> int:
+        queryset = (
+            Transaction.objects.filter(ocr_text__contains='"raw_response"')
+            .only("id", "ocr_text", "ocr_raw_payload")
+            .order_by("id")
+        )
+        total = 0
+        for batch in self._batches(queryset, batch_size):
+            with db_transaction.atomic():
+                total += self._compact_transaction_batch(batch, dry_run)
+        return total
+
+    def _compact_transaction_batch(self, batch, dry_run: bool) -> int:
+        count = 0
+        changed = []
+        for tx in batch:
+            try:
+                payload = json.loads(tx.ocr_text)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(payload, dict) or "raw_response" not in payload:
+                continue
+            count += 1
+            if dry_run:
+                continue
+            tx.ocr_raw_payload = store_raw_payload(payload.pop("raw_response"))
+            tx.ocr_text = json.dumps(payload, ensure_ascii=False)
+            changed.append(tx)
+        if changed:
+            Transaction.objects.bulk_update(changed, ["ocr_text", "ocr_raw_payload"])
+        return count
+
+    def _compact_logs(self, batch_size: int, dry_run: bool) -> int:
+        queryset = (
+            OcrValidationLog.objects.filter(extracted_json__has_key="raw_response")
+            .only("id", "extracted_json", "raw_payload")
+            .order_by("id")
+        )
+        total = 0
+        for batch in self._batches(queryset, batch_size):
+            total += len(batch)
+            if dry_run:
+                continue
+            with db_transaction.atomic():
+                for log in batch:
+                    extracted = dict(log.extracted_json)
+                    log.raw_payload = store_raw_payload(extracted.pop("raw_response"))
+                    log.extracted_json = extracted
+                OcrValidationLog.objects.bulk_update(
+                    batch, ["extracted_json", "raw_payload"]
+                )
+        return total
+
+    def _batches(self, queryset, batch_size: int):
+        # Keyset over pk instead of iterator(): rows are rewritten while we walk.
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                return
+            last_id = batch[-1].pk
+            # callers open the transaction per batch, so stopping early never
+            # leaves one hanging on generator close
+            yield batch
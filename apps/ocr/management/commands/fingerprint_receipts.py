@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.models import Transaction
+from apps.ocr.services.fingerprints import register_receipt_fingerprint
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute perceptual hashes for receipt images that do not have a "
+        "ReceiptFingerprint yet, so duplicate detection covers old uploads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rehash every receipt, not only those without a fingerprint.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        queryset = (
+            Transaction.objects.exclude(receipt_image="")
+            .exclude(receipt_image__isnull=True)
+            .select_related("group")
+            .order_by("id")
+        )
+        if not options["all"]:
+            queryset = queryset.filter(receipt_fingerprint__isnull=True)
+
+        hashed = skipped = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            for tx in batch:
+                try:
+                    duplicates = register_receipt_fingerprint(tx)
+                except OSError as exc:
+                    self.stderr.write(f"transaction {tx.pk}: {exc}")
+                    duplicates = None
+                if duplicates is None:
+                    skipped += 1
+                else:
+                    hashed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Fingerprinted {hashed} receipt(s), skipped {skipped}")
+        )
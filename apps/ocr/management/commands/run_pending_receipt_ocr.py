@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.common.models import Transaction
+from apps.ocr.services.pipeline import run_receipt_ocr
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run background receipt OCR jobs that were lost (still pending after "
+        "--stale-minutes, e.g. the worker was recycled) and, with --retry-failed, "
+        "jobs that failed fewer than --max-attempts times."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale-minutes", type=int, default=10)
+        parser.add_argument("--retry-failed", action="store_true")
+        parser.add_argument("--max-attempts", type=int, default=3)
+        parser.add_argument("--limit", type=int, default=100)
+
+    def handle(self, *args, **options):
+        stale_before = timezone.now() - timedelta(
+            minutes=max(options["stale_minutes"], 0)
+        )
+        due = Q(
+            ocr_status=Transaction.OcrStatus.PENDING,
+            ocr_requested_at__lte=stale_before,
+        )
+        if options["retry_failed"]:
+            due |= Q(
+                ocr_status=Transaction.OcrStatus.FAILED,
+                ocr_attempts__lt=max(options["max_attempts"], 1),
+            )
+        jobs = list(
+            Transaction.objects.filter(due)
+            .exclude(receipt_image="")
+            .exclude(receipt_image__isnull=True)
+            .order_by("ocr_requested_at", "id")
+            .values_list("id", "receipt_image")[: max(options["limit"], 1)]
+        )
+
+        # jobs only run while pending, so retried failures are re-queued first
+        Transaction.objects.filter(
+            pk__in=[transaction_id for transaction_id, _ in jobs],
+            ocr_status=Transaction.OcrStatus.FAILED,
+        ).update(
+            ocr_status=Transaction.OcrStatus.PENDING, ocr_requested_at=timezone.now()
+        )
+        for transaction_id, receipt_name in jobs:
+            run_receipt_ocr(transaction_id, receipt_name)
+
+        outcome = dict.fromkeys(Transaction.OcrStatus.values, 0)
+        for status in Transaction.objects.filter(
+            pk__in=[transaction_id for transaction_id, _ in jobs]
+        ).values_list("ocr_status", flat=True):
+            outcome[status] += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ran {len(jobs)} receipt OCR job(s): "
+                f"{outcome[Transaction.OcrStatus.DONE]} done, "
+                f"{outcome[Transaction.OcrStatus.FAILED]} failed"
+            )
+        )
@@ -0,0 +1,133 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+
+class ReviewQueuePagination:
+    """
+    Keyset pagination for the OCR review queue.
+
+    The cursor carries the (sort value, id) of the last row served, so every
+    page is a range scan on the (group, status, <field>, id) index instead of
+    an OFFSET.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_query_param = "ordering"
+    max_page_size = 200
+    invalid_cursor_message = "Invalid cursor"
+
+    # ordering value -> (field, descending, nullable)
+    orderings = {
+        "-updated_at": ("updated_at", True, False),
+        "updated_at": ("updated_at", False, False),
+        "confidence": ("confidence", False, True),
+        "-confidence": ("confidence", True, True),
+    }
+    default_ordering = "-updated_at"
+
+    def paginate_queryset(self, queryset, request) -> List[Any]:
+        self.request = request
+        self.ordering = request.query_params.get(
+            self.ordering_query_param, self.default_ordering
+        )
+        if self.ordering not in self.orderings:
+            raise ValidationError(
+                {"ordering": f"Choose one of: {', '.join(self.orderings)}"}
+            )
+        field, descending, nullable = self.orderings[self.ordering]
+        self.page_size = self._get_page_size(request)
+
+        if not nullable:
+            sort_key = f"-{field}" if descending else field
+        elif descending:
+            sort_key = F(field).desc(nulls_last=True)
+        else:
+            sort_key = F(field).asc(nulls_last=True)
+        queryset = queryset.order_by(sort_key, "-id" if descending else "id")
+
+        position = self._decode_cursor(request.query_params.get(self.cursor_query_param))
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                self._after(field, descending, nullable, value, pk)
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = None
+        if self.has_next and rows:
+            last = rows[-1]
+            self.next_position = (getattr(last, field), last.pk)
+        return rows
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self._encode_cursor(*self.next_position)
+        )
+
+    def _get_page_size(self, request) -> int:
+        default = getattr(settings, "OCR_REVIEW_PAGE_SIZE", 50)
+        raw = request.query_params.get(self.page_size_query_param)
+        if not raw:
+            return default
+        try:
+            size = int(raw)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError({"page_size": "page_size must be an integer"}) from exc
+        return min(max(size, 1), self.max_page_size)
+
+    @staticmethod
+    def _after(field: str, descending: bool, nullable: bool, value, pk: int) -> Q:
+        cmp = "lt" if descending else "gt"
+        # NULLs sort last in both directions
+        if value is None:
+            return Q(**{f"{field}__isnull": True, f"id__{cmp}": pk})
+        condition = Q(**{f"{field}__{cmp}": value}) | Q(
+            **{field: value, f"id__{cmp}": pk}
+        )
+        if nullable:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+    def _encode_cursor(self, value, pk: int) -> str:
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        raw = json.dumps([self.ordering, value, pk]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def _decode_cursor(self, encoded: Optional[str]) -> Optional[Tuple[Any, int]]:
+        if not encoded:
+            return None
+        try:
+            ordering, value, pk = json.loads(
+                base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+            )
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            return None, pk
+        try:
+            if self.orderings[ordering][0] == "updated_at":
+                value = parse_datetime(value)
+            else:
+                value = float(value)
+        except (TypeError, ValueError):
+            value = None
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
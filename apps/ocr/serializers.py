@@ -3,11 +3,26 @@ from rest_framework import serializers
 
 from apps.common.models import OcrApproval
 from apps.common.models import OcrValidationLog, Transaction
+from apps.ocr.services.payloads import load_raw_payload
+from apps.ocr.services.pdf_text import looks_like_pdf
+
+
+def validate_receipt_file(value):
+    """Accept images (verified by Pillow) and PDFs (verified by magic bytes)."""
+    if not value:
+        return value
+    name = getattr(value, "name", "") or ""
+    content_type = getattr(value, "content_type", "") or ""
+    if name.lower().endswith(".pdf") or content_type == "application/pdf":
+        if not looks_like_pdf(value):
+            raise serializers.ValidationError("Invalid PDF file")
+        return value
+    return serializers.ImageField().to_internal_value(value)
 
 
 class ReceiptOCRRequestSerializer(serializers.Serializer):
     transaction_id = serializers.IntegerField(required=False, min_value=1)
-    image = serializers.ImageField(required=False, allow_null=True)
+    image = serializers.FileField(required=False, allow_null=True)
     manual_overrides = serializers.DictField(
         child=serializers.CharField(), required=False
     )
@@ -15,6 +30,9 @@ class ReceiptOCRRequestSerializer(serializers.Serializer):
     store = serializers.BooleanField(required=False, default=False)
     overwrite = serializers.BooleanField(required=False, default=False)
 
+    def validate_image(self, value):
+        return validate_receipt_file(value)
+
     def validate(self, attrs):
         has_image = self.context.get("has_image", False) or bool(attrs.get("image"))
         transaction_id = attrs.get("transaction_id")
@@ -38,6 +56,18 @@ class OcrApprovalSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
 
 
+class OcrBulkDecisionSerializer(serializers.Serializer):
+    transaction_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
+    status = serializers.ChoiceField(
+        choices=[OcrApproval.Status.APPROVED, OcrApproval.Status.REJECTED]
+    )
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+
 class OcrApprovalDetailSerializer(serializers.ModelSerializer):
     transaction_id = serializers.IntegerField(read_only=True)
     transaction = serializers.SerializerMethodField()
@@ -85,6 +115,8 @@ class OcrApprovalDetailSerializer(serializers.ModelSerializer):
 
 class OcrPendingTransactionSerializer(serializers.ModelSerializer):
     status = serializers.SerializerMethodField()
+    confidence = serializers.SerializerMethodField()
+    field_confidences = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
     class Meta:
@@ -97,6 +129,8 @@ class OcrPendingTransactionSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "status",
+            "confidence",
+            "field_confidences",
             "user",
         ]
         read_only_fields = fields
@@ -107,6 +141,16 @@ class OcrPendingTransactionSerializer(serializers.ModelSerializer):
             return approval.status
         return OcrApproval.Status.PENDING
 
+    def get_confidence(self, obj: Transaction):
+        approval = getattr(obj, "ocr_approval", None)
+        if approval and approval.confidence is not None:
+            return approval.confidence
+        return obj.ocr_confidence
+
+    def get_field_confidences(self, obj: Transaction):
+        approval = getattr(obj, "ocr_approval", None)
+        return approval.field_confidences if approval else {}
+
     def get_user(self, obj: Transaction):
         user = getattr(obj, "user", None)
         if not user:
@@ -120,6 +164,7 @@ class OcrPendingTransactionSerializer(serializers.ModelSerializer):
 
 class OcrValidationLogSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
+    raw_response = serializers.SerializerMethodField()
 
     class Meta:
         model = OcrValidationLog
@@ -130,10 +175,17 @@ class OcrValidationLogSerializer(serializers.ModelSerializer):
             "is_valid",
             "notes",
             "extracted_json",
+            "raw_response",
             "user",
         ]
         read_only_fields = fields
 
+    def get_raw_response(self, obj: OcrValidationLog):
+        if obj.raw_payload_id:
+            return load_raw_payload(obj.raw_payload)
+        extracted = obj.extracted_json or {}
+        return extracted.get("raw_response") if isinstance(extracted, dict) else None
+
     def get_user(self, obj: OcrValidationLog):
         user = obj.user
         if not user:
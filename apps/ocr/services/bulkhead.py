@@ -0,0 +1,191 @@
+import contextlib
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+
+from apps.ocr.services import OCRServiceError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+POLL_INTERVAL = 0.05
+
+
+class BulkheadFull(OCRServiceError):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message, status_code=503)
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """
+    Concurrency cap for calls to a slow dependency.
+
+    Inside a process a semaphore bounds the threads in flight; across
+    processes (gunicorn workers) each call also holds an flock on one of
+    ``max_concurrent`` slot files in ``lock_dir``. Callers wait at most
+    ``queue_timeout`` seconds and at most ``max_queue`` of them may wait at
+    once; everyone else is turned away immediately with BulkheadFull.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+        lock_dir: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_concurrent = max(max_concurrent, 1)
+        self.max_queue = max(max_queue, 0)
+        self.queue_timeout = max(queue_timeout, 0.0)
+        self.retry_after = retry_after
+        self.lock_dir = lock_dir if lock_dir and fcntl is not None else None
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._rejected = 0
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[None]:
+        timeout = self.queue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            if self._active + self._queued >= self.max_concurrent + self.max_queue:
+                self._rejected += 1
+                raise self._full("queue is full")
+            self._queued += 1
+        slot_fd = None
+        try:
+            if not self._semaphore.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                self._reject()
+                raise self._full("timed out waiting for a slot")
+            try:
+                slot_fd = self._acquire_file_slot(deadline)
+            except BaseException:
+                self._semaphore.release()
+                raise
+            if slot_fd is None and self.lock_dir:
+                self._semaphore.release()
+                self._reject()
+                raise self._full("timed out waiting for a slot")
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+        with self._lock:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._release_file_slot(slot_fd)
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            data = {
+                "name": self.name,
+                "limit": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "pid": os.getpid(),
+            }
+        data["active_all_processes"] = self._busy_file_slots()
+        return data
+
+    def _reject(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def _full(self, reason: str) -> BulkheadFull:
+        return BulkheadFull(
+            f"{self.name} is busy ({reason}), retry later", retry_after=self.retry_after
+        )
+
+    def _slot_path(self, index: int) -> str:
+        return os.path.join(self.lock_dir, f"{self.name}.{index}.lock")
+
+    def _try_lock(self, index: int) -> Optional[int]:
+        fd = os.open(self._slot_path(index), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _acquire_file_slot(self, deadline: float) -> Optional[int]:
+        if not self.lock_dir:
+            return None
+        # start at a per-process offset so workers don't all fight over slot 0
+        start = os.getpid() % self.max_concurrent
+        while True:
+            for step in range(self.max_concurrent):
+                fd = self._try_lock((start + step) % self.max_concurrent)
+                if fd is not None:
+                    return fd
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+    @staticmethod
+    def _release_file_slot(fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _busy_file_slots(self) -> Optional[int]:
+        if not self.lock_dir:
+            return None
+        busy = 0
+        for index in range(self.max_concurrent):
+            fd = self._try_lock(index)
+            if fd is None:
+                busy += 1
+            else:
+                self._release_file_slot(fd)
+        return busy
+
+
+_clova_bulkhead: Optional[Bulkhead] = None
+_clova_bulkhead_lock = threading.Lock()
+
+
+def get_clova_bulkhead() -> Bulkhead:
+    global _clova_bulkhead
+    with _clova_bulkhead_lock:
+        if _clova_bulkhead is None:
+            _clova_bulkhead = Bulkhead(
+                "clova-ocr",
+                max_concurrent=int(getattr(settings, "OCR_MAX_CONCURRENCY", 4)),
+                max_queue=int(getattr(settings, "OCR_MAX_QUEUE", 8)),
+                queue_timeout=float(getattr(settings, "OCR_QUEUE_TIMEOUT", 2)),
+                retry_after=int(getattr(settings, "OCR_RETRY_AFTER", 5)),
+                lock_dir=getattr(settings, "OCR_BULKHEAD_LOCK_DIR", "") or None,
+            )
+        return _clova_bulkhead
+
+
+def reset_bulkhead() -> None:
+    global _clova_bulkhead
+    with _clova_bulkhead_lock:
+        _clova_bulkhead = None
@@ -1,12 +1,16 @@
 import json
+import re
 import time
 import uuid
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
+from apps.common.services import http_client
 from apps.ocr.services import OCRServiceError
 
+HTTP_SERVICE = "clova"
+
 
 def extract_text_clova(
     b64: str,
@@ -14,7 +18,6 @@ def extract_text_clova(
     api_url: str,
     secret: str,
     image_format: str = "jpg",
-    timeout: int = 8,
 ) -> Dict[str, object]:
     if not api_url or not secret:
         raise OCRServiceError("Clova OCR configuration missing", status_code=500)
@@ -39,8 +42,11 @@ def extract_text_clova(
     }
 
     try:
-        response = requests.post(
-            api_url, headers=headers, data=json.dumps(payload), timeout=timeout
+        response = http_client.post(
+            HTTP_SERVICE,
+            api_url,
+            headers=headers,
+            data=json.dumps(payload),
         )
     except requests.Timeout as exc:
         raise OCRServiceError("Clova OCR request timed out", status_code=504) from exc
@@ -61,23 +67,47 @@ def extract_text_clova(
             "Invalid response from Clova OCR", status_code=502
         ) from exc
 
-    text_lines = _collect_lines(data)
+    text_lines, line_confidences, overall = _collect_lines_with_confidence(data)
     text = "\n".join(text_lines).strip()
 
-    return {"text": text, "raw": data, "lines": text_lines}
+    return {
+        "text": text,
+        "raw": data,
+        "lines": text_lines,
+        "line_confidences": line_confidences,
+        "confidence": overall,
+    }
 
 
 def _collect_lines(payload: Dict[str, object]) -> list[str]:
+    return _collect_lines_with_confidence(payload)[0]
+
+
+def _collect_lines_with_confidence(
+    payload: Dict[str, object],
+) -> Tuple[List[str], List[Optional[float]], Optional[float]]:
+    """Group Clova fields into lines; a line scores its weakest word."""
     images = payload.get("images", []) if isinstance(payload, dict) else []
     if not images:
-        return []
+        return [], [], None
+
+    # multi-page PDFs come back as one image entry per page
+    fields = []
+    for image in images:
+        image_fields = image.get("fields", []) if isinstance(image, dict) else []
+        if isinstance(image_fields, list):
+            fields.extend(image_fields)
 
-    fields = images[0].get("fields", []) if isinstance(images[0], dict) else []
-    if not isinstance(fields, list):
-        return []
+    lines: List[str] = []
+    line_confidences: List[Optional[float]] = []
+    all_scores: List[float] = []
+    current: List[str] = []
+    current_scores: List[float] = []
+
+    def flush():
+        lines.append(" ".join(current))
+        line_confidences.append(min(current_scores) if current_scores else None)
 
-    lines = []
-    current = []
     for field in fields:
         if not isinstance(field, dict):
             continue
@@ -85,12 +115,79 @@ def _collect_lines(payload: Dict[str, object]) -> list[str]:
         if not text:
             continue
         current.append(text)
+        score = _as_confidence(field.get("inferConfidence"))
+        if score is not None:
+            current_scores.append(score)
+            all_scores.append(score)
         if field.get("lineBreak"):
-            lines.append(" ".join(current))
-            current = []
+            flush()
+            current, current_scores = [], []
     if current:
-        lines.append(" ".join(current))
-    return lines
+        flush()
+
+    overall = round(sum(all_scores) / len(all_scores), 4) if all_scores else None
+    return lines, line_confidences, overall
+
+
+def _as_confidence(value) -> Optional[float]:
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(score, 0.0), 1.0)
+
+
+def score_receipt_fields(
+    fields: Dict[str, object],
+    lines: List[str],
+    line_confidences: List[Optional[float]],
+) -> Dict[str, Optional[float]]:
+    """
+    Per-field confidence for parse_receipt output: the weakest line the
+    field's value was read from. Fields that were not found score None.
+    """
+    scores: Dict[str, Optional[float]] = {}
+    for key, value in fields.items():
+        if value in (None, ""):
+            scores[key] = None
+            continue
+        matched = [
+            confidence
+            for line, confidence in zip(lines, line_confidences)
+            if confidence is not None and _line_has_value(key, value, line)
+        ]
+        scores[key] = round(min(matched), 4) if matched else None
+    return scores
+
+
+def _line_has_value(key: str, value, line: str) -> bool:
+    if key == "date":
+        try:
+            y, m, d = (int(part) for part in str(value).split("-"))
+        except ValueError:
+            return False
+        return bool(re.search(rf"{y}[./-]0?{m}[./-]0?{d}(?!\d)", line))
+    if key == "amount":
+        digits = str(value)
+        return digits in line.replace(",", "").replace(" ", "")
+    return str(value) in line
+
+
+def aggregate_confidence(
+    field_confidences: Dict[str, Optional[float]],
+) -> Optional[float]:
+    """
+    A receipt is as trustworthy as its weakest key field. Without a score for
+    both amount and date the confidence is unknown (None), which keeps the
+    receipt out of auto-approval.
+    """
+    if any(field_confidences.get(key) is None for key in ("amount", "date")):
+        return None
+    return min(
+        field_confidences[key]
+        for key in ("amount", "date", "merchant")
+        if field_confidences.get(key) is not None
+    )
 
 
 def _pick_merchant(lines):
@@ -123,8 +220,6 @@ def parse_receipt(text: str) -> Dict[str, object]:
     lines = [line.strip() for line in text.splitlines()]
     blob = " ".join(lines)
 
-    import re
-
     date_match = re.search(r"(20\d{2})[./-](\d{1,2})[./-](\d{1,2})", blob)
     date_value = None
     if date_match:
@@ -0,0 +1,176 @@
+import logging
+from itertools import combinations
+from typing import BinaryIO, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Q
+
+from apps.common.models import ReceiptFingerprint, Transaction
+from apps.ocr.services.pdf_text import looks_like_pdf
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # pragma: no cover - Pillow ships with ImageField support
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+CHUNK_COUNT = 4
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def dhash(fileobj: BinaryIO) -> Optional[int]:
+    """Difference hash of an image; None for PDFs and unreadable files."""
+    if Image is None or looks_like_pdf(fileobj):
+        return None
+    try:
+        with Image.open(fileobj) as image:
+            # let the JPEG decoder downscale while decoding, phone photos are huge
+            image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+            image = ImageOps.exif_transpose(image).convert("L")
+            image = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+            pixels = list(image.getdata())
+    except (UnidentifiedImageError, OSError, ValueError) as exc:
+        logger.info("Unable to fingerprint receipt image: %s", exc)
+        return None
+    finally:
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+def split_chunks(value: int) -> List[int]:
+    return [
+        (value >> (CHUNK_BITS * (CHUNK_COUNT - 1 - index))) & CHUNK_MASK
+        for index in range(CHUNK_COUNT)
+    ]
+
+
+def _chunk_variants(chunk: int, radius: int) -> List[int]:
+    variants = [chunk]
+    for flips in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), flips):
+            mask = 0
+            for bit in bits:
+                mask |= 1 << bit
+            variants.append(chunk ^ mask)
+    return variants
+
+
+def _max_distance() -> int:
+    return int(getattr(settings, "OCR_DUPLICATE_MAX_DISTANCE", 4))
+
+
+def find_similar_receipts(
+    group,
+    value: int,
+    *,
+    exclude_transaction_id: Optional[int] = None,
+    max_distance: Optional[int] = None,
+) -> List[Dict[str, object]]:
+    if group is None or value is None:
+        return []
+    if max_distance is None:
+        max_distance = _max_distance()
+    if max_distance < 0:
+        return []
+    # pigeonhole: some chunk differs by at most max_distance // CHUNK_COUNT bits
+    radius = max_distance // CHUNK_COUNT
+    condition = Q()
+    for index, chunk in enumerate(split_chunks(value)):
+        condition |= Q(**{f"chunk{index}__in": _chunk_variants(chunk, radius)})
+
+    queryset = (
+        ReceiptFingerprint.objects.filter(condition, group=group)
+        .select_related("transaction")
+        .only(
+            "dhash",
+            "transaction__id",
+            "transaction__date",
+            "transaction__amount",
+            "transaction__description",
+        )
+    )
+    if exclude_transaction_id is not None:
+        queryset = queryset.exclude(transaction_id=exclude_transaction_id)
+
+    matches = []
+    for fingerprint in queryset:
+        distance = hamming(value, int(fingerprint.dhash, 16))
+        if distance > max_distance:
+            continue
+        tx = fingerprint.transaction
+        matches.append(
+            {
+                "transaction_id": tx.id,
+                "distance": distance,
+                "date": tx.date.isoformat() if tx.date else None,
+                "amount": tx.amount,
+                "description": tx.description,
+            }
+        )
+    matches.sort(key=lambda item: (item["distance"], item["transaction_id"]))
+    return matches
+
+
+def hash_receipt(receipt) -> Optional[int]:
+    """dHash of a stored receipt or an upload; reads and decodes the image."""
+    if not receipt:
+        return None
+    needs_close = getattr(receipt, "closed", True)
+    if needs_close:
+        receipt.open("rb")
+    try:
+        return dhash(receipt)
+    finally:
+        if needs_close:
+            receipt.close()
+
+
+def store_receipt_fingerprint(
+    transaction: Transaction, value: Optional[int]
+) -> Optional[List[Dict[str, object]]]:
+    """
+    Save a hash from hash_receipt for the transaction and return near-duplicate
+    receipts. Only touches the database, so it is cheap inside a transaction.
+
+    A None hash (no image, PDF, broken file) drops the stale fingerprint, if
+    any, and returns None.
+    """
+    if value is None:
+        ReceiptFingerprint.objects.filter(transaction=transaction).delete()
+        return None
+
+    chunks = split_chunks(value)
+    ReceiptFingerprint.objects.update_or_create(
+        transaction=transaction,
+        defaults={
+            "group_id": transaction.group_id,
+            "dhash": f"{value:016x}",
+            **{f"chunk{index}": chunk for index, chunk in enumerate(chunks)},
+        },
+    )
+    return find_similar_receipts(
+        transaction.group, value, exclude_transaction_id=transaction.pk
+    )
+
+
+def register_receipt_fingerprint(
+    transaction: Transaction,
+) -> Optional[List[Dict[str, object]]]:
+    """(Re)hash the transaction's receipt and return near-duplicate receipts."""
+    return store_receipt_fingerprint(
+        transaction, hash_receipt(transaction.receipt_image)
+    )
@@ -0,0 +1,105 @@
+import datetime
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from apps.common.models import Transaction
+
+# without a parsed date only the most recent rows with the same amount are scored
+UNDATED_SCAN_LIMIT = 50
+
+_NORMALIZE_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _normalize(text: Optional[str]) -> str:
+    return _NORMALIZE_RE.sub("", (text or "").lower())
+
+
+def description_score(merchant: Optional[str], description: Optional[str]) -> float:
+    left, right = _normalize(merchant), _normalize(description)
+    if not left or not right:
+        return 0.0
+    if left in right or right in left:
+        return 1.0
+    return SequenceMatcher(None, left, right).ratio()
+
+
+def _parse_date(value) -> Optional[datetime.date]:
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_amount(value) -> Optional[int]:
+    try:
+        amount = int(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+    return amount if amount > 0 else None
+
+
+def find_candidate_transactions(
+    group, fields: Dict[str, object], *, limit: Optional[int] = None
+) -> List[Dict[str, object]]:
+    """
+    Rank ledger rows of ``group`` that could belong to a parsed receipt.
+
+    Rows must match the amount exactly and fall within
+    OCR_MATCH_DATE_WINDOW_DAYS of the receipt date, which keeps the lookup on
+    the (group, amount, date) index. Survivors are scored on date distance and
+    how close the description is to the merchant name.
+    """
+    amount = _parse_amount(fields.get("amount"))
+    if group is None or amount is None:
+        return []
+    window = max(int(getattr(settings, "OCR_MATCH_DATE_WINDOW_DAYS", 3)), 0)
+    if limit is None:
+        limit = int(getattr(settings, "OCR_MATCH_MAX_CANDIDATES", 5))
+    receipt_date = _parse_date(fields.get("date"))
+    merchant = fields.get("merchant")
+
+    queryset = Transaction.objects.filter(group=group, amount=amount).only(
+        "id", "amount", "date", "description", "type", "receipt_image", "ocr_text"
+    )
+    if receipt_date is not None:
+        delta = datetime.timedelta(days=window)
+        queryset = queryset.filter(
+            date__range=(receipt_date - delta, receipt_date + delta)
+        )
+    else:
+        queryset = queryset.order_by("-date", "-id")[:UNDATED_SCAN_LIMIT]
+
+    candidates = []
+    for tx in queryset:
+        text_score = description_score(merchant, tx.description)
+        if receipt_date is not None:
+            days = abs((tx.date - receipt_date).days)
+            date_score = 1.0 - days / (window + 1)
+        else:
+            days = None
+            date_score = 0.0
+        score = 0.5 * date_score + 0.4 * text_score
+        if tx.type == Transaction.TransactionType.EXPENSE:
+            score += 0.1
+        candidates.append(
+            {
+                "transaction_id": tx.id,
+                "date": tx.date.isoformat(),
+                "amount": tx.amount,
+                "description": tx.description,
+                "type": tx.type,
+                "score": round(score, 3),
+                "date_delta_days": days,
+                "description_score": round(text_score, 3),
+                "has_receipt": bool(tx.receipt_image),
+                "has_ocr": bool(tx.ocr_text),
+            }
+        )
+
+    candidates.sort(key=lambda item: (-item["score"], -item["transaction_id"]))
+    return candidates[:limit]
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import zlib
+from typing import Any, Optional
+
+from apps.common.models import OcrRawPayload
+
+COMPRESSION_LEVEL = 6
+
+
+def encode_raw_payload(payload: Any) -> bytes:
+    return json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def payload_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def store_raw_payload(payload: Any) -> Optional[OcrRawPayload]:
+    """Store a raw OCR response once, keyed by the SHA-256 of its canonical JSON."""
+    if payload is None:
+        return None
+    raw = encode_raw_payload(payload)
+    blob, _created = OcrRawPayload.objects.get_or_create(
+        digest=payload_digest(raw),
+        defaults={
+            "data": zlib.compress(raw, COMPRESSION_LEVEL),
+            "size": len(raw),
+        },
+    )
+    return blob
+
+
+def load_raw_payload(blob: Optional[OcrRawPayload]) -> Any:
+    if blob is None:
+        return None
+    return blob.load()
@@ -0,0 +1,71 @@
+import io
+import logging
+from typing import BinaryIO, List, Optional, Tuple
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.errors import PdfReadError
+except ImportError:  # pragma: no cover - pypdf is optional
+    PdfReader = PdfWriter = None
+    PdfReadError = Exception
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF-"
+# pages with fewer visible characters than this are treated as scanned images
+MIN_PAGE_CHARS = 8
+
+
+def looks_like_pdf(fileobj: BinaryIO) -> bool:
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    head = fileobj.read(1024)
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    return PDF_MAGIC in (head or b"")
+
+
+def split_pdf_text_layer(
+    content: bytes,
+) -> Tuple[List[Optional[str]], Optional[bytes]]:
+    """
+    Read the embedded text of every page.
+
+    Returns the per-page text (None for image-only pages) and, when some
+    pages have no usable text layer, a PDF with just those pages so only
+    they need to go through OCR. Without pypdf every page is image-only.
+    """
+    if PdfReader is None:
+        return [], content
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        pages = list(reader.pages)
+    except (PdfReadError, ValueError, OSError) as exc:
+        logger.warning("Unable to read PDF text layer: %s", exc)
+        return [], content
+
+    texts: List[Optional[str]] = []
+    image_only = []
+    for index, page in enumerate(pages):
+        try:
+            text = page.extract_text() or ""
+        except Exception:  # pypdf raises a wide range of errors on odd files
+            text = ""
+        text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+        if len(text.replace(" ", "").replace("\n", "")) >= MIN_PAGE_CHARS:
+            texts.append(text)
+        else:
+            texts.append(None)
+            image_only.append(index)
+
+    if not image_only:
+        return texts, None
+    if len(image_only) == len(pages):
+        return texts, content
+
+    writer = PdfWriter()
+    for index in image_only:
+        writer.add_page(pages[index])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return texts, buffer.getvalue()
@@ -0,0 +1,216 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import transaction as db_transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.common.models import OcrApproval, OcrValidationLog, Transaction
+from apps.ocr.services import OCRServiceError
+from apps.ocr.services.clova_ocr import (
+    aggregate_confidence,
+    parse_receipt,
+    score_receipt_fields,
+)
+from apps.ocr.services.payloads import store_raw_payload
+from apps.ocr.services.recognition import recognize_receipt
+from apps.ocr.services.review_queue import enqueue_for_review, get_approval
+
+logger = logging.getLogger(__name__)
+
+AUTO_OCR_NOTE = "auto OCR on upload"
+OCR_ERROR_MAX_LENGTH = 255
+# background jobs hold no client connection, so they can queue for an OCR slot longer
+BACKGROUND_SLOT_TIMEOUT = 60.0
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(int(getattr(settings, "OCR_BACKGROUND_WORKERS", 2)), 1),
+                thread_name_prefix="receipt-ocr",
+            )
+        return _executor
+
+
+def reset_executor(wait: bool = False) -> None:
+    """
+    Shut the worker pool down and drop it. ``wait`` lets queued jobs finish
+    (worker exit); around fork it is False, since the parent's threads do not
+    exist in the child.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def schedule_receipt_ocr(transaction: Transaction) -> bool:
+    """
+    Queue OCR for the transaction's receipt once the current DB transaction commits.
+
+    The transaction is marked pending first, so a job lost with its worker
+    (recycle, crash) is still found by the run_pending_receipt_ocr command.
+    The job is keyed on the receipt file name, so a job that runs after the
+    image was replaced again does nothing and leaves the work to the newer one.
+    """
+    if not getattr(settings, "OCR_AUTO_ON_UPLOAD", False):
+        return False
+    if not transaction.receipt_image:
+        return False
+    transaction_id = transaction.pk
+    receipt_name = transaction.receipt_image.name
+    Transaction.objects.filter(pk=transaction_id).update(
+        ocr_status=Transaction.OcrStatus.PENDING,
+        ocr_attempts=0,
+        ocr_requested_at=timezone.now(),
+        ocr_error="",
+    )
+    db_transaction.on_commit(
+        lambda: _get_executor().submit(run_receipt_ocr, transaction_id, receipt_name)
+    )
+    return True
+
+
+def run_receipt_ocr(transaction_id: int, receipt_name: Optional[str] = None) -> None:
+    close_old_connections()
+    try:
+        Transaction.objects.filter(pk=transaction_id).update(
+            ocr_attempts=F("ocr_attempts") + 1
+        )
+        process_receipt(transaction_id, receipt_name)
+    except OCRServiceError as exc:
+        logger.warning("Receipt OCR failed for transaction %s: %s", transaction_id, exc)
+        _mark_failed(transaction_id, receipt_name, str(exc))
+    except Exception as exc:
+        logger.exception("Receipt OCR crashed for transaction %s", transaction_id)
+        _mark_failed(transaction_id, receipt_name, f"{type(exc).__name__}: {exc}")
+    finally:
+        close_old_connections()
+
+
+def _mark_failed(transaction_id: int, receipt_name: Optional[str], error: str) -> None:
+    queryset = Transaction.objects.filter(pk=transaction_id)
+    if receipt_name:
+        # a newer upload owns the status now
+        queryset = queryset.filter(receipt_image=receipt_name)
+    queryset.update(
+        ocr_status=Transaction.OcrStatus.FAILED,
+        ocr_error=error[:OCR_ERROR_MAX_LENGTH],
+    )
+
+
+def process_receipt(
+    transaction_id: int, receipt_name: Optional[str] = None
+) -> Optional[Transaction]:
+    transaction = (
+        Transaction.objects.select_related("user").filter(pk=transaction_id).first()
+    )
+    if transaction is None:
+        return None
+    if not transaction.receipt_image:
+        # the receipt was removed after the job was queued
+        Transaction.objects.filter(pk=transaction_id).update(
+            ocr_status=Transaction.OcrStatus.NONE, ocr_error=""
+        )
+        return None
+    if receipt_name and transaction.receipt_image.name != receipt_name:
+        return None
+    if transaction.ocr_status != Transaction.OcrStatus.PENDING:
+        # a manual OCR run stored its result since the job was queued
+        return None
+
+    image_file = transaction.receipt_image
+    image_format = (
+        os.path.splitext(image_file.name)[1].lower().lstrip(".") or "jpg"
+    )
+    image_file.open("rb")
+    try:
+        result = recognize_receipt(
+            image_file,
+            image_format=image_format,
+            slot_timeout=BACKGROUND_SLOT_TIMEOUT,
+        )
+    finally:
+        image_file.close()
+
+    raw_text = result.get("text", "")
+    raw_payload = result.get("raw")
+    parsed_fields = parse_receipt(raw_text)
+    field_confidences = score_receipt_fields(
+        parsed_fields,
+        result.get("lines") or [],
+        result.get("line_confidences") or [],
+    )
+    confidence = aggregate_confidence(field_confidences)
+    is_valid = bool(parsed_fields.get("amount") and parsed_fields.get("date"))
+
+    with db_transaction.atomic():
+        # re-check under lock: the receipt may have been swapped, or a manual
+        # OCR run may have stored its result, while OCR ran
+        locked = (
+            Transaction.objects.select_for_update()
+            .filter(
+                pk=transaction_id,
+                receipt_image=transaction.receipt_image.name,
+                ocr_status=Transaction.OcrStatus.PENDING,
+            )
+            .first()
+        )
+        if locked is None:
+            return None
+        raw_blob = store_raw_payload(raw_payload)
+        locked.ocr_text = json.dumps(
+            {"raw_text": raw_text, "fields": parsed_fields},
+            ensure_ascii=False,
+        )
+        locked.ocr_raw_payload = raw_blob
+        locked.ocr_confidence = confidence
+        locked.ocr_status = Transaction.OcrStatus.DONE
+        locked.ocr_error = ""
+        locked.save(
+            update_fields=[
+                "ocr_text",
+                "ocr_raw_payload",
+                "ocr_confidence",
+                "ocr_status",
+                "ocr_error",
+                "updated_at",
+            ]
+        )
+        approval = get_approval(locked)
+        if approval is None or approval.status == OcrApproval.Status.PENDING:
+            # a reviewer's decision is never reset by a background job
+            enqueue_for_review(
+                locked,
+                confidence=confidence,
+                field_confidences=field_confidences,
+                auto_approvable=is_valid,
+            )
+        OcrValidationLog.objects.create(
+            transaction=locked,
+            user=transaction.user,
+            extracted_json={
+                "raw_text": raw_text,
+                "parsed": parsed_fields,
+                "final": parsed_fields,
+                "manual_overrides": {},
+                "engine": result.get("engine"),
+            },
+            raw_payload=raw_blob,
+            is_valid=is_valid,
+            notes=AUTO_OCR_NOTE,
+        )
+    return locked
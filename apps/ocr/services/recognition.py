@@ -0,0 +1,108 @@
+import base64
+import os
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from django.conf import settings
+
+from apps.ocr.services import OCRServiceError, encode_file_to_base64
+from apps.ocr.services.bulkhead import get_clova_bulkhead
+from apps.ocr.services.clova_ocr import extract_text_clova
+from apps.ocr.services.pdf_text import looks_like_pdf, split_pdf_text_layer
+
+# an embedded PDF text layer is whatever the file's author typed, so its lines
+# carry no confidence and the fields read from them are never auto-approved
+TEXT_LAYER_CONFIDENCE = None
+
+
+def get_clova_config() -> Tuple[str, str]:
+    clova_url = os.environ.get("CLOVA_OCR_API_URL") or getattr(
+        settings, "CLOVA_OCR_API_URL", ""
+    )
+    clova_secret = os.environ.get("CLOVA_OCR_SECRET") or getattr(
+        settings, "CLOVA_OCR_SECRET", ""
+    )
+    return clova_url, clova_secret
+
+
+def recognize_receipt(
+    fileobj: BinaryIO,
+    *,
+    image_format: str = "jpg",
+    slot_timeout: Optional[float] = None,
+) -> Dict[str, object]:
+    """
+    Turn a receipt file into text lines with confidences.
+
+    PDFs with an embedded text layer are read locally; only image-only pages
+    are sent to Clova. The result has the same keys as extract_text_clova plus
+    ``engine`` ("clova", "pdf_text" or "pdf_text+clova").
+
+    Clova calls go through the OCR bulkhead; ``slot_timeout`` overrides how
+    long to wait for a free slot (OCR_QUEUE_TIMEOUT by default).
+    """
+    if (image_format or "").lower() == "pdf" or looks_like_pdf(fileobj):
+        return _recognize_pdf(fileobj, slot_timeout)
+    return _recognize_with_clova(
+        encode_file_to_base64(fileobj), image_format, slot_timeout
+    )
+
+
+def _recognize_with_clova(
+    b64: str, image_format: str, slot_timeout: Optional[float] = None
+) -> Dict[str, object]:
+    clova_url, clova_secret = get_clova_config()
+    if not clova_url or not clova_secret:
+        raise OCRServiceError("Clova OCR environment not configured", status_code=400)
+    with get_clova_bulkhead().slot(timeout=slot_timeout):
+        result = extract_text_clova(
+            b64,
+            api_url=clova_url,
+            secret=clova_secret,
+            image_format=image_format,
+        )
+    result["engine"] = "clova"
+    return result
+
+
+def _recognize_pdf(
+    fileobj: BinaryIO, slot_timeout: Optional[float] = None
+) -> Dict[str, object]:
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    content = fileobj.read()
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    if not content:
+        raise OCRServiceError("Empty image content", status_code=400)
+
+    page_texts, ocr_pdf = split_pdf_text_layer(content)
+    lines = [line for text in page_texts if text for line in text.splitlines()]
+
+    if ocr_pdf is None:
+        return {
+            "text": "\n".join(lines).strip(),
+            "raw": None,
+            "lines": lines,
+            "line_confidences": [TEXT_LAYER_CONFIDENCE] * len(lines),
+            "confidence": TEXT_LAYER_CONFIDENCE,
+            "engine": "pdf_text",
+        }
+
+    ocr_result = _recognize_with_clova(
+        base64.b64encode(ocr_pdf).decode(), "pdf", slot_timeout
+    )
+    if not lines:
+        return ocr_result
+
+    # text-layer pages first, then whatever Clova read from the scanned ones
+    ocr_lines = list(ocr_result.get("lines") or [])
+    merged_lines = lines + ocr_lines
+    return {
+        "text": "\n".join(merged_lines).strip(),
+        "raw": ocr_result.get("raw"),
+        "lines": merged_lines,
+        "line_confidences": [TEXT_LAYER_CONFIDENCE] * len(lines)
+        + list(ocr_result.get("line_confidences") or [None] * len(ocr_lines)),
+        "confidence": ocr_result.get("confidence"),
+        "engine": "pdf_text+clova",
+    }
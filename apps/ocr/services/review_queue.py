@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.common.models import OcrApproval, Transaction
+from apps.common.services.shared_cache import is_shared_cache
+
+COUNTS_CACHE_KEY = "ocr:review:counts:{group_id}"
+# reported for transactions that never entered the review queue
+STATUS_NONE = "none"
+
+
+AUTO_APPROVE_NOTE = "auto-approved (confidence {confidence:.2f})"
+
+
+def should_auto_approve(confidence: Optional[float]) -> bool:
+    threshold = float(getattr(settings, "OCR_AUTO_APPROVE_CONFIDENCE", 0) or 0)
+    if threshold <= 0 or confidence is None:
+        return False
+    return confidence >= threshold
+
+
+def enqueue_for_review(
+    transaction: Transaction,
+    *,
+    confidence: Optional[float] = None,
+    field_confidences: Optional[Dict[str, Optional[float]]] = None,
+    auto_approvable: bool = False,
+) -> OcrApproval:
+    """
+    Put a transaction (back) into the OCR review queue.
+
+    When ``auto_approvable`` is set (the caller parsed amount and date without
+    manual edits) and the confidence clears OCR_AUTO_APPROVE_CONFIDENCE, the
+    approval is decided immediately and never shows up as pending.
+    """
+    defaults = {
+        "group_id": transaction.group_id,
+        "status": OcrApproval.Status.PENDING,
+        "reviewer": None,
+        "decided_at": None,
+        "notes": "",
+        "confidence": confidence,
+        "field_confidences": field_confidences or {},
+    }
+    if auto_approvable and should_auto_approve(confidence):
+        defaults.update(
+            status=OcrApproval.Status.APPROVED,
+            decided_at=timezone.now(),
+            notes=AUTO_APPROVE_NOTE.format(confidence=confidence),
+        )
+    approval, _created = OcrApproval.objects.update_or_create(
+        transaction=transaction, defaults=defaults
+    )
+    invalidate_status_counts(transaction.group_id)
+    return approval
+
+
+def get_approval(transaction: Transaction) -> Optional[OcrApproval]:
+    try:
+        return transaction.ocr_approval
+    except OcrApproval.DoesNotExist:
+        return None
+
+
+def get_or_create_approval(transaction: Transaction) -> OcrApproval:
+    approval, created = OcrApproval.objects.get_or_create(
+        transaction=transaction, defaults={"group_id": transaction.group_id}
+    )
+    if created:
+        invalidate_status_counts(transaction.group_id)
+    return approval
+
+
+def apply_bulk_decision(
+    group,
+    transaction_ids: Iterable[int],
+    *,
+    reviewer,
+    status: str,
+    notes: str = "",
+) -> List[Dict[str, object]]:
+    """
+    Approve/reject many transactions of a group in one upsert.
+
+    Ids outside the group are reported as not_found instead of failing the
+    whole batch.
+    """
+    requested = list(dict.fromkeys(transaction_ids))
+    found = set(
+        Transaction.objects.filter(group=group, pk__in=requested).values_list(
+            "id", flat=True
+        )
+    )
+    decided_at = timezone.now()
+    approvals = [
+        OcrApproval(
+            transaction_id=tx_id,
+            group_id=group.id,
+            reviewer=reviewer,
+            status=status,
+            notes=notes,
+            decided_at=decided_at,
+        )
+        for tx_id in requested
+        if tx_id in found
+    ]
+    if approvals:
+        OcrApproval.objects.bulk_create(
+            approvals,
+            update_conflicts=True,
+            unique_fields=["transaction"],
+            update_fields=[
+                "group",
+                "reviewer",
+                "status",
+                "notes",
+                "decided_at",
+                "updated_at",
+            ],
+        )
+        invalidate_status_counts(group.id)
+
+    return [
+        {
+            "transaction_id": tx_id,
+            "result": "updated" if tx_id in found else "not_found",
+            "status": status if tx_id in found else None,
+        }
+        for tx_id in requested
+    ]
+
+
+def status_counts(group_id: Optional[int]) -> Dict[str, int]:
+    # invalidation only reaches other workers through a shared cache
+    if not is_shared_cache():
+        return _count_statuses(group_id)
+    key = COUNTS_CACHE_KEY.format(group_id=group_id)
+    counts = cache.get(key)
+    if counts is not None:
+        return counts
+    counts = _count_statuses(group_id)
+    cache.set(key, counts, timeout=getattr(settings, "OCR_REVIEW_COUNTS_TTL", 60))
+    return counts
+
+
+def _count_statuses(group_id: Optional[int]) -> Dict[str, int]:
+    counts = {choice: 0 for choice in OcrApproval.Status.values}
+    rows = (
+        OcrApproval.objects.filter(group_id=group_id)
+        .values("status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        counts[row["status"]] = row["total"]
+    return counts
+
+
+def invalidate_status_counts(group_id: Optional[int]) -> None:
+    cache.delete(COUNTS_CACHE_KEY.format(group_id=group_id))
@@ -0,0 +1,762 @@
+import io
+import json
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.common.models import (
+    OcrApproval,
+    OcrRawPayload,
+    OcrValidationLog,
+    Transaction,
+)
+from apps.groups.models import Group, GroupMembership
+from apps.ocr.services import OCRServiceError
+from apps.ocr.services import pipeline, recognition
+from apps.ocr.services.bulkhead import (
+    Bulkhead,
+    BulkheadFull,
+    get_clova_bulkhead,
+    reset_bulkhead,
+)
+from apps.ocr.services.clova_ocr import (
+    aggregate_confidence,
+    parse_receipt,
+    score_receipt_fields,
+)
+from apps.ocr.services.matching import find_candidate_transactions
+from apps.ocr.services.pdf_text import split_pdf_text_layer
+from apps.ocr.services.payloads import load_raw_payload, store_raw_payload
+from apps.ocr.services.review_queue import (
+    STATUS_NONE,
+    apply_bulk_decision,
+    invalidate_status_counts,
+    should_auto_approve,
+    status_counts,
+)
+
+
+class OcrApprovalDetailViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.user)
+        GroupMembership.objects.create(
+            group=self.group,
+            user=self.user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        self.transaction = Transaction.objects.create(
+            group=self.group,
+            user=self.user,
+            amount=1000,
+            description="coffee",
+            date=date(2024, 1, 1),
+            type=Transaction.TransactionType.EXPENSE,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _get(self):
+        return self.client.get(
+            f"/api/ocr/transactions/{self.transaction.id}/approval",
+            {"group_id": self.group.id},
+        )
+
+    def test_get_does_not_enqueue(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], STATUS_NONE)
+        self.assertFalse(OcrApproval.objects.exists())
+
+    def test_get_returns_existing_approval(self):
+        OcrApproval.objects.create(
+            transaction=self.transaction,
+            group=self.group,
+            status=OcrApproval.Status.APPROVED,
+        )
+
+        response = self._get()
+
+        self.assertEqual(response.data["status"], OcrApproval.Status.APPROVED)
+
+
+@override_settings(OCR_AUTO_APPROVE_CONFIDENCE=0.9)
+class AggregateConfidenceTests(SimpleTestCase):
+    def test_weakest_key_field_wins(self):
+        scores = {"amount": 0.97, "date": 0.95, "merchant": 0.92}
+
+        self.assertEqual(aggregate_confidence(scores), 0.92)
+
+    def test_merchant_is_optional(self):
+        scores = {"amount": 0.97, "date": 0.95, "merchant": None}
+
+        self.assertEqual(aggregate_confidence(scores), 0.95)
+
+    def test_missing_amount_or_date_is_unknown(self):
+        for missing in ("amount", "date"):
+            scores = {"amount": 0.99, "date": 0.99, "merchant": 0.99}
+            scores[missing] = None
+            with self.subTest(missing=missing):
+                confidence = aggregate_confidence(scores)
+                self.assertIsNone(confidence)
+                self.assertFalse(should_auto_approve(confidence))
+
+
+RECOGNIZED = {
+    "text": "카페\n2024-01-01\n합계 1,000",
+    "lines": ["카페", "2024-01-01", "합계 1,000"],
+    "line_confidences": [0.99, 0.99, 0.99],
+    "confidence": 0.99,
+    "raw": {"images": []},
+    "engine": "clova",
+}
+
+
+class ReceiptOcrPipelineTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, OCR_AUTO_ON_UPLOAD=True
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.transaction = Transaction.objects.create(
+            user=user,
+            amount=1000,
+            description="coffee",
+            date=date(2024, 1, 1),
+            type=Transaction.TransactionType.EXPENSE,
+            receipt_image=SimpleUploadedFile("r.jpg", b"not really a jpeg"),
+        )
+
+    def _refresh(self):
+        self.transaction.refresh_from_db()
+        return self.transaction
+
+    def test_schedule_marks_pending_and_submits_on_commit(self):
+        with mock.patch.object(pipeline, "_get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(pipeline.schedule_receipt_ocr(self.transaction))
+
+        self.assertEqual(self._refresh().ocr_status, Transaction.OcrStatus.PENDING)
+        get_executor.return_value.submit.assert_called_once()
+
+    @override_settings(OCR_AUTO_ON_UPLOAD=False)
+    def test_schedule_is_off_without_the_flag(self):
+        self.assertFalse(pipeline.schedule_receipt_ocr(self.transaction))
+        self.assertEqual(self._refresh().ocr_status, Transaction.OcrStatus.NONE)
+
+    def _mark_pending(self):
+        Transaction.objects.filter(pk=self.transaction.pk).update(
+            ocr_status=Transaction.OcrStatus.PENDING, ocr_requested_at=timezone.now()
+        )
+
+    def _run_job(self):
+        with mock.patch.object(pipeline, "recognize_receipt", return_value=RECOGNIZED):
+            pipeline.run_receipt_ocr(
+                self.transaction.pk, self.transaction.receipt_image.name
+            )
+
+    def test_failure_is_recorded(self):
+        self._mark_pending()
+        with mock.patch.object(
+            pipeline, "recognize_receipt", side_effect=OCRServiceError("down")
+        ):
+            pipeline.run_receipt_ocr(
+                self.transaction.pk, self.transaction.receipt_image.name
+            )
+
+        tx = self._refresh()
+        self.assertEqual(tx.ocr_status, Transaction.OcrStatus.FAILED)
+        self.assertEqual(tx.ocr_attempts, 1)
+        self.assertEqual(tx.ocr_error, "down")
+
+    def test_command_reruns_stale_pending_jobs(self):
+        Transaction.objects.filter(pk=self.transaction.pk).update(
+            ocr_status=Transaction.OcrStatus.PENDING,
+            ocr_requested_at=timezone.now() - timedelta(hours=1),
+        )
+
+        with mock.patch.object(pipeline, "recognize_receipt", return_value=RECOGNIZED):
+            call_command("run_pending_receipt_ocr", stdout=mock.MagicMock())
+
+        tx = self._refresh()
+        self.assertEqual(tx.ocr_status, Transaction.OcrStatus.DONE)
+        self.assertIsNotNone(tx.ocr_text)
+        self.assertTrue(OcrApproval.objects.filter(transaction=tx).exists())
+
+    def test_job_yields_to_a_stored_manual_result(self):
+        self._mark_pending()
+        # the manual OCR view stored its result while the job was queued
+        Transaction.objects.filter(pk=self.transaction.pk).update(
+            ocr_text="manual", ocr_status=Transaction.OcrStatus.DONE
+        )
+
+        self._run_job()
+
+        self.assertEqual(self._refresh().ocr_text, "manual")
+        self.assertFalse(OcrApproval.objects.exists())
+
+    def test_job_keeps_a_decided_approval(self):
+        self._mark_pending()
+        OcrApproval.objects.create(
+            transaction=self.transaction, status=OcrApproval.Status.REJECTED
+        )
+
+        self._run_job()
+
+        self.assertEqual(self._refresh().ocr_status, Transaction.OcrStatus.DONE)
+        self.assertEqual(
+            OcrApproval.objects.get().status, OcrApproval.Status.REJECTED
+        )
+
+    def test_manual_store_settles_a_queued_job(self):
+        group = Group.objects.create(name="g", owner=self.transaction.user)
+        GroupMembership.objects.create(
+            group=group,
+            user=self.transaction.user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        Transaction.objects.filter(pk=self.transaction.pk).update(group=group)
+        self._mark_pending()
+        client = APIClient()
+        client.force_authenticate(self.transaction.user)
+
+        with mock.patch("apps.ocr.views.recognize_receipt", return_value=RECOGNIZED):
+            with mock.patch("apps.ocr.views.dhash", return_value=0):
+                response = client.post(
+                    "/api/ocr/receipt",
+                    {
+                        "group_id": group.id,
+                        "transaction_id": self.transaction.pk,
+                        "store": True,
+                    },
+                    format="json",
+                )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self._refresh().ocr_status, Transaction.OcrStatus.DONE)
+        stored = self.transaction.ocr_text
+        self._run_job()
+        self.assertEqual(self._refresh().ocr_text, stored)
+
+    def test_command_retries_failures_under_the_attempt_limit(self):
+        Transaction.objects.filter(pk=self.transaction.pk).update(
+            ocr_status=Transaction.OcrStatus.FAILED, ocr_attempts=1
+        )
+
+        with mock.patch.object(pipeline, "recognize_receipt", return_value=RECOGNIZED):
+            call_command(
+                "run_pending_receipt_ocr", "--retry-failed", stdout=mock.MagicMock()
+            )
+
+        tx = self._refresh()
+        self.assertEqual(tx.ocr_status, Transaction.OcrStatus.DONE)
+        self.assertEqual(tx.ocr_attempts, 2)
+
+    def test_command_skips_exhausted_failures(self):
+        Transaction.objects.filter(pk=self.transaction.pk).update(
+            ocr_status=Transaction.OcrStatus.FAILED, ocr_attempts=3
+        )
+
+        with mock.patch.object(pipeline, "recognize_receipt") as recognize:
+            call_command(
+                "run_pending_receipt_ocr", "--retry-failed", stdout=mock.MagicMock()
+            )
+
+        recognize.assert_not_called()
+
+
+class RawPayloadTests(TestCase):
+    def test_same_payload_is_stored_once(self):
+        first = store_raw_payload({"b": [1, 2], "a": "영수증"})
+        second = store_raw_payload({"a": "영수증", "b": [1, 2]})
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(OcrRawPayload.objects.count(), 1)
+        self.assertNotEqual(store_raw_payload({"a": "other"}).pk, first.pk)
+
+    def test_round_trip(self):
+        payload = {"images": [{"fields": [{"inferText": "스타벅스"}]}]}
+
+        blob = store_raw_payload(payload)
+
+        stored = OcrRawPayload.objects.get(pk=blob.pk)
+        self.assertEqual(load_raw_payload(stored), payload)
+        self.assertIsNone(store_raw_payload(None))
+        self.assertIsNone(load_raw_payload(None))
+
+
+class CompactOcrPayloadsCommandTests(TestCase):
+    raw = {"images": [{"inferResult": "SUCCESS"}]}
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        group = Group.objects.create(name="g", owner=user)
+        self.transaction = Transaction.objects.create(
+            group=group,
+            user=user,
+            amount=1000,
+            description="coffee",
+            date=date(2024, 1, 1),
+            type=Transaction.TransactionType.EXPENSE,
+            ocr_text=json.dumps({"amount": 1000, "raw_response": self.raw}),
+        )
+        self.log = OcrValidationLog.objects.create(
+            transaction=self.transaction,
+            user=user,
+            extracted_json={"amount": 1000, "raw_response": self.raw},
+        )
+
+    def _run(self, *args):
+        call_command(
+            "compact_ocr_payloads", *args, "--batch-size", "1", stdout=io.StringIO()
+        )
+
+    def test_moves_raw_responses_into_the_payload_table(self):
+        self._run()
+
+        self.transaction.refresh_from_db()
+        self.log.refresh_from_db()
+        self.assertEqual(json.loads(self.transaction.ocr_text), {"amount": 1000})
+        self.assertEqual(self.log.extracted_json, {"amount": 1000})
+        self.assertEqual(self.transaction.ocr_raw_payload.load(), self.raw)
+        self.assertEqual(self.log.raw_payload_id, self.transaction.ocr_raw_payload_id)
+        self.assertEqual(OcrRawPayload.objects.count(), 1)
+
+    def test_dry_run_changes_nothing(self):
+        before = self.transaction.ocr_text
+
+        self._run("--dry-run")
+
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.ocr_text, before)
+        self.assertFalse(OcrRawPayload.objects.exists())
+
+
+class StatusCountsTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=user)
+        self.transaction = Transaction.objects.create(
+            group=self.group,
+            user=user,
+            amount=1000,
+            description="coffee",
+            date=date(2024, 1, 1),
+            type=Transaction.TransactionType.EXPENSE,
+        )
+
+    def _approve_behind_the_cache(self):
+        # a write from another worker: this process sees no invalidation
+        OcrApproval.objects.create(
+            transaction=self.transaction,
+            group=self.group,
+            status=OcrApproval.Status.APPROVED,
+        )
+
+    def test_process_local_cache_is_never_used(self):
+        status_counts(self.group.id)
+        self._approve_behind_the_cache()
+
+        self.assertEqual(status_counts(self.group.id)["approved"], 1)
+
+    def test_shared_cache_holds_counts_until_invalidated(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location,
+            }
+        }
+        with override_settings(CACHES=shared):
+            status_counts(self.group.id)
+            self._approve_behind_the_cache()
+            self.assertEqual(status_counts(self.group.id)["approved"], 0)
+
+            invalidate_status_counts(self.group.id)
+            self.assertEqual(status_counts(self.group.id)["approved"], 1)
+            cache.clear()
+
+
+class ApplyBulkDecisionTests(TestCase):
+    def setUp(self):
+        self.reviewer = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.reviewer)
+        other_group = Group.objects.create(name="other", owner=self.reviewer)
+        self.pending, self.fresh = [self._tx(self.group) for _ in range(2)]
+        self.foreign = self._tx(other_group)
+        OcrApproval.objects.create(transaction=self.pending, group=self.group)
+
+    def _tx(self, group):
+        return Transaction.objects.create(
+            group=group,
+            user=self.reviewer,
+            amount=1000,
+            description="coffee",
+            date=date(2024, 1, 1),
+            type=Transaction.TransactionType.EXPENSE,
+        )
+
+    def _decide(self, ids):
+        return apply_bulk_decision(
+            self.group,
+            ids,
+            reviewer=self.reviewer,
+            status=OcrApproval.Status.APPROVED,
+            notes="ok",
+        )
+
+    def test_upserts_group_rows_and_reports_the_rest(self):
+        results = self._decide([self.pending.id, self.fresh.id, self.foreign.id])
+
+        self.assertEqual(
+            [(row["transaction_id"], row["result"]) for row in results],
+            [
+                (self.pending.id, "updated"),
+                (self.fresh.id, "updated"),
+                (self.foreign.id, "not_found"),
+            ],
+        )
+        approvals = OcrApproval.objects.filter(group=self.group)
+        self.assertEqual(approvals.count(), 2)
+        for approval in approvals:
+            self.assertEqual(approval.status, OcrApproval.Status.APPROVED)
+            self.assertEqual(approval.reviewer, self.reviewer)
+            self.assertEqual(approval.notes, "ok")
+            self.assertIsNotNone(approval.decided_at)
+        self.assertFalse(OcrApproval.objects.filter(transaction=self.foreign).exists())
+
+    def test_duplicate_ids_are_decided_once(self):
+        results = self._decide([self.fresh.id, self.fresh.id])
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(OcrApproval.objects.filter(transaction=self.fresh).count(), 1)
+
+    def test_invalidates_counts_only_when_something_changed(self):
+        with mock.patch(
+            "apps.ocr.services.review_queue.invalidate_status_counts"
+        ) as invalidate:
+            self._decide([self.foreign.id])
+            invalidate.assert_not_called()
+
+            self._decide([self.fresh.id])
+            invalidate.assert_called_once_with(self.group.id)
+
+
+def _pdf(*pages) -> bytes:
+    """A minimal PDF; each page is a text line for its text layer, or None."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for text in pages:
+        stream = b""
+        if text:
+            stream = b"BT /F1 12 Tf 20 100 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 300 200] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (font_id, content_id)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue()
+
+
+def _png() -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 10, 10)).save(buffer, format="PNG")
+    return SimpleUploadedFile("receipt.png", buffer.getvalue(), "image/png")
+
+
+RECEIPT_TEXT = "2024-01-05 TOTAL 12,000"
+
+
+class SplitPdfTextLayerTests(SimpleTestCase):
+    def test_text_pages_need_no_ocr(self):
+        texts, ocr_pdf = split_pdf_text_layer(_pdf(RECEIPT_TEXT))
+
+        self.assertEqual(texts, [RECEIPT_TEXT])
+        self.assertIsNone(ocr_pdf)
+
+    def test_only_image_pages_are_sent_to_ocr(self):
+        texts, ocr_pdf = split_pdf_text_layer(_pdf(RECEIPT_TEXT, None))
+
+        self.assertEqual(texts, [RECEIPT_TEXT, None])
+        self.assertEqual(split_pdf_text_layer(ocr_pdf)[0], [None])
+
+    def test_image_only_or_unreadable_pdf_goes_through_whole(self):
+        content = _pdf(None, None)
+        self.assertEqual(split_pdf_text_layer(content), ([None, None], content))
+
+        broken = b"%PDF-1.4 not really"
+        with self.assertLogs("apps.ocr.services.pdf_text", "WARNING"):
+            self.assertEqual(split_pdf_text_layer(broken), ([], broken))
+
+
+class RecognizePdfTests(SimpleTestCase):
+    def test_text_layer_is_read_without_clova_and_has_no_confidence(self):
+        with mock.patch.object(recognition, "_recognize_with_clova") as clova:
+            result = recognition.recognize_receipt(io.BytesIO(_pdf(RECEIPT_TEXT)))
+
+        clova.assert_not_called()
+        self.assertEqual(result["engine"], "pdf_text")
+        self.assertEqual(result["lines"], [RECEIPT_TEXT])
+        self.assertEqual(result["line_confidences"], [None])
+        self.assertIsNone(result["confidence"])
+
+    def test_scanned_pages_are_merged_after_the_text_layer(self):
+        clova_result = {
+            "text": "CARD 1234",
+            "raw": {"images": []},
+            "lines": ["CARD 1234"],
+            "line_confidences": [0.9],
+            "confidence": 0.9,
+            "engine": "clova",
+        }
+        with mock.patch.object(
+            recognition, "_recognize_with_clova", return_value=clova_result
+        ) as clova:
+            result = recognition.recognize_receipt(
+                io.BytesIO(_pdf(RECEIPT_TEXT, None)), image_format="pdf"
+            )
+
+        self.assertEqual(clova.call_args.args[1], "pdf")
+        self.assertEqual(result["engine"], "pdf_text+clova")
+        self.assertEqual(result["lines"], [RECEIPT_TEXT, "CARD 1234"])
+        self.assertEqual(result["line_confidences"], [None, 0.9])
+
+    @override_settings(OCR_AUTO_APPROVE_CONFIDENCE=0.5)
+    def test_text_layer_fields_are_never_auto_approvable(self):
+        result = recognition.recognize_receipt(io.BytesIO(_pdf(RECEIPT_TEXT)))
+        fields = parse_receipt(result["text"])
+        self.assertTrue(fields.get("amount") and fields.get("date"))
+
+        confidence = aggregate_confidence(
+            score_receipt_fields(fields, result["lines"], result["line_confidences"])
+        )
+
+        self.assertIsNone(confidence)
+        self.assertFalse(should_auto_approve(confidence))
+
+
+@override_settings(OCR_MATCH_DATE_WINDOW_DAYS=3, OCR_MATCH_MAX_CANDIDATES=5)
+class FindCandidateTransactionsTests(TestCase):
+    receipt = {"amount": "12,000", "date": "2024-01-10", "merchant": "스타벅스"}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        self.group = Group.objects.create(name="g", owner=self.user)
+
+    def _tx(self, day, amount=12000, description="스타벅스 강남", **extra):
+        return Transaction.objects.create(
+            group=extra.pop("group", self.group),
+            user=self.user,
+            amount=amount,
+            description=description,
+            date=date(2024, 1, day),
+            type=extra.pop("type", Transaction.TransactionType.EXPENSE),
+        )
+
+    def _ids(self, fields=None, **kwargs):
+        return [
+            row["transaction_id"]
+            for row in find_candidate_transactions(
+                self.group, fields or self.receipt, **kwargs
+            )
+        ]
+
+    def test_window_edges_are_inclusive(self):
+        inside = [self._tx(7), self._tx(13)]
+        self._tx(6)
+        self._tx(14)
+
+        self.assertCountEqual(self._ids(), [tx.id for tx in inside])
+
+    def test_amount_must_match_exactly(self):
+        match = self._tx(10)
+        self._tx(10, amount=12001)
+
+        self.assertEqual(self._ids(), [match.id])
+        self.assertEqual(self._ids({**self.receipt, "amount": "n/a"}), [])
+
+    def test_other_groups_are_ignored(self):
+        other = Group.objects.create(name="other", owner=self.user)
+        self._tx(10, group=other)
+
+        self.assertEqual(self._ids(), [])
+        self.assertEqual(find_candidate_transactions(None, self.receipt), [])
+
+    def test_ranking_weighs_date_description_and_expense(self):
+        exact = self._tx(10)
+        off_by_two = self._tx(12)
+        other_shop = self._tx(10, description="편의점")
+        income = self._tx(10, type=Transaction.TransactionType.INCOME)
+
+        self.assertEqual(
+            self._ids(), [exact.id, income.id, off_by_two.id, other_shop.id]
+        )
+        self.assertEqual(self._ids(limit=2), [exact.id, income.id])
+
+    def test_undated_receipt_scores_recent_same_amount_rows(self):
+        older, newer = self._tx(1), self._tx(20)
+
+        undated = {"amount": 12000, "merchant": "스타벅스"}
+
+        self.assertEqual(self._ids(undated), [newer.id, older.id])
+
+
+class BulkheadTests(SimpleTestCase):
+    def _bulkhead(self, **kwargs):
+        options = {
+            "max_concurrent": 1,
+            "max_queue": 1,
+            "queue_timeout": 0.05,
+            "retry_after": 7,
+        }
+        options.update(kwargs)
+        return Bulkhead("test", **options)
+
+    def test_full_queue_is_rejected_without_waiting(self):
+        bulkhead = self._bulkhead(max_queue=0, queue_timeout=10)
+
+        with bulkhead.slot():
+            with self.assertRaisesMessage(BulkheadFull, "queue is full"):
+                with bulkhead.slot():
+                    pass
+
+        self.assertEqual(bulkhead.stats()["rejected"], 1)
+
+    def test_slot_timeout_is_a_503_with_retry_after(self):
+        bulkhead = self._bulkhead()
+
+        with bulkhead.slot():
+            with self.assertRaises(BulkheadFull) as ctx:
+                with bulkhead.slot():
+                    pass
+
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(ctx.exception.retry_after, 7)
+        self.assertEqual(bulkhead.stats()["queued"], 0)
+
+    def test_slot_is_released_when_the_call_raises(self):
+        bulkhead = self._bulkhead(lock_dir=tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, bulkhead.lock_dir, ignore_errors=True)
+
+        with self.assertRaises(RuntimeError):
+            with bulkhead.slot():
+                raise RuntimeError("upstream blew up")
+
+        with bulkhead.slot():
+            self.assertEqual(bulkhead.stats()["active"], 1)
+        self.assertEqual(bulkhead.stats()["active_all_processes"], 0)
+
+    def test_slot_files_are_shared_after_reset(self):
+        lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_dir, ignore_errors=True)
+        self.addCleanup(reset_bulkhead)
+        with override_settings(
+            OCR_BULKHEAD_LOCK_DIR=lock_dir,
+            OCR_MAX_CONCURRENCY=1,
+            OCR_QUEUE_TIMEOUT=0.05,
+        ):
+            reset_bulkhead()
+            before_fork = get_clova_bulkhead()
+            with before_fork.slot():
+                reset_bulkhead()
+                # the new instance stands in for a forked worker: its
+                # semaphore is free but the slot file is still locked
+                after_fork = get_clova_bulkhead()
+                self.assertIsNot(after_fork, before_fork)
+                with self.assertRaises(BulkheadFull):
+                    with after_fork.slot():
+                        pass
+            with after_fork.slot():
+                self.assertEqual(after_fork.stats()["active_all_processes"], 1)
+
+
+@override_settings(
+    CLOVA_OCR_API_URL="https://clova.example.com/ocr",
+    CLOVA_OCR_SECRET="secret",
+    OCR_BULKHEAD_LOCK_DIR="",
+    OCR_MAX_CONCURRENCY=1,
+    OCR_MAX_QUEUE=0,
+    OCR_RETRY_AFTER=9,
+)
+class ReceiptOcrBulkheadViewTests(TestCase):
+    def test_busy_bulkhead_answers_503_with_retry_after(self):
+        user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="pw"
+        )
+        group = Group.objects.create(name="g", owner=user)
+        GroupMembership.objects.create(
+            group=group,
+            user=user,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        reset_bulkhead()
+        self.addCleanup(reset_bulkhead)
+
+        with get_clova_bulkhead().slot():
+            response = client.post(
+                "/api/ocr/receipt",
+                {"group_id": group.id, "image": _png()},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "9")
@@ -3,6 +3,8 @@ from django.urls import path
 
 from apps.ocr.views import (
     OcrApprovalDetailView,
+    OcrBulkDecisionView,
+    OcrBulkheadStatusView,
     OcrPendingApprovalListView,
     OcrValidationLogListView,
     OcrApproveView,
@@ -12,7 +14,9 @@ from apps.ocr.views import (
 
 urlpatterns = [
     path("ocr/receipt", ReceiptOCRView.as_view()),
+    path("ocr/bulkhead", OcrBulkheadStatusView.as_view()),
     path("ocr/approvals/pending", OcrPendingApprovalListView.as_view()),
+    path("ocr/approvals/bulk", OcrBulkDecisionView.as_view()),
     path("ocr/transactions/<int:pk>/approval", OcrApprovalDetailView.as_view()),
     path("ocr/transactions/<int:pk>/logs", OcrValidationLogListView.as_view()),
     path("ocr/transactions/<int:pk>/approve", OcrApproveView.as_view()),
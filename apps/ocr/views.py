@@ -3,14 +3,12 @@ import io
 import json
 import os
 
-from django.conf import settings
 from django.db import transaction as db_transaction
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -20,12 +18,32 @@ from apps.groups.mixins import GroupContextMixin
 from apps.ocr.serializers import (
     OcrApprovalDetailSerializer,
     OcrApprovalSerializer,
+    OcrBulkDecisionSerializer,
     OcrPendingTransactionSerializer,
     OcrValidationLogSerializer,
     ReceiptOCRRequestSerializer,
 )
-from apps.ocr.services import OCRServiceError, encode_file_to_base64
-from apps.ocr.services.clova_ocr import extract_text_clova, parse_receipt
+from apps.ocr.services import OCRServiceError
+from apps.ocr.services.bulkhead import get_clova_bulkhead
+from apps.ocr.services.clova_ocr import (
+    aggregate_confidence,
+    parse_receipt,
+    score_receipt_fields,
+)
+from apps.ocr.pagination import ReviewQueuePagination
+from apps.ocr.services.fingerprints import dhash, find_similar_receipts
+from apps.ocr.services.matching import find_candidate_transactions
+from apps.ocr.services.payloads import store_raw_payload
+from apps.ocr.services.recognition import recognize_receipt
+from apps.ocr.services.review_queue import (
+    apply_bulk_decision,
+    STATUS_NONE,
+    enqueue_for_review,
+    get_approval,
+    get_or_create_approval,
+    invalidate_status_counts,
+    status_counts,
+)
 
 
 class ReceiptOCRView(GroupContextMixin, APIView):
@@ -68,8 +86,12 @@ class ReceiptOCRView(GroupContextMixin, APIView):
             raise ValidationError({"image": "Empty image file"})
         if image_file:
             content_type = getattr(image_file, "content_type", "") or ""
-            if content_type and not content_type.startswith("image/"):
-                raise ValidationError({"image": "Only image files are supported"})
+            if content_type and not (
+                content_type.startswith("image/") or content_type == "application/pdf"
+            ):
+                raise ValidationError(
+                    {"image": "Only image or PDF files are supported"}
+                )
 
         if transaction_id:
             transaction = get_object_or_404(
@@ -98,32 +120,29 @@ class ReceiptOCRView(GroupContextMixin, APIView):
         raw_payload = None
 
         try:
-            clova_url = os.environ.get("CLOVA_OCR_API_URL") or getattr(
-                settings, "CLOVA_OCR_API_URL", ""
-            )
-            clova_secret = os.environ.get("CLOVA_OCR_SECRET") or getattr(
-                settings, "CLOVA_OCR_SECRET", ""
-            )
-            if not clova_url or not clova_secret:
-                raise ValidationError(
-                    {"detail": "Clova OCR environment not configured"}
-                )
-            b64_content = encode_file_to_base64(image_file)
-            response_payload = extract_text_clova(
-                b64_content,
-                api_url=clova_url,
-                secret=clova_secret,
-                image_format=image_format,
-            )
+            receipt_hash = dhash(image_file)
+            response_payload = recognize_receipt(image_file, image_format=image_format)
             raw_text = response_payload.get("text", "")
             raw_payload = response_payload.get("raw")
+            text_lines = response_payload.get("lines") or []
+            line_confidences = response_payload.get("line_confidences") or []
+            engine = response_payload.get("engine")
         except OCRServiceError as exc:
-            return Response({"detail": str(exc)}, status=exc.status_code)
+            retry_after = getattr(exc, "retry_after", None)
+            return Response(
+                {"detail": str(exc)},
+                status=exc.status_code,
+                headers={"Retry-After": str(retry_after)} if retry_after else None,
+            )
         finally:
             if needs_close and hasattr(image_file, "close"):
                 image_file.close()
 
         parsed_fields = parse_receipt(raw_text)
+        field_confidences = score_receipt_fields(
+            parsed_fields, text_lines, line_confidences
+        )
+        confidence = aggregate_confidence(field_confidences)
 
         final_fields = parsed_fields.copy()
         for key, value in manual_overrides.items():
@@ -140,6 +159,8 @@ class ReceiptOCRView(GroupContextMixin, APIView):
         is_valid = bool(final_fields.get("amount") and final_fields.get("date"))
 
         stored = False
+        approval = None
+        raw_blob = None
         if store:
             if not transaction:
                 return Response(
@@ -164,34 +185,40 @@ class ReceiptOCRView(GroupContextMixin, APIView):
                 )
 
             with db_transaction.atomic():
+                raw_blob = store_raw_payload(raw_payload)
                 transaction.ocr_text = json.dumps(
                     {
                         "raw_text": raw_text,
                         "fields": final_fields,
-                        "raw_response": raw_payload,
                     },
                     ensure_ascii=False,
                 )
-                transaction.save(update_fields=["ocr_text", "updated_at"])
-                approval, _created = OcrApproval.objects.get_or_create(
-                    transaction=transaction
-                )
-                approval.status = OcrApproval.Status.PENDING
-                approval.reviewer = None
-                approval.decided_at = None
-                approval.notes = ""
-                approval.save(
+                transaction.ocr_raw_payload = raw_blob
+                transaction.ocr_confidence = confidence
+                # settles a queued background job, so it will not overwrite this
+                transaction.ocr_status = Transaction.OcrStatus.DONE
+                transaction.ocr_error = ""
+                transaction.save(
                     update_fields=[
-                        "status",
-                        "reviewer",
-                        "decided_at",
-                        "notes",
+                        "ocr_text",
+                        "ocr_raw_payload",
+                        "ocr_confidence",
+                        "ocr_status",
+                        "ocr_error",
                         "updated_at",
                     ]
                 )
+                approval = enqueue_for_review(
+                    transaction,
+                    confidence=confidence,
+                    field_confidences=field_confidences,
+                    auto_approvable=is_valid and not manual_overrides,
+                )
             stored = True
 
         if transaction:
+            if raw_blob is None:
+                raw_blob = store_raw_payload(raw_payload)
             OcrValidationLog.objects.create(
                 transaction=transaction,
                 user=request.user,
@@ -200,19 +227,36 @@ class ReceiptOCRView(GroupContextMixin, APIView):
                     "parsed": parsed_fields,
                     "final": final_fields,
                     "manual_overrides": manual_overrides,
-                    "raw_response": raw_payload,
                 },
+                raw_payload=raw_blob,
                 is_valid=is_valid,
                 notes=notes or "",
             )
 
+        # no transaction given: suggest ledger rows this receipt may belong to
+        candidates = (
+            [] if transaction else find_candidate_transactions(group, final_fields)
+        )
+
+        duplicates = find_similar_receipts(
+            group,
+            receipt_hash,
+            exclude_transaction_id=transaction.pk if transaction else None,
+        )
+
         return Response(
             {
                 "transaction_id": transaction_id,
                 "text": raw_text,
                 "fields": final_fields,
                 "stored": stored,
+                "approval_status": approval.status if approval else None,
+                "confidence": confidence,
+                "field_confidences": field_confidences,
                 "source": source,
+                "engine": engine,
+                "candidates": candidates,
+                "duplicates": duplicates,
                 "raw_response": raw_payload,
             },
             status=status.HTTP_200_OK,
@@ -231,12 +275,13 @@ class _OcrApprovalMixin(APIView):
         data["status"] = self.target_status
         serializer = OcrApprovalSerializer(data=data)
         serializer.is_valid(raise_exception=True)
-        approval, _created = OcrApproval.objects.get_or_create(transaction=transaction)
+        approval = get_or_create_approval(transaction)
         approval.mark(
             reviewer=request.user,
             status=self.target_status,
             notes=serializer.validated_data.get("notes", ""),
         )
+        invalidate_status_counts(approval.group_id)
         return Response(
             {
                 "transaction_id": transaction.id,
@@ -256,6 +301,32 @@ class OcrRejectView(_OcrApprovalMixin):
     target_status = OcrApproval.Status.REJECTED
 
 
+class OcrBulkDecisionView(GroupContextMixin, APIView):
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def post(self, request):
+        group = self.get_group()
+        serializer = OcrBulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        with db_transaction.atomic():
+            results = apply_bulk_decision(
+                group,
+                validated["transaction_ids"],
+                reviewer=request.user,
+                status=validated["status"],
+                notes=validated.get("notes", ""),
+            )
+        return Response(
+            {
+                "status": validated["status"],
+                "updated": sum(1 for item in results if item["result"] == "updated"),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class OcrApprovalDetailView(GroupContextMixin, APIView):
     permission_classes = [IsAuthenticated]
 
@@ -266,7 +337,12 @@ class OcrApprovalDetailView(GroupContextMixin, APIView):
             pk=pk,
             group=group,
         )
-        approval, _created = OcrApproval.objects.get_or_create(transaction=transaction)
+        approval = get_approval(transaction)
+        if approval is None:
+            # read-only: viewing must not put the transaction in the queue
+            approval = OcrApproval(
+                transaction=transaction, group_id=group.id, status=STATUS_NONE
+            )
         serializer = OcrApprovalDetailSerializer(
             approval, context={"request": request}
         )
@@ -278,19 +354,25 @@ class OcrPendingApprovalListView(GroupContextMixin, APIView):
 
     def get(self, request):
         group = self.get_group()
-        queryset = (
-            Transaction.objects.select_related("user", "ocr_approval")
-            .filter(group=group, ocr_text__isnull=False)
-            .filter(
-                Q(ocr_approval__status=OcrApproval.Status.PENDING)
-                | Q(ocr_approval__isnull=True)
-            )
-            .order_by("-updated_at")
-        )
+        queryset = OcrApproval.objects.select_related(
+            "transaction", "transaction__user"
+        ).filter(group=group, status=OcrApproval.Status.PENDING)
+        paginator = ReviewQueuePagination()
+        approvals = paginator.paginate_queryset(queryset, request)
         serializer = OcrPendingTransactionSerializer(
-            queryset, many=True, context={"request": request}
+            [approval.transaction for approval in approvals],
+            many=True,
+            context={"request": request},
+        )
+        return Response(
+            {
+                "counts": status_counts(group.id),
+                "ordering": paginator.ordering,
+                "next": paginator.get_next_link(),
+                "results": serializer.data,
+            },
+            status=status.HTTP_200_OK,
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class OcrValidationLogListView(GroupContextMixin, APIView):
@@ -311,8 +393,19 @@ class OcrValidationLogListView(GroupContextMixin, APIView):
         )
         if not is_admin and transaction.user_id != request.user.id:
             raise PermissionDenied("검수 로그는 관리자나 작성자만 볼 수 있습니다.")
-        logs = transaction.ocr_validation_logs.select_related("user").all()
+        logs = transaction.ocr_validation_logs.select_related(
+            "user", "raw_payload"
+        ).all()
         serializer = OcrValidationLogSerializer(
             logs, many=True, context={"request": request}
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class OcrBulkheadStatusView(APIView):
+    """Active/queued Clova OCR calls of this worker, plus busy slots across workers."""
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(get_clova_bulkhead().stats(), status=status.HTTP_200_OK)
@@ -1,7 +1,11 @@
 # moved from apps/common/admin/openbanking.py
 from django.contrib import admin
 
-from apps.openbanking.models import OpenBankingAccount
+from apps.openbanking.models import (
+    BankLedgerMatch,
+    BankTransaction,
+    OpenBankingAccount,
+)
 
 
 @admin.register(OpenBankingAccount)
@@ -17,3 +21,19 @@ class OpenBankingAccountAdmin(admin.ModelAdmin):
     list_filter = ("enabled", "bank_name")
     search_fields = ("alias", "fintech_use_num", "bank_name")
     ordering = ("alias",)
+
+
+@admin.register(BankTransaction)
+class BankTransactionAdmin(admin.ModelAdmin):
+    list_display = ("id", "account", "tran_date", "inout", "amount", "summary")
+    list_filter = ("inout",)
+    search_fields = ("tran_id", "summary")
+    ordering = ("-tran_date", "-id")
+
+
+@admin.register(BankLedgerMatch)
+class BankLedgerMatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "group", "bank_transaction", "transaction", "method", "score")
+    list_filter = ("method",)
+    raw_id_fields = ("bank_transaction", "transaction")
+    ordering = ("-id",)
@@ -0,0 +1,125 @@
+"""
+Balance lookup across every enabled account of a group.
+
+Accounts are fetched concurrently on a small per-process thread pool, so the
+request takes about as long as the slowest bank call instead of their sum.
+The pool lives as long as the worker, so its threads (and their database
+connections for the rate limiter, circuit and token rows) are reused across
+requests instead of piling up with every call. Each call
+still goes through the response cache and the shared rate limiter; accounts
+that fail are reported next to the ones that succeeded.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.openbanking.cache import cached_balance
+from apps.openbanking.models import OpenBankingAccount
+from apps.openbanking.services import OpenBankingServiceError, mask_fintech
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(
+                    int(getattr(settings, "OPENBANKING_BALANCE_CONCURRENCY", 4)), 1
+                ),
+                thread_name_prefix="openbanking-balance",
+            )
+        return _executor
+
+
+def reset_executor() -> None:
+    """Drop the worker pool; a forked child must not reuse the parent's threads."""
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def parse_amount(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(str(value).replace(",", "").split(".")[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def _fetch_one(account: OpenBankingAccount, force_refresh: bool) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "id": account.id,
+        "alias": account.alias,
+        "bank_name": account.bank_name,
+        "fintech_use_num": mask_fintech(account.fintech_use_num),
+    }
+    close_old_connections()
+    try:
+        payload, cache_info = cached_balance(
+            account.fintech_use_num, force_refresh=force_refresh
+        )
+    except OpenBankingServiceError as exc:
+        entry.update(
+            {
+                "ok": False,
+                "error": str(exc.detail),
+                "status_code": exc.status_code,
+                "retry_after": getattr(exc, "wait", None),
+            }
+        )
+        return entry
+    except Exception:
+        logger.exception(
+            "Balance lookup crashed fintech=%s", mask_fintech(account.fintech_use_num)
+        )
+        entry.update({"ok": False, "error": "Unexpected error", "status_code": 500})
+        return entry
+    finally:
+        close_old_connections()
+    entry.update(
+        {
+            "ok": True,
+            "balance": parse_amount(payload.get("balance")),
+            "currency": payload.get("currency") or "KRW",
+            "cache": cache_info,
+        }
+    )
+    return entry
+
+
+def fetch_balances(
+    accounts: Iterable[OpenBankingAccount], *, force_refresh: bool = False
+) -> Dict[str, Any]:
+    accounts = list(accounts)
+    results: List[Dict[str, Any]] = []
+    if accounts:
+        results = list(
+            _get_executor().map(
+                lambda account: _fetch_one(account, force_refresh), accounts
+            )
+        )
+
+    succeeded = [entry for entry in results if entry["ok"]]
+    totals: Dict[str, int] = {}
+    for entry in succeeded:
+        if entry["balance"] is not None:
+            currency = entry["currency"]
+            totals[currency] = totals.get(currency, 0) + entry["balance"]
+    return {
+        "accounts": results,
+        "total": totals.get("KRW", 0),
+        "totals": totals,
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "partial": 0 < len(succeeded) < len(results),
+    }
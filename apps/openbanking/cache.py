@@ -0,0 +1,197 @@
+"""
+Read-through cache for OpenBanking balance and transaction lookups.
+
+Entries are keyed by (endpoint, fintech_use_num, params) and live in the
+default Django cache. With the per-process LocMem default every worker keeps
+its own copies and refreshes them on its own; point CACHE_BACKEND at a shared
+backend to share entries and the refresh lock across workers. Nothing here
+is invalidated by writes, so a per-process cache costs only extra upstream
+calls, never wrong data beyond the TTLs. An entry younger than its TTL is
+served as-is; within the following stale window it is still served, while
+one background refresh (guarded by a cache lock) fetches a new copy.
+Older entries are fetched synchronously; if that fails (bank down, circuit
+open) an entry kept for up to OPENBANKING_CACHE_FALLBACK_TTL more seconds is
+served instead of the error.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from apps.openbanking.services import (
+    OpenBankingServiceError,
+    fetch_balance,
+    fetch_transactions,
+    mask_fintech,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "openbanking:resp"
+REFRESH_LOCK_TIMEOUT = 30
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+BYPASS = "bypass"
+FALLBACK = "fallback"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(
+                    int(getattr(settings, "OPENBANKING_CACHE_REFRESH_WORKERS", 2)), 1
+                ),
+                thread_name_prefix="openbanking-refresh",
+            )
+        return _executor
+
+
+def reset_executor() -> None:
+    """Drop the refresh pool; a forked child must not reuse the parent's threads."""
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def _ttl(endpoint: str) -> int:
+    name = f"OPENBANKING_CACHE_{endpoint.upper()}_TTL"
+    return max(int(getattr(settings, name, 0)), 0)
+
+
+def _stale_ttl() -> int:
+    return max(int(getattr(settings, "OPENBANKING_CACHE_STALE_TTL", 0)), 0)
+
+
+def _fallback_ttl() -> int:
+    return max(int(getattr(settings, "OPENBANKING_CACHE_FALLBACK_TTL", 0)), 0)
+
+
+def cache_key(endpoint: str, fintech_use_num: str, params: Dict[str, Any]) -> str:
+    # hashed so account numbers never show up in cache keys
+    digest = hashlib.sha1(
+        json.dumps([fintech_use_num, params], sort_keys=True, default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{endpoint}:{digest}"
+
+
+def _store(key: str, payload: Dict[str, Any], ttl: int) -> None:
+    cache.set(
+        key,
+        {"payload": payload, "stored_at": time.time()},
+        timeout=ttl + _stale_ttl() + _fallback_ttl(),
+    )
+
+
+def _refresh(key: str, loader: Callable[[], Dict[str, Any]], ttl: int, label: str):
+    close_old_connections()
+    try:
+        _store(key, loader(), ttl)
+    except OpenBankingServiceError as exc:
+        logger.info("OpenBanking cache refresh failed %s: %s", label, exc)
+    except Exception:
+        logger.exception("OpenBanking cache refresh crashed %s", label)
+    finally:
+        cache.delete(f"{key}:refresh")
+        close_old_connections()
+
+
+def _schedule_refresh(key: str, loader, ttl: int, label: str) -> None:
+    # one refresh per entry per cache (all workers when it is shared); the
+    # rest keep serving stale
+    if not cache.add(f"{key}:refresh", 1, timeout=REFRESH_LOCK_TIMEOUT):
+        return
+    try:
+        _get_executor().submit(_refresh, key, loader, ttl, label)
+    except RuntimeError:
+        cache.delete(f"{key}:refresh")
+
+
+def cached_call(
+    endpoint: str,
+    fintech_use_num: str,
+    params: Dict[str, Any],
+    loader: Callable[[], Dict[str, Any]],
+    *,
+    force_refresh: bool = False,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return (payload, cache_info); cache_info has ``status`` and ``age`` (seconds)."""
+    ttl = _ttl(endpoint)
+    if ttl <= 0:
+        return loader(), {"status": BYPASS, "age": 0}
+
+    key = cache_key(endpoint, fintech_use_num, params)
+    label = f"{endpoint} fintech={mask_fintech(fintech_use_num)}"
+    entry = cache.get(key)
+    age = max(time.time() - entry["stored_at"], 0.0) if entry is not None else 0.0
+    if entry is not None and not force_refresh:
+        if age < ttl:
+            return entry["payload"], {"status": HIT, "age": int(age)}
+        if age < ttl + _stale_ttl():
+            _schedule_refresh(key, loader, ttl, label)
+            return entry["payload"], {"status": STALE, "age": int(age)}
+
+    try:
+        payload = loader()
+    except OpenBankingServiceError as exc:
+        if entry is None:
+            raise
+        logger.info("Serving cached OpenBanking %s after error: %s", label, exc)
+        return entry["payload"], {"status": FALLBACK, "age": int(age)}
+    _store(key, payload, ttl)
+    return payload, {"status": MISS, "age": 0}
+
+
+def cached_balance(fintech_use_num: str, *, force_refresh: bool = False):
+    fintech = fintech_use_num.strip()
+    return cached_call(
+        "balance",
+        fintech,
+        {},
+        lambda: fetch_balance(fintech),
+        force_refresh=force_refresh,
+    )
+
+
+def cached_transactions(
+    fintech_use_num: str,
+    from_date: str,
+    to_date: str,
+    *,
+    sort: str = "time",
+    page: int = 1,
+    size: int = 100,
+    force_refresh: bool = False,
+):
+    fintech = fintech_use_num.strip()
+    params = {
+        "from_date": from_date,
+        "to_date": to_date,
+        "sort": sort,
+        "page": page,
+        "size": size,
+    }
+    return cached_call(
+        "transactions",
+        fintech,
+        params,
+        lambda: fetch_transactions(
+            fintech, from_date, to_date, sort=sort, page=page, size=size
+        ),
+        force_refresh=force_refresh,
+    )
@@ -0,0 +1,195 @@
+"""
+Circuit breaker for OpenBanking upstream calls.
+
+State lives in the OpenBankingCircuit table (one row per endpoint), so every
+worker sees the same circuit and a success in one process closes it for all
+of them. After ``threshold`` failures (timeouts, connection errors, 5xx)
+within ``window`` seconds the circuit opens and calls are refused without
+touching the network. Once ``reset_timeout`` has passed one caller is let
+through as a probe: success closes the circuit, failure opens it again.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.openbanking.models import OpenBankingCircuit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"OpenBanking circuit for {endpoint} is open")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def parse_thresholds(raw: str) -> Dict[str, int]:
+    """``"token:3,balance:5"`` -> ``{"token": 3, "balance": 5}``."""
+    thresholds: Dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, _, value = part.partition(":")
+        if name.strip() and value.strip().isdigit():
+            thresholds[name.strip()] = int(value)
+    return thresholds
+
+
+@dataclass
+class CircuitBreaker:
+    endpoint: str
+    threshold: int
+    window: float
+    reset_timeout: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _locked_row(self) -> OpenBankingCircuit:
+        """Lock this endpoint's row; call inside transaction.atomic()."""
+        OpenBankingCircuit.objects.bulk_create(
+            [OpenBankingCircuit(endpoint=self.endpoint)], ignore_conflicts=True
+        )
+        return OpenBankingCircuit.objects.select_for_update().get(
+            endpoint=self.endpoint
+        )
+
+    def _opened_at(self) -> Optional[float]:
+        return (
+            OpenBankingCircuit.objects.filter(endpoint=self.endpoint)
+            .values_list("opened_at", flat=True)
+            .first()
+        )
+
+    def open_for(self) -> float:
+        """Seconds until the circuit may be probed again (0 when not open)."""
+        if not self.enabled:
+            return 0.0
+        opened_at = self._opened_at()
+        if opened_at is None:
+            return 0.0
+        return max(opened_at + self.reset_timeout - time.time(), 0.0)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpen unless a call may go out now."""
+        if not self.enabled or self._opened_at() is None:
+            return
+        with transaction.atomic():
+            row = self._locked_row()
+            if row.opened_at is None:
+                return
+            now = time.time()
+            reopen_at = row.opened_at + self.reset_timeout
+            if now < reopen_at:
+                raise CircuitOpen(self.endpoint, reopen_at - now)
+            # half-open: a single probe per reset period across all workers
+            if row.probe_until is not None and now < row.probe_until:
+                raise CircuitOpen(self.endpoint, row.probe_until - now)
+            row.probe_until = now + self.reset_timeout
+            row.save(update_fields=["probe_until"])
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        # skip the write on the common path where nothing needs resetting
+        OpenBankingCircuit.objects.filter(endpoint=self.endpoint).exclude(
+            opened_at=None, failures=0
+        ).update(
+            opened_at=None, probe_until=None, failures=0, window_started_at=None
+        )
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with transaction.atomic():
+            row = self._locked_row()
+            now = time.time()
+            if row.opened_at is not None:
+                # the half-open probe (or a call that raced the opening) failed
+                self._open(row, now)
+                return
+            started = row.window_started_at
+            if started is None or now - started >= self.window:
+                row.window_started_at = now
+                row.failures = 0
+            row.failures += 1
+            if row.failures >= self.threshold:
+                self._open(row, now)
+            else:
+                row.save(update_fields=["failures", "window_started_at"])
+
+    def _open(self, row: OpenBankingCircuit, now: float) -> None:
+        row.opened_at = now
+        row.probe_until = None
+        row.failures = 0
+        row.window_started_at = None
+        row.save()
+
+    def state(self) -> Dict[str, object]:
+        row = OpenBankingCircuit.objects.filter(endpoint=self.endpoint).first()
+        opened_at = row.opened_at if row else None
+        failures = row.failures if row else 0
+        if (
+            row is not None
+            and row.window_started_at is not None
+            and time.time() - row.window_started_at >= self.window
+        ):
+            failures = 0
+        if opened_at is None:
+            current = CLOSED
+        elif time.time() < opened_at + self.reset_timeout:
+            current = OPEN
+        else:
+            current = HALF_OPEN
+        return {
+            "endpoint": self.endpoint,
+            "state": current,
+            "failures": failures,
+            "threshold": self.threshold,
+            "opened_at": opened_at,
+        }
+
+
+ENDPOINTS = ("token", "balance", "transactions")
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            thresholds = parse_thresholds(
+                getattr(settings, "OPENBANKING_CB_THRESHOLDS", "")
+            )
+            breaker = _breakers[endpoint] = CircuitBreaker(
+                endpoint=endpoint,
+                threshold=thresholds.get(
+                    endpoint, int(getattr(settings, "OPENBANKING_CB_THRESHOLD", 5))
+                ),
+                window=float(getattr(settings, "OPENBANKING_CB_WINDOW", 60)),
+                reset_timeout=float(
+                    getattr(settings, "OPENBANKING_CB_RESET_TIMEOUT", 30)
+                ),
+            )
+        return breaker
+
+
+def reset_breakers(endpoint: Optional[str] = None) -> None:
+    """Forget cached breaker settings (the shared state is left alone)."""
+    with _breakers_lock:
+        if endpoint is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(endpoint, None)
+
+
+def breaker_states() -> Dict[str, Dict[str, object]]:
+    return {endpoint: get_breaker(endpoint).state() for endpoint in ENDPOINTS}
@@ -0,0 +1,43 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.groups.models import Group
+from apps.openbanking.reconcile import reconcile_group
+
+
+class Command(BaseCommand):
+    help = "Match synced bank transactions against ledger transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="Only reconcile this group id")
+        parser.add_argument(
+            "--days", type=int, default=365, help="How many days back to look"
+        )
+        parser.add_argument("--since", help="Start date (YYYY-MM-DD), overrides --days")
+        parser.add_argument("--window-days", type=int, default=None)
+
+    def handle(self, *args, **options):
+        until = timezone.localdate()
+        if options["since"]:
+            try:
+                since = datetime.date.fromisoformat(options["since"])
+            except ValueError as exc:
+                raise CommandError(f"Invalid --since: {exc}") from exc
+        else:
+            since = until - datetime.timedelta(days=options["days"])
+
+        groups = Group.objects.filter(openbanking_accounts__isnull=False).distinct()
+        if options["group"]:
+            groups = groups.filter(id=options["group"])
+
+        for group in groups.order_by("id"):
+            result = reconcile_group(
+                group, since=since, until=until, window_days=options["window_days"]
+            )
+            self.stdout.write(
+                f"group={group.id} matched={result.matched} "
+                f"bank_unmatched={result.bank_unmatched} "
+                f"ledger_unmatched={result.ledger_unmatched}"
+            )
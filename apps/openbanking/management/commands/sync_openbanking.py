@@ -0,0 +1,76 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.openbanking.models import OpenBankingAccount
+from apps.openbanking.sync import sync_all_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Pull OpenBanking transactions for every enabled account into "
+        "BankTransaction, starting from each account's sync watermark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, action="append", dest="accounts")
+        parser.add_argument("--group", type=int)
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore watermarks and re-sync OPENBANKING_SYNC_INITIAL_DAYS.",
+        )
+        parser.add_argument("--until", help="Last day to sync (YYYY-MM-DD).")
+        parser.add_argument("--page-size", type=int)
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running, syncing again every SECONDS (worker mode).",
+        )
+
+    def handle(self, *args, **options):
+        until = None
+        if options["until"]:
+            try:
+                until = datetime.date.fromisoformat(options["until"])
+            except ValueError as exc:
+                raise CommandError("--until must be YYYY-MM-DD") from exc
+
+        queryset = OpenBankingAccount.objects.all()
+        if options["accounts"]:
+            queryset = queryset.filter(id__in=options["accounts"])
+        if options["group"]:
+            queryset = queryset.filter(group_id=options["group"])
+
+        while True:
+            failed = self._run(queryset, until, options)
+            if options["loop"] <= 0:
+                break
+            time.sleep(options["loop"])
+        if failed:
+            raise CommandError(f"{failed} account(s) failed to sync")
+
+    def _run(self, queryset, until, options) -> int:
+        results = sync_all_accounts(
+            queryset,
+            until=until,
+            full=options["full"],
+            page_size=options["page_size"],
+        )
+        failed = 0
+        for result in results:
+            if result.ok:
+                self.stdout.write(
+                    f"account {result.account_id}: {result.from_date}..{result.to_date} "
+                    f"pages={result.pages} fetched={result.fetched} new={result.created}"
+                )
+            else:
+                failed += 1
+                self.stderr.write(f"account {result.account_id}: {result.error}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Synced {len(results) - failed}/{len(results)} account(s)")
+        )
+        return failed
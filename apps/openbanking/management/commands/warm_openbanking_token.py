@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.openbanking.services import (
+    OpenBankingServiceError,
+    get_access_token,
+    get_config,
+    refresh_access_token_if_due,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue the OpenBanking access token into the shared token table, or "
+        "renew it once it is past OPENBANKING_TOKEN_REFRESH_AHEAD. Run it on "
+        "deploy and from a scheduler so requests never issue tokens inline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Replace a token that is still valid."
+        )
+
+    def handle(self, *args, **options):
+        if get_config()["sandbox"]:
+            self.stdout.write("Sandbox mode: no token needed.")
+            return
+        try:
+            if options["force"]:
+                get_access_token(force_refresh=True)
+            else:
+                refresh_access_token_if_due()
+        except OpenBankingServiceError as exc:
+            raise CommandError(f"Token issuance failed: {exc}") from exc
+        self.stdout.write(self.style.SUCCESS("OpenBanking token is stored."))
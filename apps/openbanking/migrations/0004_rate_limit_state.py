@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openbanking', '0003_alter_openbankingaccount_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenBankingRateLimit',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('tat', models.FloatField(default=0.0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openbanking', '0004_rate_limit_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='openbankingaccount',
+            name='last_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='openbankingaccount',
+            name='sync_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='openbankingaccount',
+            name='synced_from',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='openbankingaccount',
+            name='synced_through',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='BankTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tran_id', models.CharField(max_length=64)),
+                ('tran_date', models.DateField()),
+                ('tran_at', models.DateTimeField(blank=True, null=True)),
+                ('summary', models.CharField(blank=True, default='', max_length=255)),
+                ('amount', models.BigIntegerField(blank=True, null=True)),
+                ('balance', models.BigIntegerField(blank=True, null=True)),
+                ('inout', models.CharField(blank=True, default='', max_length=16)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bank_transactions', to='openbanking.openbankingaccount')),
+            ],
+            options={
+                'ordering': ['tran_date', 'tran_at', 'id'],
+                'indexes': [models.Index(fields=['account', 'tran_date', 'tran_at'], name='idx_bank_tx_account_date')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='banktransaction',
+            constraint=models.UniqueConstraint(fields=('account', 'tran_id'), name='uniq_bank_tx_account_tran'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_invite_code'),
+        ('common', '0010_receipt_fingerprint'),
+        ('openbanking', '0005_bank_transaction_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankLedgerMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('method', models.CharField(choices=[('auto', 'auto'), ('manual', 'manual')], default='auto', max_length=8)),
+                ('score', models.FloatField(default=0.0)),
+                ('date_delta', models.IntegerField(default=0)),
+                ('bank_transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_match', to='openbanking.banktransaction')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bank_ledger_matches', to='groups.group')),
+                ('transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='bank_match', to='common.transaction')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
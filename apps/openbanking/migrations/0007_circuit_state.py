@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openbanking', '0006_bank_ledger_match'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenBankingCircuit',
+            fields=[
+                ('endpoint', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('window_started_at', models.FloatField(blank=True, null=True)),
+                ('opened_at', models.FloatField(blank=True, null=True)),
+                ('probe_until', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openbanking', '0007_circuit_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenBankingToken',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('value', models.TextField(blank=True)),
+                ('issued_at', models.FloatField(default=0.0)),
+                ('expires_at', models.FloatField(default=0.0)),
+                ('lease_until', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -20,6 +20,11 @@ class OpenBankingAccount(TimeStampedModel):
     bank_name = models.CharField(max_length=50, blank=True, null=True)
     account_masked = models.CharField(max_length=64, blank=True, null=True)
     enabled = models.BooleanField(default=True)
+    # transaction sync watermarks: [synced_from, synced_through] is stored locally
+    synced_from = models.DateField(blank=True, null=True)
+    synced_through = models.DateField(blank=True, null=True)
+    last_synced_at = models.DateTimeField(blank=True, null=True)
+    sync_error = models.TextField(blank=True, default="")
 
     def __str__(self) -> str:
         return f"{self.alias}({self.fintech_use_num})"
@@ -27,3 +32,102 @@ class OpenBankingAccount(TimeStampedModel):
     class Meta:
         unique_together = [("group", "fintech_use_num")]
         ordering = ["alias", "id"]
+
+
+class BankTransaction(TimeStampedModel):
+    """Account transaction pulled from OpenBanking by the sync engine."""
+
+    account = models.ForeignKey(
+        OpenBankingAccount,
+        on_delete=models.CASCADE,
+        related_name="bank_transactions",
+    )
+    tran_id = models.CharField(max_length=64)
+    tran_date = models.DateField()
+    tran_at = models.DateTimeField(blank=True, null=True)
+    summary = models.CharField(max_length=255, blank=True, default="")
+    amount = models.BigIntegerField(blank=True, null=True)
+    balance = models.BigIntegerField(blank=True, null=True)
+    inout = models.CharField(max_length=16, blank=True, default="")
+
+    class Meta:
+        ordering = ["tran_date", "tran_at", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "tran_id"], name="uniq_bank_tx_account_tran"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["account", "tran_date", "tran_at"],
+                name="idx_bank_tx_account_date",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.tran_date} {self.inout} {self.amount} {self.summary}"
+
+
+class OpenBankingRateLimit(models.Model):
+    """GCRA state shared by all workers: theoretical arrival time per quota key."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    tat = models.FloatField(default=0.0)
+
+    def __str__(self) -> str:
+        return f"{self.key} (tat={self.tat:.3f})"
+
+
+class OpenBankingToken(models.Model):
+    """Access token shared by all workers, plus the lease of whoever renews it."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    value = models.TextField(blank=True)
+    issued_at = models.FloatField(default=0.0)
+    expires_at = models.FloatField(default=0.0)
+    lease_until = models.FloatField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return self.key
+
+
+class OpenBankingCircuit(models.Model):
+    """Circuit breaker state shared by all workers, one row per endpoint."""
+
+    endpoint = models.CharField(max_length=32, primary_key=True)
+    failures = models.PositiveIntegerField(default=0)
+    window_started_at = models.FloatField(null=True, blank=True)
+    opened_at = models.FloatField(null=True, blank=True)
+    probe_until = models.FloatField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.endpoint} (failures={self.failures})"
+
+
+class BankLedgerMatch(TimeStampedModel):
+    """Reconciliation link between a bank entry and a ledger transaction."""
+
+    class Method(models.TextChoices):
+        AUTO = "auto", "auto"
+        MANUAL = "manual", "manual"
+
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="bank_ledger_matches"
+    )
+    bank_transaction = models.OneToOneField(
+        BankTransaction, on_delete=models.CASCADE, related_name="ledger_match"
+    )
+    transaction = models.OneToOneField(
+        "common.Transaction", on_delete=models.CASCADE, related_name="bank_match"
+    )
+    method = models.CharField(
+        max_length=8, choices=Method.choices, default=Method.AUTO
+    )
+    score = models.FloatField(default=0.0)
+    date_delta = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"bank {self.bank_transaction_id} <-> tx {self.transaction_id}"
@@ -0,0 +1,210 @@
+"""
+Bank-to-ledger reconciliation.
+
+Unmatched bank entries and ledger transactions of a group are bucketed by
+(direction, amount); inside a bucket both sides are sorted by date and merged
+with a sliding date window, so only pairs that can actually match are ever
+scored. Pairs are then taken greedily by score, one link per row on each side.
+"""
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.models import Transaction
+from apps.groups.models import Group
+from apps.ocr.services.matching import description_score
+from apps.openbanking.models import BankLedgerMatch, BankTransaction
+
+DEBIT = Transaction.TransactionType.EXPENSE
+CREDIT = Transaction.TransactionType.INCOME
+
+INOUT_TYPES = {
+    "d": DEBIT,
+    "출금": DEBIT,
+    "out": DEBIT,
+    "c": CREDIT,
+    "입금": CREDIT,
+    "in": CREDIT,
+}
+
+
+@dataclass
+class ReconcileResult:
+    matched: int
+    bank_unmatched: int
+    ledger_unmatched: int
+    since: datetime.date
+    until: datetime.date
+
+
+def _window_days() -> int:
+    return max(int(getattr(settings, "OPENBANKING_RECONCILE_WINDOW_DAYS", 3)), 0)
+
+
+def _min_score() -> float:
+    return float(getattr(settings, "OPENBANKING_RECONCILE_MIN_SCORE", 0.5))
+
+
+def bank_type(inout: Optional[str]) -> Optional[str]:
+    return INOUT_TYPES.get((inout or "").strip().lower())
+
+
+def default_range(
+    since: Optional[datetime.date], until: Optional[datetime.date]
+) -> Tuple[datetime.date, datetime.date]:
+    until = until or timezone.localdate()
+    since = since or until - datetime.timedelta(days=365)
+    return since, until
+
+
+def unmatched_bank_entries(group, since: datetime.date, until: datetime.date):
+    return (
+        BankTransaction.objects.filter(
+            account__group=group,
+            tran_date__range=(since, until),
+            ledger_match__isnull=True,
+            amount__isnull=False,
+        )
+        .select_related("account")
+        .order_by("tran_date", "id")
+    )
+
+
+def unmatched_ledger_entries(group, since: datetime.date, until: datetime.date):
+    return Transaction.objects.filter(
+        group=group, date__range=(since, until), bank_match__isnull=True
+    ).order_by("date", "id")
+
+
+def _pair_candidates(bank_rows, ledger_rows, window: int):
+    """Sort-merge one (direction, amount) bucket; both inputs are date-sorted."""
+    start = 0
+    for bank in bank_rows:
+        low = bank["tran_date"] - datetime.timedelta(days=window)
+        high = bank["tran_date"] + datetime.timedelta(days=window)
+        while start < len(ledger_rows) and ledger_rows[start]["date"] < low:
+            start += 1
+        index = start
+        while index < len(ledger_rows) and ledger_rows[index]["date"] <= high:
+            yield bank, ledger_rows[index]
+            index += 1
+
+
+def find_matches(
+    bank_entries: List[Dict],
+    ledger_entries: List[Dict],
+    *,
+    window: int,
+    min_score: float,
+) -> List[Tuple[int, int, float, int]]:
+    """Return (bank_id, transaction_id, score, date_delta) links."""
+    buckets: Dict[Tuple[Optional[str], int], Dict[str, list]] = defaultdict(
+        lambda: {"bank": [], "ledger": []}
+    )
+    for entry in bank_entries:
+        buckets[(bank_type(entry["inout"]), entry["amount"])]["bank"].append(entry)
+    ledger_by_amount: Dict[Tuple[str, int], list] = defaultdict(list)
+    for entry in ledger_entries:
+        ledger_by_amount[(entry["type"], entry["amount"])].append(entry)
+
+    scored = []
+    for (direction, amount), sides in buckets.items():
+        if direction is None:
+            # unknown direction: compare against both ledger types
+            ledger_rows = sorted(
+                ledger_by_amount.get((DEBIT, amount), [])
+                + ledger_by_amount.get((CREDIT, amount), []),
+                key=lambda row: (row["date"], row["id"]),
+            )
+        else:
+            ledger_rows = ledger_by_amount.get((direction, amount), [])
+        if not ledger_rows:
+            continue
+        for bank, ledger in _pair_candidates(sides["bank"], ledger_rows, window):
+            delta = abs((ledger["date"] - bank["tran_date"]).days)
+            date_score = 1.0 - delta / (window + 1)
+            text_score = description_score(bank["summary"], ledger["description"])
+            score = 0.6 * date_score + 0.4 * text_score
+            if score >= min_score:
+                scored.append((score, -delta, bank["id"], ledger["id"]))
+
+    scored.sort(reverse=True)
+    used_bank, used_ledger = set(), set()
+    links = []
+    for score, neg_delta, bank_id, ledger_id in scored:
+        if bank_id in used_bank or ledger_id in used_ledger:
+            continue
+        used_bank.add(bank_id)
+        used_ledger.add(ledger_id)
+        links.append((bank_id, ledger_id, round(score, 3), -neg_delta))
+    return links
+
+
+def _linked_pairs(pairs: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    if not pairs:
+        return set()
+    rows = BankLedgerMatch.objects.filter(
+        bank_transaction_id__in={bank_id for bank_id, _ in pairs}
+    ).values_list("bank_transaction_id", "transaction_id")
+    return set(rows) & pairs
+
+
+def reconcile_group(
+    group,
+    *,
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None,
+    window_days: Optional[int] = None,
+) -> ReconcileResult:
+    since, until = default_range(since, until)
+    window = _window_days() if window_days is None else max(window_days, 0)
+    margin = datetime.timedelta(days=window)
+
+    bank_entries = list(
+        unmatched_bank_entries(group, since, until).values(
+            "id", "tran_date", "amount", "inout", "summary"
+        )
+    )
+    # ledger rows just outside the range can still pair with edge bank entries
+    ledger_entries = list(
+        unmatched_ledger_entries(group, since - margin, until + margin).values(
+            "id", "date", "amount", "type", "description"
+        )
+    )
+    links = find_matches(
+        bank_entries, ledger_entries, window=window, min_score=_min_score()
+    )
+    pairs = {(bank_id, ledger_id) for bank_id, ledger_id, _, _ in links}
+    with transaction.atomic():
+        # one run per group at a time, so the before/after diff below only
+        # sees this run's inserts
+        Group.objects.select_for_update().filter(pk=group.pk).first()
+        existing = _linked_pairs(pairs)
+        BankLedgerMatch.objects.bulk_create(
+            [
+                BankLedgerMatch(
+                    group=group,
+                    bank_transaction_id=bank_id,
+                    transaction_id=ledger_id,
+                    method=BankLedgerMatch.Method.AUTO,
+                    score=score,
+                    date_delta=delta,
+                )
+                for bank_id, ledger_id, score, delta in links
+            ],
+            ignore_conflicts=True,
+        )
+        # links that lost to a concurrent manual match were ignored above
+        matched = len(_linked_pairs(pairs) - existing)
+    return ReconcileResult(
+        matched=matched,
+        bank_unmatched=unmatched_bank_entries(group, since, until).count(),
+        ledger_unmatched=unmatched_ledger_entries(group, since, until).count(),
+        since=since,
+        until=until,
+    )
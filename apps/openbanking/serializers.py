@@ -2,9 +2,11 @@
 from datetime import timedelta
 from typing import Any, Dict
 
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
-from apps.openbanking.models import OpenBankingAccount
+from apps.common.models import Transaction
+from apps.openbanking.models import BankLedgerMatch, BankTransaction, OpenBankingAccount
 
 
 class OpenBankingAccountSerializer(serializers.ModelSerializer):
@@ -91,3 +93,82 @@ class OpenBankingAuthCallbackSerializer(serializers.Serializer):
     code = serializers.CharField(max_length=128)
     scope = serializers.CharField(required=False, allow_blank=True, max_length=255)
     state = serializers.CharField(required=False, allow_blank=True, max_length=255)
+
+
+class OpenBankingReconcileQuerySerializer(serializers.Serializer):
+    from_date = serializers.DateField(required=False, input_formats=["%Y-%m-%d"])
+    to_date = serializers.DateField(required=False, input_formats=["%Y-%m-%d"])
+    window_days = serializers.IntegerField(required=False, min_value=0, max_value=31)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        from_date = attrs.get("from_date")
+        to_date = attrs.get("to_date")
+        if from_date and to_date and from_date > to_date:
+            raise serializers.ValidationError(
+                {"range": "from_date cannot be greater than to_date."}
+            )
+        if from_date and to_date and (to_date - from_date) > timedelta(days=366):
+            raise serializers.ValidationError(
+                {"range": "Maximum reconciliation window is 366 days."}
+            )
+        return attrs
+
+
+class BankLedgerMatchSerializer(serializers.ModelSerializer):
+    bank_transaction_id = serializers.PrimaryKeyRelatedField(
+        source="bank_transaction", queryset=BankTransaction.objects.all()
+    )
+    transaction_id = serializers.PrimaryKeyRelatedField(
+        source="transaction", queryset=Transaction.objects.all()
+    )
+
+    class Meta:
+        model = BankLedgerMatch
+        fields = [
+            "id",
+            "bank_transaction_id",
+            "transaction_id",
+            "method",
+            "score",
+            "date_delta",
+            "created_at",
+        ]
+        read_only_fields = ["id", "method", "score", "date_delta", "created_at"]
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        group = self.context.get("group")
+        bank = attrs["bank_transaction"]
+        ledger = attrs["transaction"]
+        if group is None or bank.account.group_id != group.id:
+            raise serializers.ValidationError(
+                {"bank_transaction_id": "Bank entry belongs to a different group"}
+            )
+        if ledger.group_id != group.id:
+            raise serializers.ValidationError(
+                {"transaction_id": "Transaction belongs to a different group"}
+            )
+        if BankLedgerMatch.objects.filter(bank_transaction=bank).exists():
+            raise serializers.ValidationError(
+                {"bank_transaction_id": "Bank entry is already matched"}
+            )
+        if BankLedgerMatch.objects.filter(transaction=ledger).exists():
+            raise serializers.ValidationError(
+                {"transaction_id": "Transaction is already matched"}
+            )
+        attrs["date_delta"] = abs((ledger.date - bank.tran_date).days)
+        return attrs
+
+    def create(self, validated_data):
+        # the checks above race with concurrent links; the one-to-one
+        # constraints have the final say
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as exc:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        "Bank entry or transaction is already matched."
+                    ]
+                }
+            ) from exc
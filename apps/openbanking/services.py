@@ -1,29 +1,40 @@
 # moved from apps/common/services/openbanking.py
+import copy
+import functools
+import hashlib
 import json
 import logging
-import time
+import math
+import threading
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 
 import requests
 from django.conf import settings
-from django.core.cache import cache
-from requests import Session
-from requests.adapters import HTTPAdapter
 from rest_framework.exceptions import APIException
-from urllib3.util.retry import Retry
+
+from apps.common.services import http_client
+from apps.openbanking.circuit import CircuitBreaker, CircuitOpen, get_breaker
+from apps.openbanking import synthetic
+from apps.openbanking.ratelimit import Quota, get_rate_limiter
+from apps.openbanking.tokens import TokenStore
 
 logger = logging.getLogger(__name__)
 
 FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
-SESSION: Optional[Session] = None
+HTTP_SERVICE = "openbanking"
 
-TOKEN_CACHE_KEY = "openbanking:token"
-TOKEN_LOCK_KEY = "openbanking:token:lock"
+TOKEN_KEY = "openbanking:token"
 TOKEN_LOCK_TIMEOUT = 10
 SANDBOX_TOKEN = "SANDBOX-DEMO-TOKEN"
 
+# circuit breaker name per upstream path
+ENDPOINT_NAMES = {
+    "/v2.0/account/balance": "balance",
+    "/v2.0/account/transaction_list": "transactions",
+}
+
 
 class OpenBankingServiceError(APIException):
     status_code = 502
@@ -50,6 +61,41 @@ class OpenBankingUpstreamError(OpenBankingServiceError):
     default_detail = "OpenBanking upstream unavailable"
 
 
+class OpenBankingCircuitOpenError(OpenBankingServiceError):
+    status_code = 503
+    default_detail = "OpenBanking is temporarily unavailable"
+
+
+def _circuit_open_error(exc: CircuitOpen) -> OpenBankingCircuitOpenError:
+    error = OpenBankingCircuitOpenError()
+    error.wait = max(math.ceil(exc.retry_after), 1)
+    return error
+
+
+def _fail_fast(endpoint: str) -> None:
+    """Refuse before spending rate limit quota when the circuit is open."""
+    remaining = get_breaker(endpoint).open_for()
+    if remaining > 0:
+        raise _circuit_open_error(CircuitOpen(endpoint, remaining))
+
+
+def _guard(endpoint: str) -> CircuitBreaker:
+    breaker = get_breaker(endpoint)
+    try:
+        breaker.before_call()
+    except CircuitOpen as exc:
+        raise _circuit_open_error(exc) from exc
+    return breaker
+
+
+def _record_status(breaker: CircuitBreaker, status_code: int) -> None:
+    # only upstream trouble counts; 4xx means the bank answered fine
+    if status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
 def mask_fintech(fintech_use_num: str) -> str:
     if not fintech_use_num:
         return ""
@@ -68,19 +114,25 @@ def get_config() -> Dict[str, Any]:
     if not token_path.startswith("/"):
         token_path = f"/{token_path}"
 
-    timeout = int(getattr(settings, "OPENBANKING_TIMEOUT", 6) or 6)
-    timeout = max(timeout, 4)
     retries = int(getattr(settings, "OPENBANKING_RETRIES", 2) or 0)
     rate_limit = int(getattr(settings, "OPENBANKING_RL", 5) or 0)
+    global_rate_limit = int(getattr(settings, "OPENBANKING_GLOBAL_RL", 0) or 0)
 
     return {
         "base_url": base_url,
         "token_path": token_path,
         "token_url": f"{base_url}{token_path}",
-        "timeout": timeout,
         "retries": max(retries, 0),
         "rate_limit": max(rate_limit, 0),
+        "global_rate_limit": max(global_rate_limit, 0),
+        "rate_limit_burst": int(getattr(settings, "OPENBANKING_RL_BURST", 0) or 0),
+        "rate_limit_wait": float(getattr(settings, "OPENBANKING_RL_MAX_WAIT", 0) or 0),
         "sandbox": getattr(settings, "OPENBANKING_SANDBOX", True),
+        "synthetic": getattr(settings, "OPENBANKING_SANDBOX_SYNTHETIC", False),
+        "synthetic_seed": int(getattr(settings, "OPENBANKING_SANDBOX_SEED", 0) or 0),
+        "synthetic_per_day": int(
+            getattr(settings, "OPENBANKING_SANDBOX_TX_PER_DAY", 20) or 0
+        ),
         "scope": getattr(settings, "OPENBANKING_SCOPE", "oob") or "oob",
         "client_id": getattr(settings, "OPENBANKING_CLIENT_ID", ""),
         "client_secret": getattr(settings, "OPENBANKING_CLIENT_SECRET", ""),
@@ -88,7 +140,8 @@ def get_config() -> Dict[str, Any]:
     }
 
 
-def _load_fixture(name: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=None)
+def _read_fixture(name: str) -> Dict[str, Any]:
     fixture_path = FIXTURE_DIR / name
     if not fixture_path.exists():
         raise OpenBankingServiceError(f"Fixture {name} is missing for sandbox mode")
@@ -96,43 +149,49 @@ def _load_fixture(name: str) -> Dict[str, Any]:
         return json.load(fp)
 
 
-def _enforce_rate_limit(fintech_use_num: str, limit: int) -> None:
-    if limit <= 0:
-        return
-    bucket_key = f"openbanking:rl:{fintech_use_num}:{int(time.time())}"
-    added = cache.add(bucket_key, 1, timeout=1)
-    if added:
+def _load_fixture(name: str) -> Dict[str, Any]:
+    # parsed once per process; callers get their own copy to modify
+    return copy.deepcopy(_read_fixture(name))
+
+
+def _enforce_rate_limit(fintech_use_num: str, config: Dict[str, Any]) -> None:
+    """
+    Charge one call against the per-fintech and global upstream quotas.
+
+    Quotas are shared by every worker (see apps/openbanking/ratelimit.py).
+    Callers wait up to OPENBANKING_RL_MAX_WAIT seconds for a slot before the
+    request is refused with 429.
+    """
+    limit = config["rate_limit"]
+    global_limit = config["global_rate_limit"]
+    quotas = []
+    if limit > 0:
+        quotas.append(
+            Quota(
+                f"fintech:{fintech_use_num}",
+                rate=limit,
+                burst=config["rate_limit_burst"] or limit,
+            )
+        )
+    if global_limit > 0:
+        quotas.append(
+            Quota(
+                "global",
+                rate=global_limit,
+                burst=config["rate_limit_burst"] or global_limit,
+            )
+        )
+    if not quotas:
         return
-    try:
-        current = cache.incr(bucket_key)
-    except ValueError:
-        cache.set(bucket_key, 1, timeout=1)
-        current = 1
-    if current > limit:
+    wait = get_rate_limiter().acquire(quotas, max_wait=config["rate_limit_wait"])
+    if wait > 0:
         logger.warning(
             "OpenBanking rate limit exceeded for %s", mask_fintech(fintech_use_num)
         )
-        raise OpenBankingRateLimitError(OpenBankingRateLimitError.default_detail)
-
-
-def _build_session(retries: int) -> Session:
-    global SESSION
-    if SESSION is not None:
-        return SESSION
-
-    retry_strategy = Retry(
-        total=retries,
-        backoff_factor=0.3,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET", "POST"),
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session = Session()
-    session.headers.update({"User-Agent": "DOODOOK-OpenBanking-Demo/1.0"})
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    SESSION = session
-    return SESSION
+        exc = OpenBankingRateLimitError(OpenBankingRateLimitError.default_detail)
+        # DRF turns ``wait`` into a Retry-After header
+        exc.wait = math.ceil(wait)
+        raise exc
 
 
 def _issue_access_token(config: Dict[str, Any]) -> Tuple[str, int]:
@@ -141,7 +200,6 @@ def _issue_access_token(config: Dict[str, Any]) -> Tuple[str, int]:
     if not client_id or not client_secret:
         raise OpenBankingServiceError("OPENBANKING_CLIENT_ID/SECRET are not configured")
 
-    session = _build_session(config["retries"])
     data = {
         "grant_type": "client_credentials",
         "scope": config.get("scope", "oob"),
@@ -153,19 +211,23 @@ def _issue_access_token(config: Dict[str, Any]) -> Tuple[str, int]:
         "Accept": "application/json",
     }
 
+    breaker = _guard("token")
     try:
-        response = session.post(
+        response = http_client.post(
+            HTTP_SERVICE,
             config["token_url"],
             data=data,
             headers=headers,
-            timeout=(2, config["timeout"]),
         )
     except requests.Timeout as exc:
+        breaker.record_failure()
         logger.warning("OpenBanking token request timeout")
         raise OpenBankingTimeoutError() from exc
     except requests.RequestException as exc:
+        breaker.record_failure()
         logger.exception("OpenBanking token request error: %s", exc)
         raise OpenBankingServiceError(str(exc)) from exc
+    _record_status(breaker, response.status_code)
 
     if response.status_code == 401:
         raise OpenBankingUnauthorizedError(
@@ -203,6 +265,30 @@ def _issue_access_token(config: Dict[str, Any]) -> Tuple[str, int]:
     return token, expires_in
 
 
+_token_store: Optional[TokenStore] = None
+
+
+def get_token_store() -> TokenStore:
+    global _token_store
+    if _token_store is None:
+        _token_store = TokenStore(
+            TOKEN_KEY,
+            refresh_ahead=float(
+                getattr(settings, "OPENBANKING_TOKEN_REFRESH_AHEAD", 0.75) or 0.75
+            ),
+            lock_timeout=TOKEN_LOCK_TIMEOUT,
+            cold_start_wait=float(
+                getattr(settings, "OPENBANKING_TOKEN_COLD_START_WAIT", 1.0)
+            ),
+        )
+    return _token_store
+
+
+def reset_token_state() -> None:
+    if _token_store is not None:
+        _token_store.reset()
+
+
 def get_access_token(force_refresh: bool = False) -> str:
     config = get_config()
 
@@ -214,39 +300,17 @@ def get_access_token(force_refresh: bool = False) -> str:
     if debug_token and not force_refresh:
         return debug_token
 
-    if not force_refresh:
-        cached = cache.get(TOKEN_CACHE_KEY)
-        if cached:
-            return cached
-
-    attempts = 0
-    acquired = False
-    while attempts < 3:
-        acquired = cache.add(TOKEN_LOCK_KEY, 1, timeout=TOKEN_LOCK_TIMEOUT)
-        if acquired:
-            break
-        time.sleep(0.3)
-        token = cache.get(TOKEN_CACHE_KEY)
-        if token:
-            return token
-        attempts += 1
-
-    if not acquired:
-        raise OpenBankingServiceError("Unable to acquire OpenBanking token lock")
+    return get_token_store().get(
+        lambda: _issue_access_token(config), force_refresh=force_refresh
+    )
 
-    try:
-        if not force_refresh:
-            cached = cache.get(TOKEN_CACHE_KEY)
-            if cached:
-                return cached
 
-        token, expires_in = _issue_access_token(config)
-        ttl = max(expires_in - 60, 60)
-        cache.set(TOKEN_CACHE_KEY, token, timeout=ttl)
-        logger.info("Issued OpenBanking access token (ttl=%s)", ttl)
-        return token
-    finally:
-        cache.delete(TOKEN_LOCK_KEY)
+def refresh_access_token_if_due() -> Optional[str]:
+    """Renew the shared token when missing or past refresh-ahead (None if not used)."""
+    config = get_config()
+    if config["sandbox"] or config.get("debug_token"):
+        return None
+    return get_token_store().refresh_if_due(lambda: _issue_access_token(config)).value
 
 
 def _headers(token: str) -> Dict[str, str]:
@@ -266,28 +330,31 @@ def get_headers(token: Optional[str] = None) -> Dict[str, str]:
 
 
 def _http(path: str, params: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
-    session = _build_session(config["retries"])
     token = get_access_token()
     url = f"{config['base_url']}{path}"
+    breaker = _guard(ENDPOINT_NAMES.get(path, path))
     try:
-        response = session.get(
+        response = http_client.get(
+            HTTP_SERVICE,
             url,
             headers=_headers(token),
             params=params,
-            timeout=(2, config["timeout"]),
         )
     except requests.Timeout as exc:
+        breaker.record_failure()
         logger.warning(
             "OpenBanking timeout fintech=%s",
             mask_fintech(params.get("fintech_use_num", "")),
         )
         raise OpenBankingTimeoutError() from exc
     except requests.RequestException as exc:
+        breaker.record_failure()
         logger.exception(
             "OpenBanking request error fintech=%s",
             mask_fintech(params.get("fintech_use_num", "")),
         )
         raise OpenBankingServiceError(str(exc)) from exc
+    _record_status(breaker, response.status_code)
 
     if response.status_code == 401:
         raise OpenBankingUnauthorizedError(
@@ -326,6 +393,16 @@ def _normalize_balance(fintech_use_num: str, data: Dict[str, Any]) -> Dict[str,
     }
 
 
+def _fallback_tran_id(item: Dict[str, Any]) -> str:
+    # stable across fetches so stored rows deduplicate; same content -> same id
+    digest = hashlib.sha1(
+        json.dumps(item, sort_keys=True, ensure_ascii=False, default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    return f"h{digest[:31]}"
+
+
 def _normalize_transaction_items(
     items: Iterable[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
@@ -336,10 +413,11 @@ def _normalize_transaction_items(
             item.get("tran_id")
             or item.get("tranId")
             or item.get("bank_tran_id")
-            or uuid.uuid4().hex
+            or _fallback_tran_id(item)
         )
         normalized = {
             "tran_id": tran_id,
+            "date": item.get("date") or item.get("tran_date"),
             "time": item.get("time") or item.get("tran_time") or item.get("tranDtime"),
             "summary": item.get("summary")
             or item.get("description")
@@ -384,13 +462,91 @@ def _normalize_transactions(
     }
 
 
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    try:
+        return copy.copy(error)
+    except Exception:
+        # constructors with other signatures than their args cannot be
+        # rebuilt; the shared object is still better than losing the error
+        return error
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get a deep copy of its result (or a copy
+    of its exception, chained to the original). Nothing is remembered once
+    the call returns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                # raising one object from many threads would race on its
+                # __traceback__/__context__, so each waiter gets its own
+                raise _copy_error(flight.error) from flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            # no one can join once the flight is unlisted, so waiters is final
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        # waiters copy the stored result; the leader's caller gets its own
+        return copy.deepcopy(flight.result) if flight.waiters else flight.result
+
+
+_flight = SingleFlight()
+
+
+def _coalesce(key: Tuple, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    if not getattr(settings, "OPENBANKING_SINGLE_FLIGHT", True):
+        return fn()
+    return _flight.do(key, fn)
+
+
 def fetch_balance(fintech_use_num: str) -> Dict[str, Any]:
     fintech = fintech_use_num.strip()
     if not fintech:
         raise OpenBankingServiceError("fintech_use_num is required for balance lookup")
+    return _coalesce(("balance", fintech), lambda: _fetch_balance(fintech))
+
 
+def _fetch_balance(fintech: str) -> Dict[str, Any]:
     config = get_config()
-    _enforce_rate_limit(fintech, config["rate_limit"])
+    if not config["sandbox"]:
+        _fail_fast("balance")
+    _enforce_rate_limit(fintech, config)
     logger.info(
         "OpenBanking balance fintech=%s sandbox=%s",
         mask_fintech(fintech),
@@ -399,6 +555,10 @@ def fetch_balance(fintech_use_num: str) -> Dict[str, Any]:
 
     if config["sandbox"]:
         stub = _load_fixture("demo_balance.json")
+        if config["synthetic"]:
+            stub["balance_amt"] = str(
+                synthetic.balance(fintech, seed=config["synthetic_seed"])
+            )
         stub.setdefault("balance_amt", stub.get("balance"))
         return _normalize_balance(fintech, stub)
 
@@ -423,15 +583,53 @@ def fetch_transactions(
         raise OpenBankingServiceError(
             "fintech_use_num is required for transaction lookup"
         )
+    return _coalesce(
+        ("transactions", fintech, from_date, to_date, sort, page, size),
+        lambda: _fetch_transactions(
+            fintech, from_date, to_date, sort=sort, page=page, size=size
+        ),
+    )
+
 
+def _fetch_transactions(
+    fintech: str,
+    from_date: str,
+    to_date: str,
+    *,
+    sort: str,
+    page: int,
+    size: int,
+) -> Dict[str, Any]:
     config = get_config()
-    _enforce_rate_limit(fintech, config["rate_limit"])
+    if not config["sandbox"]:
+        _fail_fast("transactions")
+    _enforce_rate_limit(fintech, config)
     logger.info(
         "OpenBanking transactions fintech=%s sandbox=%s",
         mask_fintech(fintech),
         config["sandbox"],
     )
 
+    if config["sandbox"] and config["synthetic"]:
+        items, has_more = synthetic.transaction_page(
+            fintech,
+            from_date,
+            to_date,
+            page=page,
+            size=size,
+            seed=config["synthetic_seed"],
+            per_day=config["synthetic_per_day"],
+        )
+        return _normalize_transactions(
+            fintech,
+            {"list": items, "next_page_yn": "Y" if has_more else "N"},
+            from_date=from_date,
+            to_date=to_date,
+            sort=sort,
+            page=page,
+            size=size,
+        )
+
     if config["sandbox"]:
         stub = _load_fixture("demo_transactions.json")
         stub_list = stub.get("list", [])
@@ -445,7 +643,9 @@ def fetch_transactions(
             if from_date <= date_part <= to_date:
                 filtered.append(item)
         stub_copy = dict(stub)
-        stub_copy["list"] = filtered
+        start = (page - 1) * size
+        stub_copy["list"] = filtered[start : start + size]
+        stub_copy["next_page_yn"] = "Y" if len(filtered) > start + size else "N"
         return _normalize_transactions(
             fintech,
             stub_copy,
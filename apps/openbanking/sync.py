@@ -0,0 +1,273 @@
+"""
+OpenBanking transaction sync.
+
+Each account keeps a watermark range [synced_from, synced_through] of days
+whose transactions are fully stored in BankTransaction. A sync walks every
+upstream page from just before the watermark up to today and upserts rows on
+(account, tran_id), so re-fetching an overlap is harmless.
+"""
+import datetime
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.openbanking.models import BankTransaction, OpenBankingAccount
+from apps.openbanking.services import (
+    OpenBankingRateLimitError,
+    OpenBankingServiceError,
+    fetch_transactions,
+    mask_fintech,
+)
+
+logger = logging.getLogger(__name__)
+
+# upstream lookups are limited to 93 days per request
+MAX_WINDOW_DAYS = 90
+MAX_PAGES_PER_WINDOW = 1000
+RATE_LIMIT_RETRIES = 5
+
+
+@dataclass
+class SyncResult:
+    account_id: int
+    from_date: Optional[datetime.date] = None
+    to_date: Optional[datetime.date] = None
+    pages: int = 0
+    fetched: int = 0
+    created: int = 0
+    error: str = ""
+    windows: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def _setting(name: str, default: int) -> int:
+    return int(getattr(settings, name, default))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(str(value).replace(",", "").split(".")[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_when(item: Dict[str, Any]):
+    """Return (date, datetime) for both ISO ``time`` and yyyymmdd/hhmmss pairs."""
+    raw_date = str(item.get("date") or "").strip()
+    raw_time = str(item.get("time") or "").strip()
+    tran_at = parse_datetime(raw_time) if "T" in raw_time or "-" in raw_time else None
+    if tran_at is None and len(raw_date) == 8 and raw_date.isdigit():
+        clock = raw_time if len(raw_time) == 6 and raw_time.isdigit() else "000000"
+        try:
+            tran_at = datetime.datetime.strptime(raw_date + clock, "%Y%m%d%H%M%S")
+        except ValueError:
+            tran_at = None
+    if tran_at is not None:
+        if settings.USE_TZ and timezone.is_naive(tran_at):
+            tran_at = timezone.make_aware(tran_at)
+        local = timezone.localtime(tran_at) if timezone.is_aware(tran_at) else tran_at
+        return local.date(), tran_at
+    try:
+        return datetime.date.fromisoformat(raw_date), None
+    except ValueError:
+        return None, None
+
+
+def store_transactions(
+    account: OpenBankingAccount, items: Iterable[Dict[str, Any]]
+) -> int:
+    """Upsert normalized transaction items; returns how many rows were new."""
+    rows = []
+    for item in items:
+        tran_date, tran_at = _parse_when(item)
+        if tran_date is None or not item.get("tran_id"):
+            continue
+        rows.append(
+            BankTransaction(
+                account=account,
+                tran_id=str(item["tran_id"])[:64],
+                tran_date=tran_date,
+                tran_at=tran_at,
+                summary=(item.get("summary") or "")[:255],
+                amount=_to_int(item.get("amount")),
+                balance=_to_int(item.get("balance")),
+                inout=(item.get("inout") or "")[:16],
+            )
+        )
+    if not rows:
+        return 0
+    existing = set(
+        BankTransaction.objects.filter(
+            account=account, tran_id__in=[row.tran_id for row in rows]
+        ).values_list("tran_id", flat=True)
+    )
+    BankTransaction.objects.bulk_create(rows, ignore_conflicts=True)
+    return len({row.tran_id for row in rows} - existing)
+
+
+def _fetch_page(account: OpenBankingAccount, from_date, to_date, page: int, size: int):
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return fetch_transactions(
+                account.fintech_use_num,
+                from_date.isoformat(),
+                to_date.isoformat(),
+                sort="time",
+                page=page,
+                size=size,
+            )
+        except OpenBankingRateLimitError as exc:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            # stay inside the shared quota instead of failing the whole sync
+            time.sleep(max(getattr(exc, "wait", 1) or 1, 0.1))
+    return None  # pragma: no cover
+
+
+def _windows(from_date: datetime.date, to_date: datetime.date):
+    start = from_date
+    while start <= to_date:
+        end = min(start + datetime.timedelta(days=MAX_WINDOW_DAYS - 1), to_date)
+        yield start, end
+        start = end + datetime.timedelta(days=1)
+
+
+def sync_account(
+    account: OpenBankingAccount,
+    *,
+    until: Optional[datetime.date] = None,
+    full: bool = False,
+    page_size: Optional[int] = None,
+) -> SyncResult:
+    today = timezone.localdate()
+    to_date = min(until or today, today)
+    overlap = datetime.timedelta(days=_setting("OPENBANKING_SYNC_OVERLAP_DAYS", 1))
+    if account.synced_through and not full:
+        from_date = account.synced_through - overlap
+    else:
+        from_date = to_date - datetime.timedelta(
+            days=_setting("OPENBANKING_SYNC_INITIAL_DAYS", 90)
+        )
+    size = page_size or _setting("OPENBANKING_SYNC_PAGE_SIZE", 100)
+    result = SyncResult(account_id=account.id, from_date=from_date, to_date=to_date)
+
+    try:
+        for window_from, window_to in _windows(from_date, to_date):
+            result.windows.append(
+                {"from": window_from.isoformat(), "to": window_to.isoformat()}
+            )
+            for page in range(1, MAX_PAGES_PER_WINDOW + 1):
+                payload = _fetch_page(account, window_from, window_to, page, size)
+                items = payload.get("list") or []
+                result.pages += 1
+                result.fetched += len(items)
+                with transaction.atomic():
+                    result.created += store_transactions(account, items)
+                raw = payload.get("raw") or {}
+                if len(items) < size or raw.get("next_page_yn") == "N":
+                    break
+    except OpenBankingServiceError as exc:
+        result.error = str(getattr(exc, "detail", exc))
+        logger.warning(
+            "OpenBanking sync failed fintech=%s: %s",
+            mask_fintech(account.fintech_use_num),
+            result.error,
+        )
+        account.sync_error = result.error[:1000]
+        account.save(update_fields=["sync_error", "updated_at"])
+        return result
+
+    # today can still receive postings, so the watermark stops at yesterday
+    watermark = min(to_date, today - datetime.timedelta(days=1))
+    if account.synced_from is None or full:
+        account.synced_from = from_date
+    else:
+        account.synced_from = min(account.synced_from, from_date)
+    if account.synced_through and not full:
+        watermark = max(account.synced_through, watermark)
+    account.synced_through = watermark
+    account.last_synced_at = timezone.now()
+    account.sync_error = ""
+    account.save(
+        update_fields=[
+            "synced_from",
+            "synced_through",
+            "last_synced_at",
+            "sync_error",
+            "updated_at",
+        ]
+    )
+    return result
+
+
+def sync_all_accounts(queryset=None, **kwargs) -> List[SyncResult]:
+    if queryset is None:
+        queryset = OpenBankingAccount.objects.all()
+    return [
+        sync_account(account, **kwargs)
+        for account in queryset.filter(enabled=True).order_by("id")
+    ]
+
+
+def is_range_synced(
+    account: Optional[OpenBankingAccount],
+    from_date: datetime.date,
+    to_date: datetime.date,
+) -> bool:
+    if account is None or not account.synced_from or not account.synced_through:
+        return False
+    return account.synced_from <= from_date and to_date <= account.synced_through
+
+
+def local_transactions(
+    account: OpenBankingAccount,
+    from_date: str,
+    to_date: str,
+    *,
+    sort: str = "time",
+    page: int = 1,
+    size: int = 100,
+) -> Dict[str, Any]:
+    """Same payload shape as fetch_transactions, served from BankTransaction."""
+    queryset = BankTransaction.objects.filter(
+        account=account, tran_date__range=(from_date, to_date)
+    )
+    if sort == "amount":
+        queryset = queryset.order_by("amount", "tran_date", "id")
+    else:
+        queryset = queryset.order_by("tran_date", "tran_at", "id")
+    start = (page - 1) * size
+    rows = list(queryset[start : start + size])
+    return {
+        "fintech_use_num": account.fintech_use_num,
+        "list": [
+            {
+                "tran_id": row.tran_id,
+                "date": row.tran_date.isoformat(),
+                "time": (
+                    timezone.localtime(row.tran_at).isoformat() if row.tran_at else None
+                ),
+                "summary": row.summary,
+                "amount": row.amount,
+                "balance": row.balance,
+                "inout": row.inout,
+            }
+            for row in rows
+        ],
+        "range": {"from": from_date, "to": to_date},
+        "sort": sort,
+        "page": page,
+        "size": size,
+        "raw": None,
+    }
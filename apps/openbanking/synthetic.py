@@ -0,0 +1,125 @@
+"""
+Deterministic synthetic transaction histories for sandbox mode.
+
+Every (seed, fintech_use_num, day) pair has its own random stream, so any
+day can be generated on its own and the same request always returns the
+same rows. A page is produced by counting rows per day (cheap) to find
+where the page starts and generating only the days it covers, so even very
+large histories are never built in full.
+
+Balances are a plausible running figure within each day, starting from a
+per-day opening balance; they are not carried over exactly between days.
+"""
+import datetime
+import hashlib
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+DEBIT_MERCHANTS = (
+    ("GS25", 1_200, 15_000),
+    ("CU", 1_000, 12_000),
+    ("스타벅스", 4_500, 25_000),
+    ("이마트", 8_000, 180_000),
+    ("배달의민족", 12_000, 60_000),
+    ("카카오택시", 4_800, 40_000),
+    ("올리브영", 6_000, 70_000),
+    ("쿠팡", 9_000, 250_000),
+    ("교보문고", 12_000, 80_000),
+    ("대관료", 50_000, 300_000),
+)
+CREDIT_SOURCES = (
+    ("회비 입금", 10_000, 50_000),
+    ("이자", 10, 3_000),
+    ("후원금", 30_000, 500_000),
+)
+CREDIT_SHARE = 0.15
+
+
+def _rng(seed: int, fintech_use_num: str, *parts: Any) -> random.Random:
+    key = ":".join(str(part) for part in (seed, fintech_use_num) + parts)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+def day_count(seed: int, fintech_use_num: str, day: datetime.date, per_day: int) -> int:
+    """Rows on ``day``; varies around ``per_day`` and is lighter on weekends."""
+    if per_day <= 0:
+        return 0
+    rng = _rng(seed, fintech_use_num, day.isoformat(), "count")
+    base = per_day * (0.6 if day.weekday() >= 5 else 1.1)
+    return max(int(rng.gauss(base, base / 3)), 0)
+
+
+def day_rows(
+    seed: int, fintech_use_num: str, day: datetime.date, per_day: int
+) -> List[Dict[str, Any]]:
+    count = day_count(seed, fintech_use_num, day, per_day)
+    if not count:
+        return []
+    rng = _rng(seed, fintech_use_num, day.isoformat(), "rows")
+    seconds = sorted(rng.randrange(6 * 3600, 24 * 3600) for _ in range(count))
+    balance = _rng(seed, fintech_use_num, day.isoformat(), "open").randrange(
+        500_000, 5_000_000
+    )
+    rows = []
+    for index, second in enumerate(seconds):
+        credit = rng.random() < CREDIT_SHARE
+        name, low, high = rng.choice(CREDIT_SOURCES if credit else DEBIT_MERCHANTS)
+        amount = rng.randrange(low, high) // 100 * 100 or low
+        balance += amount if credit else -amount
+        when = datetime.datetime.combine(day, datetime.time()) + datetime.timedelta(
+            seconds=second
+        )
+        rows.append(
+            {
+                "tran_id": f"S{fintech_use_num[-6:]}{day:%Y%m%d}{index:05d}",
+                "time": when.isoformat(),
+                "summary": name,
+                "amount": str(amount),
+                "balance": str(balance),
+                "inout": "C" if credit else "D",
+            }
+        )
+    return rows
+
+
+def _days(from_date: datetime.date, to_date: datetime.date) -> Iterator[datetime.date]:
+    day = from_date
+    while day <= to_date:
+        yield day
+        day += datetime.timedelta(days=1)
+
+
+def transaction_page(
+    fintech_use_num: str,
+    from_date: str,
+    to_date: str,
+    *,
+    page: int,
+    size: int,
+    seed: int = 0,
+    per_day: int = 20,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """One page of the range, plus whether more rows follow it."""
+    start = datetime.date.fromisoformat(from_date)
+    end = datetime.date.fromisoformat(to_date)
+    skip = (max(page, 1) - 1) * size
+    rows: List[Dict[str, Any]] = []
+    days = _days(start, end)
+    for day in days:
+        count = day_count(seed, fintech_use_num, day, per_day)
+        if skip >= count:
+            skip -= count
+            continue
+        rows.extend(day_rows(seed, fintech_use_num, day, per_day)[skip:])
+        skip = 0
+        if len(rows) >= size:
+            break
+    has_more = len(rows) > size or any(
+        day_count(seed, fintech_use_num, day, per_day) for day in days
+    )
+    return rows[:size], has_more
+
+
+def balance(fintech_use_num: str, *, seed: int = 0) -> int:
+    return _rng(seed, fintech_use_num, "balance").randrange(100_000, 20_000_000)
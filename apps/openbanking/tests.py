@@ -0,0 +1,847 @@
+import datetime
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache as django_cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from apps.common.models import Transaction
+
+from apps.groups.models import Group, GroupMembership
+from apps.openbanking import balances
+from apps.openbanking import cache as response_cache
+from apps.openbanking import sync
+from apps.openbanking.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+)
+from apps.openbanking.models import (
+    BankLedgerMatch,
+    BankTransaction,
+    OpenBankingAccount,
+    OpenBankingCircuit,
+    OpenBankingRateLimit,
+    OpenBankingToken,
+)
+from apps.openbanking.ratelimit import (
+    DatabaseGcraStore,
+    Quota,
+    RateLimiter,
+    gcra_check,
+)
+from apps.openbanking.reconcile import find_matches, reconcile_group
+from apps.openbanking.serializers import BankLedgerMatchSerializer
+from apps.openbanking.services import OpenBankingServiceError, SingleFlight
+from apps.openbanking.tokens import TokenStore
+
+
+class GcraCheckTests(SimpleTestCase):
+    def test_quota_intervals(self):
+        quota = Quota("k", rate=4, burst=3)
+
+        self.assertEqual(quota.emission_interval, 0.25)
+        self.assertEqual(quota.tolerance, 0.5)
+
+    def test_conforms_when_tat_is_in_the_past(self):
+        self.assertEqual(gcra_check(tat=90.0, quota=Quota("k", rate=1), now=100.0), 0)
+
+    def test_burst_allows_tat_up_to_tolerance_ahead(self):
+        quota = Quota("k", rate=1, burst=3)  # tolerance 2s
+
+        self.assertEqual(gcra_check(tat=102.0, quota=quota, now=100.0), 0)
+        self.assertAlmostEqual(gcra_check(tat=102.5, quota=quota, now=100.0), 0.5)
+
+    def test_without_burst_one_interval_apart(self):
+        quota = Quota("k", rate=2)
+
+        self.assertAlmostEqual(gcra_check(tat=100.5, quota=quota, now=100.0), 0.5)
+
+
+class DatabaseGcraStoreTests(TestCase):
+    def test_burst_then_wait(self):
+        store = DatabaseGcraStore()
+        quota = Quota("fintech:1", rate=1, burst=2)
+
+        self.assertEqual(store.acquire([quota], now=100.0), 0)
+        self.assertEqual(store.acquire([quota], now=100.0), 0)
+        self.assertAlmostEqual(store.acquire([quota], now=100.0), 1.0)
+        self.assertEqual(store.acquire([quota], now=101.0), 0)
+
+    def test_nothing_is_charged_when_one_quota_refuses(self):
+        store = DatabaseGcraStore()
+        per_fintech = Quota("fintech:1", rate=10)
+        upstream = Quota("global", rate=1)
+        store.acquire([upstream], now=100.0)
+
+        wait = store.acquire([per_fintech, upstream], now=100.0)
+
+        self.assertAlmostEqual(wait, 1.0)
+        self.assertEqual(OpenBankingRateLimit.objects.get(key="fintech:1").tat, 0.0)
+
+
+class FakeStore:
+    def __init__(self, waits):
+        self.waits = list(waits)
+
+    def acquire(self, quotas):
+        return self.waits.pop(0)
+
+
+class RateLimiterTests(SimpleTestCase):
+    def _limiter(self, waits):
+        self.clock = 0.0
+        self.slept = []
+
+        def sleep(seconds):
+            self.slept.append(seconds)
+            self.clock += seconds
+
+        return RateLimiter(FakeStore(waits), sleep=sleep, clock=lambda: self.clock)
+
+    def test_waits_within_max_wait(self):
+        limiter = self._limiter([0.3, 0.0])
+
+        self.assertEqual(limiter.acquire([Quota("k", rate=1)], max_wait=1.0), 0)
+        self.assertEqual(self.slept, [0.3])
+
+    def test_returns_retry_after_beyond_max_wait(self):
+        limiter = self._limiter([2.0])
+
+        self.assertEqual(limiter.acquire([Quota("k", rate=1)], max_wait=1.0), 2.0)
+        self.assertEqual(self.slept, [])
+
+
+def _make_account(**kwargs) -> OpenBankingAccount:
+    user = get_user_model().objects.create_user(
+        username="owner", email="owner@example.com", password="pw"
+    )
+    group = Group.objects.create(name="g", owner=user)
+    return OpenBankingAccount.objects.create(
+        group=group, alias="main", fintech_use_num="199999999999999999999999", **kwargs
+    )
+
+
+class SyncHelpersTests(SimpleTestCase):
+    def test_windows_cover_the_range_without_gaps(self):
+        start = datetime.date(2024, 1, 1)
+        end = datetime.date(2024, 7, 1)
+
+        windows = list(sync._windows(start, end))
+
+        self.assertEqual(windows[0][0], start)
+        self.assertEqual(windows[-1][1], end)
+        for (_, left_end), (right_start, _) in zip(windows, windows[1:]):
+            self.assertEqual(right_start, left_end + datetime.timedelta(days=1))
+        for window_from, window_to in windows:
+            self.assertLess((window_to - window_from).days, sync.MAX_WINDOW_DAYS)
+
+    def test_parse_when_accepts_compact_and_iso_forms(self):
+        compact_date, compact_at = sync._parse_when(
+            {"date": "20240105", "time": "093000"}
+        )
+        iso_date, iso_at = sync._parse_when({"time": "2024-01-05T09:30:00+09:00"})
+        date_only, no_time = sync._parse_when({"date": "2024-01-05"})
+
+        self.assertEqual(compact_date, datetime.date(2024, 1, 5))
+        self.assertIsNotNone(compact_at)
+        self.assertEqual(iso_date, datetime.date(2024, 1, 5))
+        self.assertIsNotNone(iso_at)
+        self.assertEqual((date_only, no_time), (datetime.date(2024, 1, 5), None))
+
+
+def _page(items, more=False):
+    return {"list": items, "raw": {"next_page_yn": "Y" if more else "N"}}
+
+
+def _item(tran_id, day="20240105"):
+    return {"tran_id": tran_id, "date": day, "time": "120000", "amount": "1,000"}
+
+
+@override_settings(OPENBANKING_SYNC_OVERLAP_DAYS=1, OPENBANKING_SYNC_INITIAL_DAYS=10)
+class SyncAccountTests(TestCase):
+    def setUp(self):
+        self.account = _make_account()
+
+    def test_store_transactions_is_idempotent(self):
+        items = [_item("T1"), _item("T2")]
+
+        self.assertEqual(sync.store_transactions(self.account, items), 2)
+        self.assertEqual(
+            sync.store_transactions(self.account, items + [_item("T3")]), 1
+        )
+        self.assertEqual(BankTransaction.objects.count(), 3)
+        self.assertEqual(BankTransaction.objects.get(tran_id="T1").amount, 1000)
+
+    def test_watermark_stops_at_yesterday_and_next_sync_overlaps(self):
+        today = timezone.localdate()
+        with mock.patch.object(
+            sync, "fetch_transactions", return_value=_page([_item("T1")])
+        ) as fetch:
+            result = sync.sync_account(self.account)
+
+        self.assertTrue(result.ok)
+        self.account.refresh_from_db()
+        self.assertEqual(
+            self.account.synced_through, today - datetime.timedelta(days=1)
+        )
+        self.assertEqual(self.account.synced_from, today - datetime.timedelta(days=10))
+        self.assertEqual(fetch.call_count, 1)
+
+        with mock.patch.object(
+            sync, "fetch_transactions", return_value=_page([])
+        ) as fetch:
+            sync.sync_account(self.account)
+
+        from_date = fetch.call_args.args[1]
+        self.assertEqual(from_date, (today - datetime.timedelta(days=2)).isoformat())
+
+    def test_failure_keeps_the_watermark(self):
+        self.account.synced_through = datetime.date(2024, 1, 1)
+        self.account.save()
+
+        with mock.patch.object(
+            sync,
+            "fetch_transactions",
+            side_effect=OpenBankingServiceError(),
+        ):
+            result = sync.sync_account(self.account)
+
+        self.assertFalse(result.ok)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.synced_through, datetime.date(2024, 1, 1))
+        self.assertTrue(self.account.sync_error)
+
+    def test_is_range_synced(self):
+        self.account.synced_from = datetime.date(2024, 1, 1)
+        self.account.synced_through = datetime.date(2024, 1, 31)
+
+        self.assertTrue(
+            sync.is_range_synced(
+                self.account, datetime.date(2024, 1, 5), datetime.date(2024, 1, 31)
+            )
+        )
+        self.assertFalse(
+            sync.is_range_synced(
+                self.account, datetime.date(2024, 1, 5), datetime.date(2024, 2, 1)
+            )
+        )
+
+
+def _bank(id, day, amount=1000, inout="출금", summary="스타벅스"):
+    return {
+        "id": id,
+        "tran_date": datetime.date(2024, 1, day),
+        "amount": amount,
+        "inout": inout,
+        "summary": summary,
+    }
+
+
+def _ledger(id, day, amount=1000, type="expense", description="스타벅스"):
+    return {
+        "id": id,
+        "date": datetime.date(2024, 1, day),
+        "amount": amount,
+        "type": type,
+        "description": description,
+    }
+
+
+class FindMatchesTests(SimpleTestCase):
+    def _match(self, bank, ledger, window=3, min_score=0.5):
+        return find_matches(bank, ledger, window=window, min_score=min_score)
+
+    def test_pairs_same_direction_and_amount_within_window(self):
+        links = self._match([_bank(1, 10)], [_ledger(7, 12)])
+
+        self.assertEqual([(b, t, delta) for b, t, _, delta in links], [(1, 7, 2)])
+
+    def test_rejects_other_amount_direction_or_out_of_window(self):
+        ledger = [
+            _ledger(1, 10, amount=999),
+            _ledger(2, 10, type="income"),
+            _ledger(3, 20),
+        ]
+
+        self.assertEqual(self._match([_bank(1, 10)], ledger), [])
+
+    def test_unknown_direction_matches_either_type(self):
+        links = self._match([_bank(1, 10, inout="?")], [_ledger(5, 10, type="income")])
+
+        self.assertEqual([(b, t) for b, t, _, _ in links], [(1, 5)])
+
+    def test_each_row_is_used_once_closest_date_first(self):
+        bank = [_bank(1, 10), _bank(2, 12)]
+        ledger = [_ledger(10, 10), _ledger(11, 12)]
+
+        links = self._match(bank, ledger)
+
+        self.assertEqual(sorted((b, t) for b, t, _, _ in links), [(1, 10), (2, 11)])
+
+    def test_sort_merge_agrees_with_brute_force(self):
+        bank = [_bank(i, 1 + (i * 7) % 28, amount=1000 * (i % 3)) for i in range(1, 40)]
+        ledger = [
+            _ledger(100 + i, 1 + (i * 5) % 28, amount=1000 * (i % 3))
+            for i in range(1, 40)
+        ]
+        # callers pass date-sorted rows, as the unmatched_* querysets do
+        bank.sort(key=lambda row: (row["tran_date"], row["id"]))
+        ledger.sort(key=lambda row: (row["date"], row["id"]))
+        window = 2
+
+        links = self._match(bank, ledger, window=window, min_score=0)
+
+        ledger_by_id = {row["id"]: row for row in ledger}
+        bank_by_id = {row["id"]: row for row in bank}
+        for bank_id, ledger_id, _, delta in links:
+            self.assertEqual(
+                bank_by_id[bank_id]["amount"], ledger_by_id[ledger_id]["amount"]
+            )
+            self.assertLessEqual(delta, window)
+        # greedy matching is maximal: no unused pair that could still match
+        used_bank = {b for b, _, _, _ in links}
+        used_ledger = {t for _, t, _, _ in links}
+        for b in bank:
+            for t in ledger:
+                if b["id"] in used_bank or t["id"] in used_ledger:
+                    continue
+                self.assertFalse(
+                    b["amount"] == t["amount"]
+                    and abs((b["tran_date"] - t["date"]).days) <= window
+                )
+
+
+class ReconcileGroupTests(TestCase):
+    def setUp(self):
+        self.account = _make_account()
+        self.group = self.account.group
+        self.user = self.group.owner
+
+    def _bank_row(self, tran_id, day):
+        return BankTransaction.objects.create(
+            account=self.account,
+            tran_id=tran_id,
+            tran_date=datetime.date(2024, 1, day),
+            amount=1000,
+            inout="출금",
+            summary="스타벅스",
+        )
+
+    def _ledger_row(self, day):
+        return Transaction.objects.create(
+            group=self.group,
+            user=self.user,
+            amount=1000,
+            description="스타벅스",
+            date=datetime.date(2024, 1, day),
+            type=Transaction.TransactionType.EXPENSE,
+        )
+
+    def test_counts_only_inserted_links(self):
+        first = self._bank_row("A", 10)
+        self._bank_row("B", 20)
+        ledger_a = self._ledger_row(10)
+        self._ledger_row(20)
+        links = find_matches(
+            [_bank(first.id, 10)], [_ledger(ledger_a.id, 10)], window=3, min_score=0
+        )
+        real_find_matches = find_matches
+
+        def find_then_race(*args, **kwargs):
+            result = real_find_matches(*args, **kwargs)
+            # a manual link lands between the read and the insert
+            BankLedgerMatch.objects.create(
+                group=self.group,
+                bank_transaction=first,
+                transaction=ledger_a,
+                method=BankLedgerMatch.Method.MANUAL,
+            )
+            return result
+
+        self.assertEqual(len(links), 1)
+        with mock.patch(
+            "apps.openbanking.reconcile.find_matches", side_effect=find_then_race
+        ):
+            result = reconcile_group(
+                self.group,
+                since=datetime.date(2024, 1, 1),
+                until=datetime.date(2024, 1, 31),
+            )
+
+        self.assertEqual(result.matched, 1)
+        self.assertEqual(result.bank_unmatched, 0)
+        self.assertEqual(result.ledger_unmatched, 0)
+        self.assertEqual(BankLedgerMatch.objects.count(), 2)
+
+    def test_manual_link_race_is_a_validation_error(self):
+        bank = self._bank_row("A", 10)
+        ledger = self._ledger_row(10)
+        serializer = BankLedgerMatchSerializer(
+            data={"bank_transaction_id": bank.id, "transaction_id": ledger.id},
+            context={"group": self.group},
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        BankLedgerMatch.objects.create(
+            group=self.group, bank_transaction=bank, transaction=ledger
+        )
+
+        with self.assertRaises(ValidationError):
+            serializer.save(group=self.group, method=BankLedgerMatch.Method.MANUAL)
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.now = 1_000.0
+        patcher = mock.patch(
+            "apps.openbanking.circuit.time.time", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _breaker(self):
+        # a fresh instance per call stands in for another worker
+        return CircuitBreaker(
+            endpoint="balance", threshold=2, window=60, reset_timeout=30
+        )
+
+    def test_opens_after_threshold_failures_within_window(self):
+        self._breaker().record_failure()
+        self.assertEqual(self._breaker().state()["state"], CLOSED)
+
+        self._breaker().record_failure()
+
+        self.assertEqual(self._breaker().state()["state"], OPEN)
+        with self.assertRaises(CircuitOpen) as ctx:
+            self._breaker().before_call()
+        self.assertEqual(ctx.exception.retry_after, 30)
+
+    def test_failures_outside_window_do_not_add_up(self):
+        self._breaker().record_failure()
+        self.now += 61
+
+        self._breaker().record_failure()
+
+        self.assertEqual(self._breaker().state()["state"], CLOSED)
+        self.assertEqual(self._breaker().state()["failures"], 1)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        self._breaker().record_failure()
+        self._breaker().record_failure()
+        self.now += 31
+
+        self.assertEqual(self._breaker().state()["state"], HALF_OPEN)
+        self._breaker().before_call()
+        with self.assertRaises(CircuitOpen):
+            self._breaker().before_call()
+
+    def test_failed_probe_reopens(self):
+        self._breaker().record_failure()
+        self._breaker().record_failure()
+        self.now += 31
+        self._breaker().before_call()
+
+        self._breaker().record_failure()
+
+        self.assertEqual(self._breaker().state()["state"], OPEN)
+        self.assertAlmostEqual(self._breaker().open_for(), 30)
+
+    def test_success_in_one_worker_closes_it_for_all(self):
+        worker = self._breaker()
+        worker.record_failure()
+        worker.record_failure()
+        self.assertGreater(worker.open_for(), 0)
+
+        self._breaker().record_success()
+
+        self.assertEqual(worker.open_for(), 0)
+        worker.before_call()
+        self.assertEqual(worker.state()["state"], CLOSED)
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker(
+            endpoint="token", threshold=0, window=60, reset_timeout=30
+        )
+        for _ in range(5):
+            breaker.record_failure()
+
+        breaker.before_call()
+        self.assertFalse(OpenBankingCircuit.objects.exists())
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class CapturingExecutor:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+
+
+class TokenStoreTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("apps.openbanking.tokens.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.issued = []
+
+    def _issue(self):
+        self.issued.append(self.clock.now)
+        # 660s from the bank is a 600s lifetime after EXPIRY_MARGIN
+        return f"token-{len(self.issued)}", 660
+
+    def _store(self, **kwargs):
+        # a fresh instance per call stands in for another worker
+        store = TokenStore("test", refresh_ahead=0.75, **kwargs)
+        store._executor = CapturingExecutor()
+        return store
+
+    def test_cold_start_issues_once_for_every_worker(self):
+        self.assertEqual(self._store().get(self._issue), "token-1")
+
+        self.assertEqual(self._store().get(self._issue), "token-1")
+        self.assertEqual(len(self.issued), 1)
+
+    def test_refresh_ahead_keeps_serving_and_renews_in_background(self):
+        store = self._store()
+        store.get(self._issue)
+        self.clock.now += 451
+
+        self.assertEqual(store.get(self._issue), "token-1")
+        self.assertEqual(self._store().get(self._issue), "token-1")
+
+        jobs = store._executor.jobs
+        self.assertEqual(len(jobs), 1)
+        self.assertIsNotNone(OpenBankingToken.objects.get(key="test").lease_until)
+        fn, args = jobs[0]
+        with mock.patch("apps.openbanking.tokens.close_old_connections"):
+            fn(*args)
+        self.assertEqual(self._store().get(self._issue), "token-2")
+        self.assertIsNone(OpenBankingToken.objects.get(key="test").lease_until)
+
+    def _run_jobs(self, store):
+        jobs, store._executor.jobs = store._executor.jobs, []
+        with mock.patch("apps.openbanking.tokens.close_old_connections"):
+            for fn, args in jobs:
+                fn(*args)
+
+    def test_peer_adopts_a_renewed_token_instead_of_issuing(self):
+        worker_a, worker_b = self._store(), self._store()
+        worker_a.get(self._issue)
+        worker_b.get(self._issue)
+        self.clock.now += 451
+
+        worker_a.get(self._issue)
+        self._run_jobs(worker_a)
+        self.assertEqual(len(self.issued), 2)
+
+        self.assertEqual(worker_b.get(self._issue), "token-2")
+        self.assertEqual(worker_b._executor.jobs, [])
+        self.assertEqual(len(self.issued), 2)
+
+    def test_held_lease_skips_the_lease_transaction(self):
+        worker_a, worker_b = self._store(), self._store()
+        worker_a.get(self._issue)
+        worker_b.get(self._issue)
+        self.clock.now += 451
+        worker_a.get(self._issue)
+
+        with mock.patch.object(worker_b, "_acquire_lease") as acquire:
+            self.assertEqual(worker_b.get(self._issue), "token-1")
+        acquire.assert_not_called()
+
+    def test_lease_taken_after_a_peer_renewed_issues_nothing(self):
+        stale = self._store()
+        stale.get(self._issue)
+        self.clock.now += 451
+        # a peer renewed and released the lease between our read and our lease
+        self._store()._store("token-peer", 660)
+
+        stale._schedule_refresh(self._issue)
+
+        self.assertEqual(stale._executor.jobs, [])
+        self.assertEqual(stale.get(self._issue), "token-peer")
+        self.assertIsNone(OpenBankingToken.objects.get(key="test").lease_until)
+
+    def test_not_due_token_schedules_nothing(self):
+        store = self._store()
+        store.get(self._issue)
+        self.clock.now += 300
+
+        store.get(self._issue)
+
+        self.assertEqual(store._executor.jobs, [])
+
+    def test_cold_start_waits_briefly_for_a_peer_then_issues(self):
+        self.assertTrue(self._store()._acquire_lease())
+        start = self.clock.now
+
+        token = self._store(lock_timeout=10, cold_start_wait=0.5).get(self._issue)
+
+        self.assertEqual(token, "token-1")
+        self.assertAlmostEqual(self.issued[0] - start, 0.5)
+
+    def test_refresh_if_due_only_renews_when_due(self):
+        self._store().get(self._issue)
+
+        self.assertEqual(self._store().refresh_if_due(self._issue).value, "token-1")
+        self.clock.now += 451
+        self.assertEqual(self._store().refresh_if_due(self._issue).value, "token-2")
+
+
+@override_settings(
+    OPENBANKING_CACHE_BALANCE_TTL=60,
+    OPENBANKING_CACHE_STALE_TTL=600,
+    OPENBANKING_CACHE_FALLBACK_TTL=3600,
+)
+class CachedCallTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(response_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        executor_patcher = mock.patch.object(response_cache, "_get_executor")
+        self.executor = executor_patcher.start().return_value
+        self.addCleanup(executor_patcher.stop)
+        self.addCleanup(django_cache.clear)
+        self.loader = mock.Mock(return_value={"balance_amt": "1000"})
+
+    def _call(self, **kwargs):
+        return response_cache.cached_call(
+            "balance", "1999000000001", {}, self.loader, **kwargs
+        )
+
+    def test_fresh_entry_is_a_hit(self):
+        self.assertEqual(self._call()[1]["status"], response_cache.MISS)
+        self.clock.now += 30
+
+        payload, info = self._call()
+
+        self.assertEqual(info, {"status": response_cache.HIT, "age": 30})
+        self.assertEqual(payload, {"balance_amt": "1000"})
+        self.loader.assert_called_once()
+
+    def test_stale_entry_is_served_while_one_refresh_runs(self):
+        self._call()
+        self.clock.now += 120
+
+        first = self._call()[1]["status"]
+        second = self._call()[1]["status"]
+
+        self.assertEqual([first, second], [response_cache.STALE] * 2)
+        self.executor.submit.assert_called_once()
+        fn, *args = self.executor.submit.call_args.args
+        self.loader.return_value = {"balance_amt": "2000"}
+        with mock.patch.object(response_cache, "close_old_connections"):
+            fn(*args)
+        payload, info = self._call()
+        self.assertEqual(info["status"], response_cache.HIT)
+        self.assertEqual(payload, {"balance_amt": "2000"})
+
+    def test_expired_entry_falls_back_when_the_bank_fails(self):
+        self._call()
+        self.clock.now += 60 + 600 + 10
+        self.loader.side_effect = OpenBankingServiceError("down")
+
+        payload, info = self._call()
+
+        self.assertEqual(info["status"], response_cache.FALLBACK)
+        self.assertEqual(payload, {"balance_amt": "1000"})
+
+    def test_failure_without_an_entry_raises(self):
+        self.loader.side_effect = OpenBankingServiceError("down")
+
+        with self.assertRaises(OpenBankingServiceError):
+            self._call()
+
+    def test_force_refresh_skips_a_fresh_entry(self):
+        self._call()
+        self.loader.return_value = {"balance_amt": "3000"}
+
+        payload, info = self._call(force_refresh=True)
+
+        self.assertEqual(info["status"], response_cache.MISS)
+        self.assertEqual(payload, {"balance_amt": "3000"})
+        self.assertEqual(self.loader.call_count, 2)
+
+
+class FetchBalancesTests(TestCase):
+    def setUp(self):
+        first = _make_account()
+        self.group = first.group
+        self.accounts = [first] + [
+            OpenBankingAccount.objects.create(
+                group=self.group, alias=alias, fintech_use_num=f"19990000000{index}"
+            )
+            for index, alias in enumerate(("second", "third"))
+        ]
+        self.payloads = {}
+
+    def _cached_balance(self, fintech_use_num, force_refresh=False):
+        payload = self.payloads[fintech_use_num]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload, {"status": "miss", "age": 0}
+
+    def _set(self, *payloads):
+        for account, payload in zip(self.accounts, payloads):
+            self.payloads[account.fintech_use_num] = payload
+        patcher = mock.patch.object(
+            balances, "cached_balance", side_effect=self._cached_balance
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_partial_failure_reports_each_account_and_totals_the_rest(self):
+        self._set(
+            {"balance": "1,000"},
+            {"balance": "2500.00", "currency": "KRW"},
+            OpenBankingServiceError("down"),
+        )
+
+        result = balances.fetch_balances(self.accounts)
+
+        self.assertEqual(result["total"], 3500)
+        self.assertEqual(result["totals"], {"KRW": 3500})
+        self.assertEqual((result["succeeded"], result["failed"]), (2, 1))
+        self.assertTrue(result["partial"])
+        failed = result["accounts"][2]
+        self.assertFalse(failed["ok"])
+        self.assertEqual(failed["status_code"], OpenBankingServiceError.status_code)
+        self.assertNotIn(self.accounts[2].fintech_use_num, failed["fintech_use_num"])
+
+    def test_totals_are_kept_per_currency(self):
+        self._set(
+            {"balance": "1000"},
+            {"balance": "20", "currency": "USD"},
+            {"balance": None},
+        )
+
+        result = balances.fetch_balances(self.accounts)
+
+        self.assertEqual(result["totals"], {"KRW": 1000, "USD": 20})
+        self.assertEqual(result["total"], 1000)
+        self.assertFalse(result["partial"])
+
+    def test_pool_is_reused_across_requests(self):
+        self._set({"balance": "1"}, {"balance": "2"}, {"balance": "3"})
+        balances.reset_executor()
+        self.addCleanup(balances.reset_executor)
+
+        balances.fetch_balances(self.accounts)
+        pool = balances._get_executor()
+        balances.fetch_balances(self.accounts)
+
+        self.assertIs(balances._get_executor(), pool)
+
+    def _get_view(self):
+        GroupMembership.objects.create(
+            group=self.group,
+            user=self.group.owner,
+            role=GroupMembership.Roles.ADMIN,
+            status=GroupMembership.Status.ACTIVE,
+        )
+        client = APIClient()
+        client.force_authenticate(self.group.owner)
+        return client.get("/api/openbanking/balances", {"group_id": self.group.id})
+
+    def test_view_is_502_only_when_every_account_failed(self):
+        error = OpenBankingServiceError("down")
+        self._set(error, error, error)
+
+        self.assertEqual(self._get_view().status_code, 502)
+
+    def test_view_is_200_on_partial_failure(self):
+        self._set({"balance": "1"}, OpenBankingServiceError("down"), {"balance": "3"})
+
+        response = self._get_view()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 4)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def _race(self, fn):
+        """Run ``fn`` through one flight from a leader and a waiter thread."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def leader_fn():
+            calls.append(threading.current_thread().name)
+            release.wait(5)
+            return fn()
+
+        outcomes = {}
+
+        def call(name):
+            try:
+                outcomes[name] = ("ok", flight.do("key", leader_fn))
+            except Exception as exc:
+                outcomes[name] = ("error", exc)
+
+        leader = threading.Thread(target=call, args=("leader",), name="leader")
+        leader.start()
+        while not calls:
+            time.sleep(0.001)
+        waiter = threading.Thread(target=call, args=("waiter",), name="waiter")
+        waiter.start()
+        while not flight.shared:
+            time.sleep(0.001)
+        release.set()
+        leader.join(5)
+        waiter.join(5)
+        return calls, outcomes
+
+    def test_concurrent_callers_share_one_call_with_separate_copies(self):
+        calls, outcomes = self._race(lambda: {"balance": [1000]})
+
+        self.assertEqual(calls, ["leader"])
+        leader_result, waiter_result = outcomes["leader"][1], outcomes["waiter"][1]
+        self.assertEqual(leader_result, waiter_result)
+        self.assertIsNot(leader_result, waiter_result)
+        self.assertIsNot(leader_result["balance"], waiter_result["balance"])
+
+    def test_errors_reach_every_caller_as_their_own_exception(self):
+        error = OpenBankingServiceError("down")
+
+        def fail():
+            raise error
+
+        calls, outcomes = self._race(fail)
+
+        self.assertEqual(calls, ["leader"])
+        self.assertIs(outcomes["leader"][1], error)
+        kind, waiter_error = outcomes["waiter"]
+        self.assertEqual(kind, "error")
+        self.assertIsInstance(waiter_error, OpenBankingServiceError)
+        self.assertIsNot(waiter_error, error)
+        self.assertIs(waiter_error.__cause__, error)
+        self.assertEqual(str(waiter_error.detail), "down")
+
+    def test_nothing_is_remembered_after_the_call(self):
+        flight = SingleFlight()
+        fn = mock.Mock(side_effect=[1, 2])
+
+        self.assertEqual([flight.do("key", fn), flight.do("key", fn)], [1, 2])
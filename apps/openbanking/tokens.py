@@ -0,0 +1,226 @@
+"""
+Refresh-ahead holder for the OpenBanking access token.
+
+The token lives in the OpenBankingToken table, so every worker (and the
+``warm_openbanking_token`` command) shares it, with a copy in process memory
+for the hot path. Once a token is past ``refresh_ahead`` of its lifetime, a
+caller first re-reads the row and adopts a token a peer already renewed;
+otherwise the first caller to get the row's lease renews it in the background
+and keeps using the current token, which is still valid. Only a cold start (or an
+explicit force refresh) issues a token inline; a cold caller that finds a
+peer already issuing waits at most ``cold_start_wait`` seconds for it.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from django.db import close_old_connections, transaction
+
+from apps.openbanking.models import OpenBankingToken
+
+logger = logging.getLogger(__name__)
+
+# (token, expires_in seconds)
+Issuer = Callable[[], Tuple[str, int]]
+
+# tokens are dropped this long before the bank says they expire
+EXPIRY_MARGIN = 60
+COLD_START_POLL = 0.1
+
+
+@dataclass(frozen=True)
+class Token:
+    value: str
+    issued_at: float
+    expires_at: float
+
+    def usable(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def due_for_refresh(self, now: float, refresh_ahead: float) -> bool:
+        lifetime = max(self.expires_at - self.issued_at, 1.0)
+        return (now - self.issued_at) / lifetime >= refresh_ahead
+
+
+class TokenStore:
+    def __init__(
+        self,
+        key: str,
+        *,
+        refresh_ahead: float = 0.75,
+        lock_timeout: int = 10,
+        cold_start_wait: float = 1.0,
+    ):
+        self.key = key
+        self.refresh_ahead = min(max(refresh_ahead, 0.1), 1.0)
+        self.lock_timeout = lock_timeout
+        self.cold_start_wait = min(max(cold_start_wait, 0.0), lock_timeout)
+        self._local: Optional[Token] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, issue: Issuer, *, force_refresh: bool = False) -> str:
+        if force_refresh:
+            with self._lock:
+                return self._issue(issue, wait_for_peer=False).value
+        now = time.time()
+        token = self._current(now)
+        if token is None:
+            with self._lock:
+                # another thread may have finished the cold start meanwhile
+                token = self._current(time.time()) or self._issue(issue)
+        elif token.due_for_refresh(now, self.refresh_ahead):
+            # a peer may have renewed already: adopt its token, and only
+            # contend for the lease when nobody is holding it
+            shared, lease_until = self._shared_state()
+            if self._is_fresh(shared, now):
+                self._local = shared
+                return shared.value
+            if lease_until is None or now >= lease_until:
+                self._schedule_refresh(issue)
+        return token.value
+
+    def refresh_if_due(self, issue: Issuer) -> Token:
+        """Renew inline when the shared token is missing or due (scheduled warm-up)."""
+        token = self._read_shared()
+        if self._is_fresh(token, time.time()):
+            self._local = token
+            return token
+        with self._lock:
+            return self._issue(issue)
+
+    def _is_fresh(self, token: Optional[Token], now: float) -> bool:
+        return (
+            token is not None
+            and token.usable(now)
+            and not token.due_for_refresh(now, self.refresh_ahead)
+        )
+
+    def _current(self, now: float) -> Optional[Token]:
+        token = self._local
+        if token is not None and token.usable(now):
+            return token
+        token = self._read_shared()
+        if token is not None and token.usable(now):
+            self._local = token
+            return token
+        return None
+
+    def _shared_state(self) -> Tuple[Optional[Token], Optional[float]]:
+        """The shared token (None if never issued) and its lease expiry."""
+        row = (
+            OpenBankingToken.objects.filter(key=self.key)
+            .values_list("value", "issued_at", "expires_at", "lease_until")
+            .first()
+        )
+        if row is None:
+            return None, None
+        value, issued_at, expires_at, lease_until = row
+        token = Token(value, issued_at, expires_at) if value else None
+        return token, lease_until
+
+    def _read_shared(self) -> Optional[Token]:
+        return self._shared_state()[0]
+
+    def _adopt_fresh_shared(self) -> Optional[Token]:
+        """Call holding the lease: a peer may have renewed before we got it."""
+        token = self._read_shared()
+        if not self._is_fresh(token, time.time()):
+            return None
+        self._local = token
+        self._release_lease()
+        return token
+
+    def _store(self, value: str, expires_in: int) -> Token:
+        now = time.time()
+        lifetime = max(expires_in - EXPIRY_MARGIN, EXPIRY_MARGIN)
+        token = Token(value, now, now + lifetime)
+        OpenBankingToken.objects.update_or_create(
+            key=self.key,
+            defaults={
+                "value": token.value,
+                "issued_at": token.issued_at,
+                "expires_at": token.expires_at,
+            },
+        )
+        self._local = token
+        logger.info("Issued OpenBanking access token (ttl=%s)", int(lifetime))
+        return token
+
+    def _acquire_lease(self) -> bool:
+        """Claim the right to issue for ``lock_timeout`` seconds, across workers."""
+        with transaction.atomic():
+            OpenBankingToken.objects.bulk_create(
+                [OpenBankingToken(key=self.key)], ignore_conflicts=True
+            )
+            row = OpenBankingToken.objects.select_for_update().get(key=self.key)
+            now = time.time()
+            if row.lease_until is not None and now < row.lease_until:
+                return False
+            row.lease_until = now + self.lock_timeout
+            row.save(update_fields=["lease_until"])
+        return True
+
+    def _release_lease(self) -> None:
+        OpenBankingToken.objects.filter(key=self.key).update(lease_until=None)
+
+    def _issue(self, issue: Issuer, *, wait_for_peer: bool = True) -> Token:
+        """Issue under the shared lease; at cold start, briefly wait for a peer's."""
+        if self._acquire_lease():
+            if wait_for_peer:
+                token = self._adopt_fresh_shared()
+                if token is not None:
+                    return token
+            try:
+                return self._store(*issue())
+            finally:
+                self._release_lease()
+        if wait_for_peer:
+            deadline = time.monotonic() + self.cold_start_wait
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(COLD_START_POLL, remaining))
+                token = self._current(time.time())
+                if token is not None:
+                    return token
+        # the peer is slow or gone; issuing our own beats holding the request
+        return self._store(*issue())
+
+    def _refresh(self, issue: Issuer) -> None:
+        close_old_connections()
+        try:
+            self._store(*issue())
+        except Exception as exc:
+            # the current token is still valid; the next caller retries
+            logger.warning("OpenBanking token refresh failed: %s", exc)
+        finally:
+            self._release_lease()
+            close_old_connections()
+
+    def _schedule_refresh(self, issue: Issuer) -> None:
+        # the shared lease makes exactly one worker renew
+        if not self._acquire_lease():
+            return
+        if self._adopt_fresh_shared() is not None:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="openbanking-token"
+                )
+            executor = self._executor
+        try:
+            executor.submit(self._refresh, issue)
+        except RuntimeError:
+            self._release_lease()
+
+    def reset(self) -> None:
+        """Forget the in-process copy and refresh thread (e.g. after fork)."""
+        self._local = None
+        self._executor = None
+        self._lock = threading.Lock()
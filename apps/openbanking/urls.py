@@ -3,9 +3,14 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from apps.openbanking.views import (
+    BankLedgerMatchDetailView,
+    BankLedgerMatchListView,
     OpenBankingAccountViewSet,
     OpenBankingBalanceView,
     OpenBankingCallbackView,
+    OpenBankingCircuitStatusView,
+    OpenBankingGroupBalancesView,
+    OpenBankingReconcileView,
     OpenBankingTransactionsView,
 )
 
@@ -21,7 +26,14 @@ urlpatterns = [
         name="openbanking-callback",
     ),
     path("openbanking/balance", OpenBankingBalanceView.as_view()),
+    path("openbanking/balances", OpenBankingGroupBalancesView.as_view()),
     path("openbanking/transactions", OpenBankingTransactionsView.as_view()),
+    path("openbanking/circuit", OpenBankingCircuitStatusView.as_view()),
+    path("openbanking/reconcile", OpenBankingReconcileView.as_view()),
+    path("openbanking/reconcile/matches", BankLedgerMatchListView.as_view()),
+    path(
+        "openbanking/reconcile/matches/<int:pk>", BankLedgerMatchDetailView.as_view()
+    ),
 ]
 
 urlpatterns += router.urls
@@ -1,22 +1,40 @@
 # moved from apps/common/views/openbanking.py
+from datetime import date
+
 from django.conf import settings
+from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.common.permissions import IsAdminOrReadOnly
 from apps.groups.mixins import GroupContextMixin
 from apps.groups.services import user_is_group_admin
-from apps.openbanking.models import OpenBankingAccount
+from apps.openbanking.balances import fetch_balances
+from apps.openbanking.cache import cached_balance, cached_transactions
+from apps.openbanking.circuit import breaker_states
+from apps.openbanking.models import BankLedgerMatch, OpenBankingAccount
+from apps.openbanking.reconcile import (
+    default_range,
+    reconcile_group,
+    unmatched_bank_entries,
+    unmatched_ledger_entries,
+)
 from apps.openbanking.serializers import (
+    BankLedgerMatchSerializer,
     OpenBankingAccountSerializer,
     OpenBankingAuthCallbackSerializer,
     OpenBankingBalanceQuerySerializer,
+    OpenBankingReconcileQuerySerializer,
     OpenBankingTransactionQuerySerializer,
 )
-from apps.openbanking.services import fetch_balance, fetch_transactions
+from apps.openbanking.sync import (
+    is_range_synced,
+    local_transactions,
+    store_transactions,
+)
 
 
 class OpenBankingCallbackView(APIView):
@@ -66,6 +84,10 @@ class OpenBankingAccountViewSet(GroupContextMixin, viewsets.ModelViewSet):
         serializer.save()
 
 
+def _wants_refresh(request) -> bool:
+    return request.query_params.get("refresh") == "1"
+
+
 def _account_payload(account):
     if not account:
         return {"alias": None, "bank_name": None}
@@ -88,8 +110,11 @@ class OpenBankingBalanceView(GroupContextMixin, APIView):
             raise PermissionDenied("Account is disabled")
 
         self.require_admin()
-        payload = fetch_balance(fintech_use_num)
+        payload, cache_info = cached_balance(
+            fintech_use_num, force_refresh=_wants_refresh(request)
+        )
         payload["account"] = _account_payload(account)
+        payload["cache"] = cache_info
 
         debug = request.query_params.get("debug") == "1"
         if not debug:
@@ -97,6 +122,25 @@ class OpenBankingBalanceView(GroupContextMixin, APIView):
         return Response(payload, status=status.HTTP_200_OK)
 
 
+class OpenBankingGroupBalancesView(GroupContextMixin, APIView):
+    """Balances of every enabled account in the group, fetched concurrently."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        group = self.get_group()
+        self.require_admin()
+        accounts = OpenBankingAccount.objects.filter(
+            group=group, enabled=True
+        ).order_by("id")
+        payload = fetch_balances(accounts, force_refresh=_wants_refresh(request))
+        all_failed = payload["failed"] and not payload["succeeded"]
+        return Response(
+            payload,
+            status=status.HTTP_502_BAD_GATEWAY if all_failed else status.HTTP_200_OK,
+        )
+
+
 class OpenBankingTransactionsView(GroupContextMixin, APIView):
     permission_classes = [IsAuthenticated]
 
@@ -114,17 +158,151 @@ class OpenBankingTransactionsView(GroupContextMixin, APIView):
             raise PermissionDenied("Account is disabled")
 
         self.require_admin()
-        payload = fetch_transactions(
-            fintech_use_num,
-            validated["from_date"],
-            validated["to_date"],
-            sort=validated["sort"],
-            page=validated["page"],
-            size=validated["size"],
-        )
+        if is_range_synced(
+            account,
+            date.fromisoformat(validated["from_date"]),
+            date.fromisoformat(validated["to_date"]),
+        ):
+            payload = local_transactions(
+                account,
+                validated["from_date"],
+                validated["to_date"],
+                sort=validated["sort"],
+                page=validated["page"],
+                size=validated["size"],
+            )
+            payload["source"] = "local"
+        else:
+            payload, cache_info = cached_transactions(
+                fintech_use_num,
+                validated["from_date"],
+                validated["to_date"],
+                sort=validated["sort"],
+                page=validated["page"],
+                size=validated["size"],
+                force_refresh=_wants_refresh(request),
+            )
+            if account is not None and cache_info["status"] != "hit":
+                store_transactions(account, payload.get("list") or [])
+            payload["source"] = "upstream"
+            payload["cache"] = cache_info
         payload["account"] = _account_payload(account)
 
         debug = request.query_params.get("debug") == "1"
         if not debug:
             payload["raw"] = None
         return Response(payload, status=status.HTTP_200_OK)
+
+
+UNMATCHED_LIMIT = 200
+
+
+class OpenBankingReconcileView(GroupContextMixin, APIView):
+    """Run bank-to-ledger matching for the group (POST) or list leftovers (GET)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def _range(self, data):
+        serializer = OpenBankingReconcileQuerySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        return (
+            validated.get("from_date"),
+            validated.get("to_date"),
+            validated.get("window_days"),
+        )
+
+    def post(self, request):
+        group = self.get_group()
+        self.require_admin()
+        since, until, window_days = self._range(request.data)
+        result = reconcile_group(
+            group, since=since, until=until, window_days=window_days
+        )
+        return Response(
+            {
+                "matched": result.matched,
+                "bank_unmatched": result.bank_unmatched,
+                "ledger_unmatched": result.ledger_unmatched,
+                "range": {
+                    "from": result.since.isoformat(),
+                    "to": result.until.isoformat(),
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def get(self, request):
+        group = self.get_group()
+        self.require_admin()
+        since, until = default_range(*self._range(request.query_params)[:2])
+        bank_qs = unmatched_bank_entries(group, since, until)
+        ledger_qs = unmatched_ledger_entries(group, since, until)
+        bank = [
+            {
+                "id": row.id,
+                "account_id": row.account_id,
+                "account_alias": row.account.alias,
+                "date": row.tran_date.isoformat(),
+                "amount": row.amount,
+                "inout": row.inout,
+                "summary": row.summary,
+            }
+            for row in bank_qs[:UNMATCHED_LIMIT]
+        ]
+        ledger = list(
+            ledger_qs.values("id", "date", "amount", "type", "description")[
+                :UNMATCHED_LIMIT
+            ]
+        )
+        return Response(
+            {
+                "range": {"from": since.isoformat(), "to": until.isoformat()},
+                "bank": {"count": bank_qs.count(), "results": bank},
+                "ledger": {"count": ledger_qs.count(), "results": ledger},
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class BankLedgerMatchListView(GroupContextMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        group = self.get_group()
+        self.require_admin()
+        matches = BankLedgerMatch.objects.filter(group=group)[:UNMATCHED_LIMIT]
+        serializer = BankLedgerMatchSerializer(matches, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        group = self.get_group()
+        self.require_admin()
+        serializer = BankLedgerMatchSerializer(
+            data=request.data, context={"group": group}
+        )
+        serializer.is_valid(raise_exception=True)
+        match = serializer.save(group=group, method=BankLedgerMatch.Method.MANUAL)
+        return Response(
+            BankLedgerMatchSerializer(match).data, status=status.HTTP_201_CREATED
+        )
+
+
+class BankLedgerMatchDetailView(GroupContextMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, pk):
+        group = self.get_group()
+        self.require_admin()
+        match = get_object_or_404(BankLedgerMatch, pk=pk, group=group)
+        match.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class OpenBankingCircuitStatusView(APIView):
+    """Shared circuit breaker state per upstream endpoint."""
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(breaker_states(), status=status.HTTP_200_OK)
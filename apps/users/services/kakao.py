@@ -1,9 +1,23 @@
 import json
 
 import requests
+from django.conf import settings
 
-TOKEN_URL = "https://kauth.kakao.com/oauth/token"
-USER_ME_URL = "https://kapi.kakao.com/v2/user/me"
+from apps.common.services import http_client
+
+HTTP_SERVICE = "kakao"
+TOKEN_PATH = "/oauth/token"
+USER_ME_PATH = "/v2/user/me"
+
+
+def _token_url() -> str:
+    base = getattr(settings, "KAKAO_AUTH_BASE_URL", "") or "https://kauth.kakao.com"
+    return base.rstrip("/") + TOKEN_PATH
+
+
+def _user_me_url() -> str:
+    base = getattr(settings, "KAKAO_API_BASE_URL", "") or "https://kapi.kakao.com"
+    return base.rstrip("/") + USER_ME_PATH
 
 
 class KakaoServiceError(Exception):
@@ -15,7 +29,6 @@ def exchange_code_for_token(
     *,
     client_id: str,
     redirect_uri: str,
-    timeout: int = 10,
 ) -> dict:
     payload = {
         "grant_type": "authorization_code",
@@ -25,11 +38,11 @@ def exchange_code_for_token(
     }
 
     try:
-        response = requests.post(
-            TOKEN_URL,
+        response = http_client.post(
+            HTTP_SERVICE,
+            _token_url(),
             data=payload,
             headers={"Content-Type": "application/x-www-form-urlencoded;charset=utf-8"},
-            timeout=timeout,
         )
         response.raise_for_status()
         return response.json()
@@ -42,12 +55,12 @@ def exchange_code_for_token(
         raise KakaoServiceError(f"Kakao token exchange error: {exc}") from exc
 
 
-def fetch_user_me(access_token: str, *, timeout: int = 10) -> dict:
+def fetch_user_me(access_token: str) -> dict:
     headers = {
         "Authorization": f"Bearer {access_token}",
     }
     try:
-        response = requests.get(USER_ME_URL, headers=headers, timeout=timeout)
+        response = http_client.get(HTTP_SERVICE, _user_me_url(), headers=headers)
         response.raise_for_status()
         return response.json()
     except requests.Timeout as exc:
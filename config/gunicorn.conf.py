@@ -0,0 +1,85 @@
+"""
+Production gunicorn profile.
+
+    gunicorn -c config/gunicorn.conf.py config.wsgi:application
+
+The app is imported once in the master (preload_app) and shared with the
+workers copy-on-write. Anything that owns sockets or threads (DB connections,
+pooled outbound HTTP sessions, the background OCR, OpenBanking refresh,
+token and dashboard pools, the OCR bulkhead) is dropped around fork so every
+worker opens its own.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8000")
+workers = _env_int("GUNICORN_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8))
+# requests spend most of their time waiting on the DB or Clova/OpenBanking
+worker_class = "gthread"
+threads = _env_int("GUNICORN_THREADS", 4)
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+preload_app = True
+
+# recycle workers to cap slow leaks; jitter keeps them from restarting together
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# heartbeat file on tmpfs so a slow disk cannot make workers look dead
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = os.environ.get("GUNICORN_ERROR_LOG", "-")
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def _drop_process_state() -> None:
+    from django.db import connections
+
+    from apps.common.services.http_client import reset_sessions
+    from apps.groups.dashboard import reset_executor as reset_dashboard_executor
+    from apps.ocr.services.bulkhead import reset_bulkhead
+    from apps.ocr.services.pipeline import reset_executor
+    from apps.openbanking.balances import reset_executor as reset_balance_executor
+    from apps.openbanking.cache import reset_executor as reset_refresh_executor
+    from apps.openbanking.services import reset_token_state
+
+    connections.close_all()
+    reset_sessions()
+    reset_executor()
+    reset_refresh_executor()
+    reset_balance_executor()
+    reset_token_state()
+    reset_dashboard_executor()
+    reset_bulkhead()
+
+
+def pre_fork(server, worker):
+    # close anything the master opened while importing the app, so no socket
+    # ends up shared between the master and a worker
+    _drop_process_state()
+
+
+def post_fork(server, worker):
+    _drop_process_state()
+    server.log.info("Worker %s ready (pid %s)", worker.age, worker.pid)
+
+
+def worker_exit(server, worker):
+    # let queued receipt OCR jobs finish on recycle (bounded by
+    # graceful_timeout); anything cut off stays pending for
+    # run_pending_receipt_ocr
+    from apps.ocr.services.pipeline import reset_executor
+
+    reset_executor(wait=True)
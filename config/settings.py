@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -50,8 +51,35 @@ if not RECEIPT_ALLOWED_EXTS:
     RECEIPT_ALLOWED_EXTS = ["jpg", "jpeg", "png", "pdf"]
 
 KAKAO_LOGIN_REDIRECT_URL = os.environ.get("KAKAO_LOGIN_REDIRECT_URL", "")
+# overridable so a local stub (manage.py run_fake_upstreams) can stand in
+KAKAO_AUTH_BASE_URL = os.environ.get("KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com")
+KAKAO_API_BASE_URL = os.environ.get("KAKAO_API_BASE_URL", "https://kapi.kakao.com")
 CLOVA_OCR_API_URL = os.environ.get("CLOVA_OCR_API_URL", "")
 CLOVA_OCR_SECRET = os.environ.get("CLOVA_OCR_SECRET", "")
+OCR_REVIEW_PAGE_SIZE = int(os.environ.get("OCR_REVIEW_PAGE_SIZE", "50"))
+OCR_REVIEW_COUNTS_TTL = int(os.environ.get("OCR_REVIEW_COUNTS_TTL", "60"))
+# 0 disables auto-approval; otherwise receipts scoring >= this skip manual review
+OCR_AUTO_APPROVE_CONFIDENCE = float(os.environ.get("OCR_AUTO_APPROVE_CONFIDENCE", "0"))
+# run OCR in a background thread whenever a transaction gets a new receipt
+# image; on by default only when Clova is configured
+OCR_AUTO_ON_UPLOAD = _get_bool(
+    "OCR_AUTO_ON_UPLOAD", bool(CLOVA_OCR_API_URL and CLOVA_OCR_SECRET)
+)
+OCR_BACKGROUND_WORKERS = int(os.environ.get("OCR_BACKGROUND_WORKERS", "2"))
+OCR_MATCH_DATE_WINDOW_DAYS = int(os.environ.get("OCR_MATCH_DATE_WINDOW_DAYS", "3"))
+OCR_MATCH_MAX_CANDIDATES = int(os.environ.get("OCR_MATCH_MAX_CANDIDATES", "5"))
+# max Hamming distance (of 64 bits) for two receipt photos to count as duplicates
+OCR_DUPLICATE_MAX_DISTANCE = int(os.environ.get("OCR_DUPLICATE_MAX_DISTANCE", "4"))
+# Clova OCR bulkhead: at most OCR_MAX_CONCURRENCY calls across all workers,
+# OCR_MAX_QUEUE waiting per worker for up to OCR_QUEUE_TIMEOUT seconds, then 503
+OCR_MAX_CONCURRENCY = int(os.environ.get("OCR_MAX_CONCURRENCY", "4"))
+OCR_MAX_QUEUE = int(os.environ.get("OCR_MAX_QUEUE", "8"))
+OCR_QUEUE_TIMEOUT = float(os.environ.get("OCR_QUEUE_TIMEOUT", "2"))
+OCR_RETRY_AFTER = int(os.environ.get("OCR_RETRY_AFTER", "5"))
+# slot files shared by workers on one host; empty keeps the cap per process
+OCR_BULKHEAD_LOCK_DIR = os.environ.get(
+    "OCR_BULKHEAD_LOCK_DIR", os.path.join(tempfile.gettempdir(), "ocr-bulkhead")
+)
 
 SECRET_KEY = os.environ.get("SECRET_KEY", "dev-only-not-for-prod")
 
@@ -240,6 +268,77 @@ OPENBANKING_ACCESS_TOKEN = os.environ.get("OPENBANKING_ACCESS_TOKEN", "")
 OPENBANKING_TIMEOUT = int(os.environ.get("OPENBANKING_TIMEOUT", "6"))
 OPENBANKING_RETRIES = int(os.environ.get("OPENBANKING_RETRIES", "2"))
 OPENBANKING_RL = int(os.environ.get("OPENBANKING_RL", "5"))
+# upstream quota across all fintech numbers (req/s, 0 = off); burst defaults to the rate
+OPENBANKING_GLOBAL_RL = int(os.environ.get("OPENBANKING_GLOBAL_RL", "0"))
+OPENBANKING_RL_BURST = int(os.environ.get("OPENBANKING_RL_BURST", "0"))
+# seconds a caller may wait for a rate limit slot before getting 429
+OPENBANKING_RL_MAX_WAIT = float(os.environ.get("OPENBANKING_RL_MAX_WAIT", "0"))
+# transaction sync (manage.py sync_openbanking)
+OPENBANKING_SYNC_INITIAL_DAYS = int(os.environ.get("OPENBANKING_SYNC_INITIAL_DAYS", "90"))
+OPENBANKING_SYNC_PAGE_SIZE = int(os.environ.get("OPENBANKING_SYNC_PAGE_SIZE", "100"))
+OPENBANKING_SYNC_OVERLAP_DAYS = int(os.environ.get("OPENBANKING_SYNC_OVERLAP_DAYS", "1"))
+# collapse concurrent identical balance/transaction calls into one upstream call
+OPENBANKING_SINGLE_FLIGHT = _get_bool("OPENBANKING_SINGLE_FLIGHT", True)
+# renew the access token in the background once this fraction of its TTL is used
+OPENBANKING_TOKEN_REFRESH_AHEAD = float(
+    os.environ.get("OPENBANKING_TOKEN_REFRESH_AHEAD", "0.75")
+)
+# a cold request waits at most this long (seconds) for another worker's token
+# before issuing its own
+OPENBANKING_TOKEN_COLD_START_WAIT = float(
+    os.environ.get("OPENBANKING_TOKEN_COLD_START_WAIT", "1.0")
+)
+# Versioned response cache for /api/dashboard and /api/stats/* (seconds, 0
+# disables). Writes bump a per-group version, so the TTL only bounds how stale
+# bank-derived figures can get. Only active on a shared CACHE_BACKEND: with
+# the per-process LocMem default a bump would not reach the other workers.
+# BETA > 1 recomputes earlier before expiry; WAIT is how long requests wait
+# for a concurrent rebuild.
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_BETA = float(os.environ.get("RESPONSE_CACHE_BETA", "1.0"))
+RESPONSE_CACHE_WAIT = float(os.environ.get("RESPONSE_CACHE_WAIT", "1.0"))
+# /api/stats/accumulated refuses (400) series longer than this many periods
+STATS_MAX_PERIODS = int(os.environ.get("STATS_MAX_PERIODS", "1000"))
+# seconds a (user, group) membership lookup is shared across requests;
+# membership and group writes invalidate it, 0 disables. Only active on a
+# shared CACHE_BACKEND, otherwise every request checks the database.
+GROUP_CONTEXT_CACHE_TTL = int(os.environ.get("GROUP_CONTEXT_CACHE_TTL", "30"))
+# dashboard waits at most this long (seconds) for the bank balance
+DASHBOARD_BALANCE_DEADLINE = float(os.environ.get("DASHBOARD_BALANCE_DEADLINE", "0.8"))
+DASHBOARD_BALANCE_WORKERS = int(os.environ.get("DASHBOARD_BALANCE_WORKERS", "4"))
+# Circuit breaker: open after THRESHOLD upstream failures within WINDOW
+# seconds, probe again after RESET_TIMEOUT. Per-endpoint thresholds as
+# "token:3,balance:5,transactions:5"; 0 disables.
+OPENBANKING_CB_THRESHOLD = int(os.environ.get("OPENBANKING_CB_THRESHOLD", "5"))
+OPENBANKING_CB_THRESHOLDS = os.environ.get("OPENBANKING_CB_THRESHOLDS", "")
+OPENBANKING_CB_WINDOW = int(os.environ.get("OPENBANKING_CB_WINDOW", "60"))
+OPENBANKING_CB_RESET_TIMEOUT = int(os.environ.get("OPENBANKING_CB_RESET_TIMEOUT", "30"))
+# Read-through cache for balance/transaction lookups (seconds, 0 disables).
+# Within OPENBANKING_CACHE_STALE_TTL after expiry the old copy is served while
+# a background refresh runs.
+OPENBANKING_CACHE_BALANCE_TTL = int(os.environ.get("OPENBANKING_CACHE_BALANCE_TTL", "60"))
+OPENBANKING_CACHE_TRANSACTIONS_TTL = int(
+    os.environ.get("OPENBANKING_CACHE_TRANSACTIONS_TTL", "300")
+)
+OPENBANKING_CACHE_STALE_TTL = int(os.environ.get("OPENBANKING_CACHE_STALE_TTL", "600"))
+# how long past the stale window a cached copy may stand in for a failed call
+OPENBANKING_CACHE_FALLBACK_TTL = int(
+    os.environ.get("OPENBANKING_CACHE_FALLBACK_TTL", "3600")
+)
+OPENBANKING_CACHE_REFRESH_WORKERS = int(
+    os.environ.get("OPENBANKING_CACHE_REFRESH_WORKERS", "2")
+)
+# balance lookup threads per worker, shared by /api/openbanking/balances requests
+OPENBANKING_BALANCE_CONCURRENCY = int(
+    os.environ.get("OPENBANKING_BALANCE_CONCURRENCY", "4")
+)
+# bank-to-ledger reconciliation: max date gap and minimum match score (0..1)
+OPENBANKING_RECONCILE_WINDOW_DAYS = int(
+    os.environ.get("OPENBANKING_RECONCILE_WINDOW_DAYS", "3")
+)
+OPENBANKING_RECONCILE_MIN_SCORE = float(
+    os.environ.get("OPENBANKING_RECONCILE_MIN_SCORE", "0.5")
+)
 OPENBANKING_CLIENT_ID = os.environ.get("OPENBANKING_CLIENT_ID", "")
 OPENBANKING_CLIENT_SECRET = os.environ.get("OPENBANKING_CLIENT_SECRET", "")
 OPENBANKING_CLIENT_USE_CODE = os.environ.get("OPENBANKING_CLIENT_USE_CODE", "")
@@ -247,7 +346,53 @@ OPENBANKING_REDIRECT_URI = os.environ.get("OPENBANKING_REDIRECT_URI", "")
 OPENBANKING_SCOPE = os.environ.get("OPENBANKING_SCOPE", "oob")
 OPENBANKING_TOKEN_PATH = os.environ.get("OPENBANKING_TOKEN_PATH", "/oauth/2.0/token")
 OPENBANKING_SANDBOX = _get_bool("OPENBANKING_SANDBOX", True)
-# TODO: add structured logging / retry policy for OpenBanking client
+# sandbox: serve a large seeded synthetic history instead of the tiny fixture
+OPENBANKING_SANDBOX_SYNTHETIC = _get_bool("OPENBANKING_SANDBOX_SYNTHETIC", False)
+OPENBANKING_SANDBOX_SEED = int(os.environ.get("OPENBANKING_SANDBOX_SEED", "0"))
+OPENBANKING_SANDBOX_TX_PER_DAY = int(os.environ.get("OPENBANKING_SANDBOX_TX_PER_DAY", "20"))
+# TODO: add structured logging for OpenBanking client
+
+
+# Cache: LocMem is per process. Point CACHE_BACKEND at a shared backend
+# (e.g. django.core.cache.backends.filebased.FileBasedCache or
+# django.core.cache.backends.redis.RedisCache) when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+
+# Outbound HTTP (apps/common/services/http_client.py): one keep-alive pool per
+# integration. HTTP_<SERVICE>_<NAME> overrides the HTTP_CLIENT_<NAME> default
+# for a single service; the overrides defined below are the ones read.
+HTTP_CLIENT_POOL_CONNECTIONS = int(os.environ.get("HTTP_CLIENT_POOL_CONNECTIONS", "4"))
+HTTP_CLIENT_POOL_MAXSIZE = int(os.environ.get("HTTP_CLIENT_POOL_MAXSIZE", "10"))
+HTTP_CLIENT_RETRIES = int(os.environ.get("HTTP_CLIENT_RETRIES", "2"))
+HTTP_CLIENT_BACKOFF = float(os.environ.get("HTTP_CLIENT_BACKOFF", "0.3"))
+HTTP_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CLIENT_CONNECT_TIMEOUT", "2"))
+HTTP_CLIENT_READ_TIMEOUT = float(os.environ.get("HTTP_CLIENT_READ_TIMEOUT", "10"))
+HTTP_OPENBANKING_CONNECT_TIMEOUT = float(
+    os.environ.get("HTTP_OPENBANKING_CONNECT_TIMEOUT", HTTP_CLIENT_CONNECT_TIMEOUT)
+)
+# OPENBANKING_TIMEOUT (at least 4s) stays the OpenBanking read timeout
+HTTP_OPENBANKING_READ_TIMEOUT = float(
+    os.environ.get("HTTP_OPENBANKING_READ_TIMEOUT", max(OPENBANKING_TIMEOUT, 4))
+)
+HTTP_OPENBANKING_RETRIES = max(OPENBANKING_RETRIES, 0)
+HTTP_CLOVA_CONNECT_TIMEOUT = float(
+    os.environ.get("HTTP_CLOVA_CONNECT_TIMEOUT", HTTP_CLIENT_CONNECT_TIMEOUT)
+)
+HTTP_CLOVA_READ_TIMEOUT = float(os.environ.get("HTTP_CLOVA_READ_TIMEOUT", "8"))
+HTTP_KAKAO_CONNECT_TIMEOUT = float(
+    os.environ.get("HTTP_KAKAO_CONNECT_TIMEOUT", HTTP_CLIENT_CONNECT_TIMEOUT)
+)
+HTTP_KAKAO_READ_TIMEOUT = float(
+    os.environ.get("HTTP_KAKAO_READ_TIMEOUT", HTTP_CLIENT_READ_TIMEOUT)
+)
 
 
 # CORS settings